@@ -1,11 +1,15 @@
 import requests
+from http_client import create_session
 from bs4 import BeautifulSoup
 import sqlite3
 import time
 import re
 from urllib.parse import urljoin
-import json
 from datetime import datetime
+import bible_reference
+import commentary_db
+import commentary_reader
+from html_text import html_to_text
 
 class AdvancedHochmaParser:
     def __init__(self, db_path="bible_database.db"):
@@ -17,47 +21,26 @@ class AdvancedHochmaParser:
             db_path (str): SQLite 데이터베이스 파일 경로
         """
         self.base_url = "https://nocr.net"
-        self.session = requests.Session()
+        self.session = create_session()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         self.session.headers.update(self.headers)
         
         self.db_path = db_path
+        self._reader = None
         self.init_commentary_table()
     
     def init_commentary_table(self):
         """
         기존 bible_database.db에 주석 테이블 추가
-        verses 테이블과 동일한 구조 유지
+        (commentary_db 통합 스키마)
         """
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # commentaries 테이블 생성 (verses 테이블과 동일한 구조)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS commentaries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                book_name TEXT NOT NULL,
-                book_code INTEGER NOT NULL,
-                chapter INTEGER NOT NULL,
-                verse INTEGER NOT NULL,
-                text TEXT NOT NULL,
-                version TEXT NOT NULL,
-                verse_title TEXT,
-                commentary_name TEXT NOT NULL,
-                original_url TEXT,
-                parsed_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
         
-        # 인덱스 생성
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_commentaries_book ON commentaries(book_name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_commentaries_chapter ON commentaries(book_name, chapter)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_commentaries_verse ON commentaries(book_name, chapter, verse)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_commentaries_version ON commentaries(version)')
+        # commentaries 통합 스키마 (구버전 스키마는 자동 마이그레이션)
+        commentary_db.ensure_commentaries_schema(conn)
         
-        conn.commit()
         conn.close()
         print(f"주석 테이블 초기화 완료: {self.db_path}")
     
@@ -77,23 +60,7 @@ class AdvancedHochmaParser:
             return result[0]
         else:
             # 기본 매핑 (성경책 순서)
-            book_mapping = {
-                '창세기': 1, '출애굽기': 2, '레위기': 3, '민수기': 4, '신명기': 5,
-                '여호수아': 6, '사사기': 7, '룻기': 8, '사무엘상': 9, '사무엘하': 10,
-                '열왕기상': 11, '열왕기하': 12, '역대상': 13, '역대하': 14, '에스라': 15,
-                '느헤미야': 16, '에스더': 17, '욥기': 18, '시편': 19, '잠언': 20,
-                '전도서': 21, '아가': 22, '이사야': 23, '예레미야': 24, '예레미야애가': 25,
-                '에스겔': 26, '다니엘': 27, '호세아': 28, '요엘': 29, '아모스': 30,
-                '오바댜': 31, '요나': 32, '미가': 33, '나훔': 34, '하박국': 35,
-                '스바냐': 36, '학개': 37, '스가랴': 38, '말라기': 39,
-                '마태복음': 40, '마가복음': 41, '누가복음': 42, '요한복음': 43, '사도행전': 44,
-                '로마서': 45, '고린도전서': 46, '고린도후서': 47, '갈라디아서': 48, '에베소서': 49,
-                '빌립보서': 50, '골로새서': 51, '데살로니가전서': 52, '데살로니가후서': 53,
-                '디모데전서': 54, '디모데후서': 55, '디도서': 56, '빌레몬서': 57,
-                '히브리서': 58, '야고보서': 59, '베드로전서': 60, '베드로후서': 61,
-                '요한일서': 62, '요한이서': 63, '요한삼서': 64, '유다서': 65, '요한계시록': 66
-            }
-            return book_mapping.get(book_name, 999)  # 기본값 999
+            return bible_reference.get_book_code(book_name)
     
     def fetch_page(self, url, timeout=10):
         """
@@ -162,8 +129,8 @@ class AdvancedHochmaParser:
         content_element = soup.find(class_='xe_content') or soup.find(class_='rd_body') or soup.find(class_='rhymix_content')
         
         if content_element:
-            # HTML 텍스트 전체 가져오기
-            content_text = content_element.get_text(strip=True)
+            # HTML 텍스트 전체 가져오기 (<br>과 블록 경계는 줄바꿈으로)
+            content_text = html_to_text(content_element).strip()
             
             # ====31:1 또는 ===31:1 형식의 절 구분자 찾기 (3개 이상 등호)
             verse_pattern = r'={3,}(\d+):(\d+)'
@@ -224,24 +191,31 @@ class AdvancedHochmaParser:
             book_code = self.get_book_code(article_data['book_name'])
             version = f"{article_data['commentary_name']}-commentary"
             
+            dedup = commentary_db.content_dedup_enabled(conn)
+            
             saved_count = 0
             for verse_data in article_data['verse_commentaries']:
+                text, content_id = commentary_db.prepare_commentary_text(conn, verse_data['commentary'], dedup)
                 cursor.execute('''
                     INSERT OR REPLACE INTO commentaries 
                     (book_name, book_code, chapter, verse, text, version, verse_title, 
-                     commentary_name, original_url, parsed_date)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                     commentary_name, original_url, parsed_date, verse_ordinal, content_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ''', (
                     article_data['book_name'],
                     book_code,
                     verse_data['chapter'],
                     verse_data['verse'],
-                    verse_data['commentary'],
+                    text,
                     version,
                     None,  # verse_title
                     article_data['commentary_name'],
                     article_data['url'],
-                    datetime.now()
+                    datetime.now(),
+                    commentary_db.commentary_ordinal(
+                        article_data['book_name'], verse_data['chapter'], verse_data['verse'], book_code
+                    ),
+                    content_id
                 ))
                 saved_count += 1
             
@@ -301,95 +275,69 @@ class AdvancedHochmaParser:
         print(f"상세 파싱 완료: 총 {len(parsed_articles)}개 게시글")
         return parsed_articles
     
+    @property
+    def reader(self):
+        """읽기 전용 조회 서비스 (연결 풀/고정 SQL 재사용, 처음 조회할 때 생성)"""
+        if self._reader is None:
+            self._reader = commentary_reader.CommentaryReader(self.db_path)
+        return self._reader
+    
     def get_commentaries_from_db(self, book_name=None, chapter=None, verse=None, commentary_name=None, limit=None):
         """
         데이터베이스에서 주석 조회
         """
+        if book_name and chapter and not (verse or commentary_name or limit):
+            # 장 전체 조회는 장 캐시에서 처리
+            return self.reader.chapter(book_name, chapter)
+        return self.reader.commentaries(
+            book_name=book_name,
+            chapter=chapter,
+            verse=verse,
+            commentary_name=commentary_name,
+            limit=limit,
+            partial_name=True
+        )
+    
+    def get_commentaries_by_passage(self, passage, commentary_name=None):
+        """
+        본문 범위로 주석 조회 (예: "창세기 31:1-32:5")
+        """
+        return self.reader.passage(passage, commentary_name)
+    
+    def search_commentaries(self, query, commentary_name=None, limit=20):
+        """
+        주석 본문 전문 검색 (FTS5, 순위순 스니펫 포함)
+        """
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM commentaries WHERE 1=1"
-        params = []
-        
-        if book_name:
-            query += " AND book_name = ?"
-            params.append(book_name)
-        
-        if chapter:
-            query += " AND chapter = ?"
-            params.append(chapter)
-        
-        if verse:
-            query += " AND verse = ?"
-            params.append(verse)
-        
-        if commentary_name:
-            query += " AND commentary_name LIKE ?"
-            params.append(f"%{commentary_name}%")
-        
-        query += " ORDER BY book_code, chapter, verse"
-        
-        if limit:
-            query += " LIMIT ?"
-            params.append(limit)
-        
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        commentaries = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        conn.close()
-        return commentaries
+        try:
+            return commentary_db.search_commentaries(conn, query, commentary_name=commentary_name, limit=limit)
+        finally:
+            conn.close()
     
     def get_statistics(self):
         """
         주석 데이터베이스 통계 정보
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # 전체 주석 수
-        cursor.execute("SELECT COUNT(*) FROM commentaries")
-        total_count = cursor.fetchone()[0]
-        
-        # 성경책별 주석 수
-        cursor.execute("""
-            SELECT book_name, COUNT(*) as count 
-            FROM commentaries 
-            GROUP BY book_name 
-            ORDER BY book_code
-        """)
-        book_stats = cursor.fetchall()
-        
-        # 주석별 통계
-        cursor.execute("""
-            SELECT commentary_name, COUNT(*) as count 
-            FROM commentaries 
-            GROUP BY commentary_name 
-            ORDER BY count DESC
-        """)
-        commentary_stats = cursor.fetchall()
-        
-        conn.close()
-        
-        return {
-            'total_commentaries': total_count,
-            'books': dict(book_stats),
-            'commentary_types': dict(commentary_stats)
-        }
+        return self.reader.statistics()
     
-    def export_to_json(self, filename, book_name=None, commentary_name=None):
+    def export_to_json(self, filename, book_name=None, commentary_name=None, chapter=None,
+                       partition_by_book=False):
         """
-        주석 데이터를 JSON으로 내보내기
+        주석 데이터를 JSON으로 내보내기 (커서를 스트리밍으로 기록)
+        .json은 JSON 배열, .ndjson/.jsonl은 줄 단위 JSON, .gz를 붙이면 gzip 압축
+        partition_by_book이면 성경책별 파일로 나눠 병렬 기록
         """
-        commentaries = self.get_commentaries_from_db(
-            book_name=book_name, 
-            commentary_name=commentary_name
+        results = self.reader.export(
+            filename,
+            book_name=book_name,
+            chapter=chapter,
+            commentary_name=commentary_name,
+            partial_name=True,
+            partition_by_book=partition_by_book
         )
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(commentaries, f, ensure_ascii=False, indent=2, default=str)
-        
-        print(f"JSON 내보내기 완료: {filename} ({len(commentaries)}개 주석)")
+        total = sum(results.values())
+        print(f"JSON 내보내기 완료: {filename} ({total}개 주석, {len(results)}개 파일)")
 
 
 def main():
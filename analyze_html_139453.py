@@ -1,4 +1,4 @@
-import requests
+import http_client
 from bs4 import BeautifulSoup
 import re
 
@@ -14,7 +14,7 @@ def analyze_html_139453():
     print(f"🔍 {url} HTML 구조 분석 중...")
     
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
         response.encoding = 'utf-8'
         
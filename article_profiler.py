@@ -0,0 +1,224 @@
+"""
+게시글 단위 프로파일러 (선택 사용)
+파서의 parse_single_article을 감싸서 게시글마다 샘플링(또는 cProfile)하고
+가장 느린 N개 게시글의 프로파일만 남겨 flamegraph 호환 형식으로 저장
+
+- sample 모드: 접힌 스택(folded stacks, "바깥;...;안쪽 샘플수") 파일
+  flamegraph.pl, speedscope, inferno 등에서 바로 열 수 있음
+- cprofile 모드: pstats 파일 (snakeviz, flameprof 등)
+파일 이름과 index.json에 article_id, HTML 크기, 절 구분 패턴, 소요 시간을 기록
+
+사용법
+    profiler = ArticleProfiler(top_n=10).attach(parser)
+    parser.bulk_parse(...)
+    profiler.write('profiles')
+"""
+
+import cProfile
+import functools
+import heapq
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+DEFAULT_TOP_N = 10
+DEFAULT_INTERVAL = 0.001
+
+# 절 구분 패턴 (flexible_hochma_parser.detect_verse_pattern과 같은 이름, HTML 원문과 본문 텍스트 모두 가능)
+PATTERNS = (
+    ('equals_4', re.compile(r'====\d+:\d+')),
+    ('equals_3', re.compile(r'(?<!=)===\d+:\d+')),
+    ('line_start', re.compile(r'(?:^|>)\s*\d+:\d+절?\s*(?:<|$)', re.MULTILINE)),
+)
+
+
+def detect_pattern(html):
+    """HTML(또는 본문 텍스트)에서 가장 많이 나오는 절 구분 패턴 이름 (없으면 None)"""
+    if not html:
+        return None
+    best_name, best_count = None, 0
+    for name, pattern in PATTERNS:
+        count = len(pattern.findall(html))
+        if count > best_count:
+            best_name, best_count = name, count
+    return best_name
+
+
+def _result_pattern(result):
+    """
+    파서 결과에 들어 있는 패턴 이름
+    (pattern_info / 절 목록의 pattern_type, 없으면 결과의 본문 텍스트에서 감지)
+    """
+    if isinstance(result, tuple):
+        result = result[0]
+    content = None
+    if isinstance(result, dict):
+        info = result.get('pattern_info')
+        if isinstance(info, dict) and info.get('type'):
+            return info['type']
+        content = result.get('content')
+        result = result.get('verses') or result.get('verse_commentaries')
+    # 절 목록이 제너레이터면 소비하지 않음
+    if isinstance(result, list) and result and hasattr(result[0], 'get'):
+        patterns = Counter(row.get('pattern_type') for row in result if row.get('pattern_type'))
+        if patterns:
+            return patterns.most_common(1)[0][0]
+    if isinstance(content, str):
+        return detect_pattern(content)
+    return None
+
+
+class _StackSampler:
+    def __init__(self, thread_id, interval):
+        """대상 스레드의 호출 스택을 주기적으로 샘플링해서 접힌 스택으로 집계"""
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='article-profiler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+
+
+class ArticleProfiler:
+    def __init__(self, top_n=DEFAULT_TOP_N, mode='sample', interval=DEFAULT_INTERVAL):
+        """
+        가장 느린 게시글 프로파일 수집기
+
+        Args:
+            top_n (int): 남길 게시글 수
+            mode (str): 'sample' (접힌 스택) 또는 'cprofile' (pstats)
+            interval (float): 샘플링 간격 (초, sample 모드)
+        """
+        if mode not in ('sample', 'cprofile'):
+            raise ValueError(f"지원하지 않는 프로파일 모드입니다: {mode}")
+        self.top_n = top_n
+        self.mode = mode
+        self.interval = interval
+        self.durations = []
+        self._slowest = []  # (소요 시간, 순번, 기록) 최소 힙
+        self._sequence = itertools.count()
+        self._local = threading.local()
+
+    def observe_response(self, response, size=None):
+        """
+        진행 중인 게시글의 HTML 크기 기록 (파서가 본문을 받은 뒤 호출하는 응답 관찰자)
+        본문을 다시 읽거나 디코딩하지 않음 (stream=True 응답은 파서가 읽은 바이트 수를 size로 넘김)
+        """
+        tags = getattr(self._local, 'tags', None)
+        if tags is None:
+            return
+        tags['html_size'] = size if size is not None else len(response.content)
+
+    def profile(self, article_id, func, *args, **kwargs):
+        """
+        func(*args, **kwargs)를 프로파일링하며 실행 (가장 느린 top_n에 들면 프로파일 보관)
+
+        Returns:
+            func의 반환값
+        """
+        tags = {'article_id': article_id, 'html_size': None, 'pattern': None}
+        self._local.tags = tags
+        profile = cProfile.Profile() if self.mode == 'cprofile' else None
+        sampler = _StackSampler(threading.get_ident(), self.interval) if profile is None else None
+        start = time.perf_counter()
+        result = None
+        try:
+            if profile is not None:
+                result = profile.runcall(func, *args, **kwargs)
+            else:
+                with sampler:
+                    result = func(*args, **kwargs)
+            return result
+        finally:
+            duration = time.perf_counter() - start
+            self._local.tags = None
+            tags['pattern'] = _result_pattern(result) or tags['pattern']
+            tags['duration_ms'] = duration * 1000
+            self.durations.append(duration)
+            self._keep(duration, tags, profile if profile is not None else sampler.stacks)
+
+    def _keep(self, duration, tags, data):
+        entry = (duration, next(self._sequence), {'tags': tags, 'data': data})
+        if len(self._slowest) < self.top_n:
+            heapq.heappush(self._slowest, entry)
+        elif duration > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def attach(self, parser):
+        """
+        파서 인스턴스의 parse_single_article을 프로파일링 래퍼로 교체
+        parser.response_observers가 있으면 응답 관찰자로 등록해서 HTML 크기도 기록
+        (패턴은 파싱 결과에서 구하므로 세션 요청을 가로채지 않음)
+
+        Returns:
+            ArticleProfiler: 자기 자신
+        """
+        parse_single_article = parser.parse_single_article
+
+        @functools.wraps(parse_single_article)
+        def profiled(article_id, *args, **kwargs):
+            return self.profile(article_id, parse_single_article, article_id, *args, **kwargs)
+
+        parser.parse_single_article = profiled
+
+        observers = getattr(parser, 'response_observers', None)
+        if observers is not None:
+            observers.append(self)
+        return self
+
+    def slowest(self):
+        """보관 중인 게시글 기록 (느린 순)"""
+        return [entry[2] for entry in sorted(self._slowest, key=lambda entry: entry[0], reverse=True)]
+
+    def write(self, output_dir='profiles'):
+        """
+        가장 느린 게시글 프로파일을 파일로 저장
+
+        Returns:
+            list: 저장한 게시글 요약 (index.json 내용)
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        median = sorted(self.durations)[len(self.durations) // 2] * 1000 if self.durations else 0.0
+        index = []
+        for rank, record in enumerate(self.slowest(), 1):
+            tags = record['tags']
+            name = (f"{rank:02d}_{tags['article_id']}_{tags['pattern'] or 'unknown'}_"
+                    f"{tags['html_size'] or 0}B_{tags['duration_ms']:.0f}ms")
+            if self.mode == 'cprofile':
+                filename = name + '.prof'
+                record['data'].dump_stats(os.path.join(output_dir, filename))
+            else:
+                filename = name + '.folded'
+                with open(os.path.join(output_dir, filename), 'w', encoding='utf-8') as f:
+                    for stack, count in record['data'].most_common():
+                        f.write(f"{stack} {count}\n")
+            index.append(dict(tags, file=filename,
+                              median_ratio=tags['duration_ms'] / median if median else None))
+
+        with open(os.path.join(output_dir, 'index.json'), 'w', encoding='utf-8') as f:
+            json.dump({'mode': self.mode, 'articles': len(self.durations), 'median_ms': median,
+                       'slowest': index}, f, ensure_ascii=False, indent=2)
+        return index
@@ -0,0 +1,412 @@
+"""
+파서 벤치마크
+녹화해 둔 호크마 게시글 HTML(fixtures)을 각 파서 클래스의 추출/절 분할 단계에 재생해서
+초당 게시글 수, 초당 절 수, 게시글당 지연(p50/p95), 최대 RSS를 측정하고
+커밋별로 결과를 쌓아서 성능 회귀를 비교함
+
+사용법
+    python benchmark_parsers.py record              # fixtures 녹화 (네트워크 필요, 없는 것만)
+    python benchmark_parsers.py run [--rounds N] [--parser 이름 ...]
+    python benchmark_parsers.py compare [커밋]      # 마지막 결과와 이전 결과(또는 커밋) 비교
+
+fixtures(benchmarks/fixtures)와 결과 파일(benchmarks/results.jsonl)은 저장소에 포함하지 않음
+고정된 코퍼스로 아직 한 번도 실행하지 않았으므로 기준 수치는 없고,
+record로 녹화한 같은 fixtures를 쓰는 같은 머신의 결과끼리만 비교할 것
+"""
+
+import gzip
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+import requests
+from bs4 import BeautifulSoup
+
+from http_client import create_session
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+FIXTURE_DIR = os.path.join('benchmarks', 'fixtures')
+RESULTS_FILE = os.path.join('benchmarks', 'results.jsonl')
+ARTICLE_URL = "https://nocr.net/com_kor_hochma/{}"
+DEFAULT_ROUNDS = 5
+
+# 벤치마크 코퍼스: equals_3/equals_4 패턴 장 전체 + 라인 기반/혼합 패턴 게시글
+BENCHMARK_ARTICLES = {
+    139453: "라인 기반 패턴",
+    139477: "창세기 31장 (equals_any)",
+    139479: "창세기 32장 (equals_3)",
+    139483: "창세기 34장 (equals_3)",
+    139525: "출애굽기 5장 (equals_3)",
+    139527: "출애굽기 6장 (equals_4)",
+    139529: "출애굽기 7장 (equals_4)",
+    139752: "신명기 15장 (equals_3)",
+    139943: "사무엘상 26장 (equals_4)",
+    139953: "사무엘상 31장 (equals_4)",
+    140065: "열왕기하 8장 (equals_4)",
+    140409: "욥기 35장 (equals_4)",
+    140767: "시편 146장 (equals_4)",
+    140923: "이사야 20장 (equals_4)",
+    141069: "예레미야 26장 (equals_4)",
+    141347: "스바냐 1장 (equals_4)",
+    141477: "마가복음 14장 (equals_4)",
+}
+
+
+def _soup_runner(method):
+    """soup를 받는 추출 메서드 실행 (verse_commentaries 반환)"""
+    def run(parser, session, article_id, url):
+        soup = BeautifulSoup(session.get(url).text, 'html.parser')
+        data = getattr(parser, method)(soup, url)
+        return data.get('verse_commentaries', [])
+    return run
+
+
+def _article_runner(parser, session, article_id, url):
+    """게시글 단위 파서 (절 분할 없음)"""
+    soup = BeautifulSoup(session.get(url).text, 'html.parser')
+    parser.extract_article_data(soup, url)
+    return []
+
+
+def _single_article_runner(parser, session, article_id, url):
+    """parse_single_article(article_id) 실행 (결과 형식은 파서마다 다름)"""
+    result = parser.parse_single_article(article_id)
+    if isinstance(result, tuple):
+        data, _ = result
+        # 절 목록이 제너레이터일 수 있으므로 리스트로 (세는 시간까지 측정에 포함)
+        return list(data['verses']) if data else []
+    return result or []
+
+
+def _content_runner(parser, session, article_id, url):
+    return parser.parse_article_content(article_id)
+
+
+# 파서 이름 -> (모듈, 클래스, DB 경로 인자 여부, 실행 함수)
+PARSERS = {
+    'HochmaParser': ('hochma_parser', 'HochmaParser', True, _article_runner),
+    'AdvancedHochmaParser': ('advanced_hochma_parser', 'AdvancedHochmaParser', True,
+                             _soup_runner('extract_detailed_commentary')),
+    'ExcelHochmaParser': ('excel_hochma_parser', 'ExcelHochmaParser', True,
+                          _soup_runner('extract_detailed_commentary')),
+    'FlexibleHochmaParser': ('flexible_hochma_parser', 'FlexibleHochmaParser', True,
+                             _soup_runner('extract_flexible_commentary')),
+    'LineBasedHochmaParser': ('line_based_parser', 'LineBasedHochmaParser', True,
+                              _soup_runner('extract_line_based_commentary')),
+    'FixedLineBasedHochmaParser': ('fixed_line_based_parser', 'FixedLineBasedHochmaParser', True,
+                                   _soup_runner('extract_fixed_line_based_commentary')),
+    'CompleteHochmaBulkParser': ('complete_hochma_bulk_parser', 'CompleteHochmaBulkParser', True,
+                                 _single_article_runner),
+    'ExcelOnlyHochmaParser': ('excel_only_hochma_parser', 'ExcelOnlyHochmaParser', False,
+                              _single_article_runner),
+    'BulkHochmaParser': ('bulk_hochma_parser', 'BulkHochmaParser', False, _single_article_runner),
+    'CompleteBulkHochmaParser': ('complete_bulk_parser', 'CompleteBulkHochmaParser', False,
+                                 _single_article_runner),
+    'CorrectedHochmaParser': ('corrected_bulk_parser', 'CorrectedHochmaParser', False, _content_runner),
+}
+
+
+class ReplayResponse:
+    """녹화된 페이지 응답 (requests.Response에서 파서가 쓰는 속성만)"""
+
+    def __init__(self, url, text, status_code=200):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+        self.encoding = 'utf-8'
+        self.elapsed = timedelta(0)
+
+    @property
+    def content(self):
+        return self.text.encode('utf-8')
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error: {self.url}", response=self)
+
+
+class ReplaySession:
+    """URL의 게시글 번호로 fixtures를 돌려주는 requests.Session 대용"""
+
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+        self.headers = {}
+
+    def get(self, url, **kwargs):
+        match = re.search(r'(\d+)\D*$', url)
+        text = self.fixtures.get(int(match.group(1))) if match else None
+        if text is None:
+            return ReplayResponse(url, '', 404)
+        return ReplayResponse(url, text)
+
+
+def fixture_path(article_id, fixture_dir=FIXTURE_DIR):
+    return os.path.join(fixture_dir, f"{article_id}.html.gz")
+
+
+def load_fixtures(article_ids=None, fixture_dir=FIXTURE_DIR):
+    """
+    녹화된 HTML 읽기
+
+    Returns:
+        dict: 게시글 번호 -> HTML (녹화되지 않은 게시글은 제외)
+    """
+    fixtures = {}
+    for article_id in article_ids or BENCHMARK_ARTICLES:
+        path = fixture_path(article_id, fixture_dir)
+        if os.path.exists(path):
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                fixtures[article_id] = f.read()
+    return fixtures
+
+
+def record_fixtures(article_ids=None, fixture_dir=FIXTURE_DIR, delay=1):
+    """
+    게시글 HTML을 내려받아 fixtures로 저장 (이미 있는 파일은 건너뜀)
+
+    Returns:
+        int: 새로 저장한 게시글 수
+    """
+    os.makedirs(fixture_dir, exist_ok=True)
+    session = create_session()
+    recorded = 0
+    for article_id in article_ids or BENCHMARK_ARTICLES:
+        path = fixture_path(article_id, fixture_dir)
+        if os.path.exists(path):
+            continue
+        try:
+            response = session.get(ARTICLE_URL.format(article_id), timeout=15)
+            response.raise_for_status()
+            response.encoding = 'utf-8'
+        except requests.RequestException as e:
+            print(f"  ✗ {article_id}: {e}")
+            continue
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(response.text)
+        recorded += 1
+        print(f"  ✓ {article_id}: {BENCHMARK_ARTICLES.get(article_id, '')}")
+        time.sleep(delay)
+    return recorded
+
+
+def _percentile(sorted_values, percent):
+    """최근접 순위 백분위수"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(percent / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _peak_rss_kb():
+    """프로세스 최대 RSS (KB, 측정할 수 없으면 None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _run_parser(name, fixture_dir, article_ids, rounds):
+    """
+    파서 하나를 측정 (최대 RSS를 파서별로 재도록 별도 프로세스에서 실행)
+
+    Returns:
+        dict: 측정값
+    """
+    module_name, class_name, takes_db, runner = PARSERS[name]
+    fixtures = load_fixtures(article_ids, fixture_dir)
+    session = ReplaySession(fixtures)
+
+    with tempfile.TemporaryDirectory() as temp_dir, open(os.devnull, 'w') as devnull, \
+            redirect_stdout(devnull):
+        module = importlib.import_module(module_name)
+        parser_class = getattr(module, class_name)
+        parser = parser_class(os.path.join(temp_dir, 'benchmark.db')) if takes_db else parser_class()
+        # 모든 파서가 http_client 세션으로 요청하므로 세션만 교체
+        parser.session = session
+
+        # 준비 실행 (절 수 확인, 측정에서 제외)
+        verse_counts = {}
+        errors = {}
+        for article_id in fixtures:
+            try:
+                verse_counts[article_id] = len(runner(parser, session, article_id, ARTICLE_URL.format(article_id)))
+            except Exception as e:
+                errors[article_id] = f"{type(e).__name__}: {e}"
+        articles = [article_id for article_id in fixtures if article_id not in errors]
+
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for article_id in articles:
+                article_start = time.perf_counter()
+                runner(parser, session, article_id, ARTICLE_URL.format(article_id))
+                latencies.append(time.perf_counter() - article_start)
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    article_total = len(latencies)
+    verse_total = sum(verse_counts[article_id] for article_id in articles) * rounds
+    return {
+        'articles': len(articles),
+        'verses': sum(verse_counts[article_id] for article_id in articles),
+        'articles_per_sec': article_total / elapsed if elapsed else 0.0,
+        'verses_per_sec': verse_total / elapsed if elapsed else 0.0,
+        'p50_ms': _percentile(latencies, 50) * 1000,
+        'p95_ms': _percentile(latencies, 95) * 1000,
+        'peak_rss_kb': _peak_rss_kb(),
+        'errors': errors,
+    }
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(parsers=None, rounds=DEFAULT_ROUNDS, fixture_dir=FIXTURE_DIR, article_ids=None):
+    """
+    파서별 벤치마크 실행
+
+    Returns:
+        dict: 실행 정보와 파서별 측정값 (fixtures가 없으면 None)
+    """
+    article_ids = list(article_ids or BENCHMARK_ARTICLES)
+    available = load_fixtures(article_ids, fixture_dir)
+    missing = [article_id for article_id in article_ids if article_id not in available]
+    if missing:
+        print(f"녹화되지 않은 게시글 {len(missing)}개 제외: {missing} (python benchmark_parsers.py record)")
+    if not available:
+        print(f"fixtures가 없습니다: {fixture_dir}")
+        return None
+
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    for name in parsers or PARSERS:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            try:
+                results[name] = executor.submit(
+                    _run_parser, name, fixture_dir, list(available), rounds
+                ).result()
+            except Exception as e:
+                print(f"  ✗ {name}: {type(e).__name__}: {e}")
+                continue
+        print_result(name, results[name])
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'rounds': rounds,
+        'fixtures': sorted(available),
+        'results': results,
+    }
+
+
+def save_run(run, results_file=RESULTS_FILE):
+    """실행 결과를 JSON Lines 파일에 추가"""
+    if os.path.dirname(results_file):
+        os.makedirs(os.path.dirname(results_file), exist_ok=True)
+    with open(results_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(run, ensure_ascii=False) + '\n')
+
+
+def load_runs(results_file=RESULTS_FILE):
+    if not os.path.exists(results_file):
+        return []
+    with open(results_file, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def print_result(name, result):
+    rss = f"{result['peak_rss_kb'] / 1024:.0f}MB" if result['peak_rss_kb'] else "-"
+    print(f"  {name:28} {result['articles_per_sec']:8.1f} 게시글/s {result['verses_per_sec']:9.1f} 절/s "
+          f"p50 {result['p50_ms']:7.2f}ms p95 {result['p95_ms']:7.2f}ms RSS {rss}")
+    for article_id, error in result['errors'].items():
+        print(f"    ✗ {article_id}: {error}")
+
+
+def compare_runs(baseline, current):
+    """두 실행 결과의 파서별 처리량/지연 변화 출력"""
+    print(f"기준: {baseline.get('commit')} ({baseline['timestamp']}) -> "
+          f"현재: {current.get('commit')} ({current['timestamp']})")
+    if baseline.get('fixtures') != current.get('fixtures'):
+        print("  ⚠️  fixtures 구성이 달라서 직접 비교가 정확하지 않을 수 있음")
+
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if not before:
+            print(f"  {name:28} (기준 없음)")
+            continue
+        changes = []
+        for key, label in (('articles_per_sec', '게시글/s'), ('p50_ms', 'p50'), ('p95_ms', 'p95'),
+                           ('peak_rss_kb', 'RSS')):
+            if not before.get(key) or result.get(key) is None:
+                continue
+            changes.append(f"{label} {(result[key] - before[key]) / before[key] * 100:+.1f}%")
+        print(f"  {name:28} {', '.join(changes)}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    command = args.pop(0) if args and args[0] in ('record', 'run', 'compare') else 'run'
+
+    if command == 'record':
+        print(f"fixtures 녹화: {FIXTURE_DIR}")
+        print(f"  새로 저장: {record_fixtures()}개")
+
+    elif command == 'run':
+        rounds = DEFAULT_ROUNDS
+        parsers = []
+        while args:
+            option = args.pop(0)
+            if option == '--rounds':
+                rounds = int(args.pop(0))
+            elif option == '--parser':
+                parsers.append(args.pop(0))
+        unknown = [name for name in parsers if name not in PARSERS]
+        if unknown:
+            print(f"알 수 없는 파서: {unknown} (가능: {list(PARSERS)})")
+            sys.exit(1)
+
+        print(f"파서 벤치마크 ({rounds}회 반복)")
+        run = run_benchmark(parsers or None, rounds)
+        if run:
+            previous = load_runs()
+            save_run(run)
+            print(f"결과 저장: {RESULTS_FILE}")
+            if previous:
+                compare_runs(previous[-1], run)
+
+    else:
+        runs = load_runs()
+        if args:
+            # 지정한 커밋의 마지막 결과 (짧은 해시도 가능)
+            matches = [run for run in runs[:-1] if (run.get('commit') or '').startswith(args[0])]
+            if not matches:
+                print(f"커밋 {args[0]}의 결과가 없습니다.")
+                sys.exit(1)
+            baseline = matches[-1]
+        elif len(runs) < 2:
+            print("비교할 결과가 부족합니다.")
+            sys.exit(1)
+        else:
+            baseline = runs[-2]
+        compare_runs(baseline, runs[-1])
@@ -0,0 +1,305 @@
+"""
+성경 참조 정규 모듈
+bible_verse_counts.json 하나를 기준으로 66권 성경책 이름/코드, 장·절 수,
+전체 성경 절 서수(verse ordinal) 변환을 제공
+
+- 성경책 이름/별칭 -> 코드: 해시 조회 O(1)
+- (성경책, 장, 절) -> 절 서수: 누적합 오프셋 O(1)
+- 절 서수 -> (성경책, 장, 절): 서수별 장 인덱스 테이블 O(1)
+
+절 서수는 창세기 1:1 = 1 부터 요한계시록 마지막 절까지 빈틈없이 이어지는 정수
+"""
+
+import json
+import os
+import re
+from array import array
+
+VERSE_COUNTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bible_verse_counts.json')
+
+# 알 수 없는 성경책의 book_code (기존 파서들과 동일)
+UNKNOWN_BOOK_CODE = 999
+
+# 정식 이름 외에 제목/엑셀/DB에서 쓰이는 표기
+BOOK_ALIASES = {
+    '요한1서': '요한일서', '요한2서': '요한이서', '요한3서': '요한삼서',
+    '요한 1서': '요한일서', '요한 2서': '요한이서', '요한 3서': '요한삼서',
+    '예레미야 애가': '예레미야애가', '애가': '예레미야애가',
+    '시편(상)': '시편', '계시록': '요한계시록',
+}
+
+# 개역개정 약칭
+BOOK_ABBREVIATIONS = {
+    '창': '창세기', '출': '출애굽기', '레': '레위기', '민': '민수기', '신': '신명기',
+    '수': '여호수아', '삿': '사사기', '룻': '룻기', '삼상': '사무엘상', '삼하': '사무엘하',
+    '왕상': '열왕기상', '왕하': '열왕기하', '대상': '역대상', '대하': '역대하', '스': '에스라',
+    '느': '느헤미야', '에': '에스더', '욥': '욥기', '시': '시편', '잠': '잠언',
+    '전': '전도서', '아': '아가', '사': '이사야', '렘': '예레미야', '애': '예레미야애가',
+    '겔': '에스겔', '단': '다니엘', '호': '호세아', '욜': '요엘', '암': '아모스',
+    '옵': '오바댜', '욘': '요나', '미': '미가', '나': '나훔', '합': '하박국',
+    '습': '스바냐', '학': '학개', '슥': '스가랴', '말': '말라기',
+    '마': '마태복음', '막': '마가복음', '눅': '누가복음', '요': '요한복음', '행': '사도행전',
+    '롬': '로마서', '고전': '고린도전서', '고후': '고린도후서', '갈': '갈라디아서', '엡': '에베소서',
+    '빌': '빌립보서', '골': '골로새서', '살전': '데살로니가전서', '살후': '데살로니가후서',
+    '딤전': '디모데전서', '딤후': '디모데후서', '딛': '디도서', '몬': '빌레몬서',
+    '히': '히브리서', '약': '야고보서', '벧전': '베드로전서', '벧후': '베드로후서',
+    '요일': '요한일서', '요이': '요한이서', '요삼': '요한삼서', '유': '유다서', '계': '요한계시록',
+}
+
+
+def _load_verse_counts(path=VERSE_COUNTS_FILE):
+    """bible_verse_counts.json 로드 (정경 순서 유지)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+VERSE_COUNTS = _load_verse_counts()
+
+# 정경 순서의 성경책 이름 (index + 1 == book_code)
+BOOK_NAMES = tuple(VERSE_COUNTS.keys())
+BOOK_CODES = {name: code for code, name in enumerate(BOOK_NAMES, 1)}
+
+# 이름/별칭/약칭 -> 정식 이름 해시
+_NAME_INDEX = {name: name for name in BOOK_NAMES}
+_NAME_INDEX.update(BOOK_ALIASES)
+_NAME_INDEX.update(BOOK_ABBREVIATIONS)
+
+# 누적합 테이블
+# _book_chapter_base[code]: 해당 책 1장의 전체 장 인덱스
+# _chapter_offsets[g]: 전체 장 인덱스 g 직전까지의 절 수
+# _chapter_book[g], _chapter_number[g]: 전체 장 인덱스 g의 책 코드와 장 번호
+# _ordinal_chapter[ordinal]: 절 서수가 속한 전체 장 인덱스
+_book_chapter_base = array('I', [0])
+_chapter_offsets = array('I')
+_chapter_book = array('B')
+_chapter_number = array('H')
+_ordinal_chapter = array('I', [0])
+
+_total = 0
+for _code, _name in enumerate(BOOK_NAMES, 1):
+    _book_chapter_base.append(len(_chapter_offsets))
+    for _chapter, _count in enumerate(VERSE_COUNTS[_name], 1):
+        _chapter_offsets.append(_total)
+        _chapter_book.append(_code)
+        _chapter_number.append(_chapter)
+        _ordinal_chapter.extend([len(_chapter_offsets) - 1] * _count)
+        _total += _count
+_book_chapter_base.append(len(_chapter_offsets))
+del _code, _name, _chapter, _count
+
+TOTAL_VERSES = _total
+TOTAL_CHAPTERS = len(_chapter_offsets)
+
+# 제목 등 자유 텍스트에서 성경책 이름 찾기 (긴 이름 우선: 예레미야애가 > 예레미야)
+_BOOK_IN_TEXT_PATTERN = re.compile('|'.join(
+    re.escape(name) for name in sorted(list(BOOK_NAMES) + list(BOOK_ALIASES), key=len, reverse=True)
+))
+
+
+def resolve_book_name(name):
+    """
+    성경책 이름/별칭/약칭을 정식 이름으로 변환
+
+    Returns:
+        str: 정식 성경책 이름 (알 수 없으면 None)
+    """
+    if not name:
+        return None
+    name = str(name).strip()
+    canonical = _NAME_INDEX.get(name)
+    if canonical is None:
+        canonical = _NAME_INDEX.get(name.replace(' ', ''))
+    return canonical
+
+
+def get_book_code(book_name, default=UNKNOWN_BOOK_CODE):
+    """성경책 이름으로부터 book_code 조회 (별칭/약칭 포함)"""
+    canonical = resolve_book_name(book_name)
+    if canonical is None:
+        return default
+    return BOOK_CODES[canonical]
+
+
+def get_book_name(book_code):
+    """book_code로부터 정식 성경책 이름 조회"""
+    try:
+        code = int(book_code)
+    except (TypeError, ValueError):
+        return None
+    if 1 <= code <= len(BOOK_NAMES):
+        return BOOK_NAMES[code - 1]
+    return None
+
+
+def _book_code_of(book):
+    """이름 또는 코드를 book_code로 변환 (알 수 없으면 None)"""
+    if isinstance(book, int):
+        return book if 1 <= book <= len(BOOK_NAMES) else None
+    code = get_book_code(book, default=None)
+    if code is None and str(book).isdigit():
+        return _book_code_of(int(book))
+    return code
+
+
+def find_book_in_text(text):
+    """
+    제목 등 텍스트에 포함된 성경책 이름 찾기
+
+    Returns:
+        str: 정식 성경책 이름 (없으면 None)
+    """
+    if not text:
+        return None
+    match = _BOOK_IN_TEXT_PATTERN.search(text)
+    if not match:
+        return None
+    return _NAME_INDEX[match.group(0)]
+
+
+def chapter_count(book):
+    """성경책의 장 수 (알 수 없으면 0)"""
+    code = _book_code_of(book)
+    if code is None:
+        return 0
+    return _book_chapter_base[code + 1] - _book_chapter_base[code]
+
+
+def verse_count(book, chapter):
+    """해당 장의 절 수 (알 수 없으면 0)"""
+    code = _book_code_of(book)
+    if code is None:
+        return 0
+    try:
+        chapter = int(chapter)
+    except (TypeError, ValueError):
+        return 0
+    if not 1 <= chapter <= _book_chapter_base[code + 1] - _book_chapter_base[code]:
+        return 0
+    g = _book_chapter_base[code] + chapter - 1
+    end = _chapter_offsets[g + 1] if g + 1 < TOTAL_CHAPTERS else TOTAL_VERSES
+    return end - _chapter_offsets[g]
+
+
+def verse_ordinal(book, chapter, verse):
+    """
+    (성경책, 장, 절)을 전체 성경 절 서수로 변환
+
+    Args:
+        book (str|int): 성경책 이름/별칭 또는 book_code
+        chapter (int): 장 번호
+        verse (int): 절 번호
+
+    Returns:
+        int: 1부터 시작하는 절 서수 (범위를 벗어나면 None)
+    """
+    count = verse_count(book, chapter)
+    try:
+        verse = int(verse)
+    except (TypeError, ValueError):
+        return None
+    if not 1 <= verse <= count:
+        return None
+    code = _book_code_of(book)
+    return _chapter_offsets[_book_chapter_base[code] + int(chapter) - 1] + verse
+
+
+def ordinal_to_reference(ordinal):
+    """
+    절 서수를 (성경책 이름, 장, 절)로 변환
+
+    Returns:
+        tuple: (book_name, chapter, verse) (범위를 벗어나면 None)
+    """
+    if not 1 <= ordinal <= TOTAL_VERSES:
+        return None
+    g = _ordinal_chapter[ordinal]
+    return BOOK_NAMES[_chapter_book[g] - 1], _chapter_number[g], ordinal - _chapter_offsets[g]
+
+
+def chapter_index(book, chapter):
+    """
+    전체 성경 장 인덱스 (창세기 1장 = 0 ... 요한계시록 마지막 장 = TOTAL_CHAPTERS - 1)
+
+    Returns:
+        int: 0부터 시작하는 장 인덱스 (범위를 벗어나면 None)
+    """
+    if not verse_count(book, chapter):
+        return None
+    return _book_chapter_base[_book_code_of(book)] + int(chapter) - 1
+
+
+def chapter_ordinal_range(book, chapter):
+    """
+    장 전체의 절 서수 범위
+
+    Returns:
+        tuple: (첫 절 서수, 마지막 절 서수) (알 수 없으면 None)
+    """
+    count = verse_count(book, chapter)
+    if not count:
+        return None
+    first = verse_ordinal(book, chapter, 1)
+    return first, first + count - 1
+
+
+def passage_ordinal_range(book, start_chapter, start_verse=None, end_chapter=None, end_verse=None):
+    """
+    본문 범위(예: 창세기 31:1-32:5)를 절 서수 범위로 변환
+
+    Args:
+        book (str|int): 성경책 이름/별칭 또는 book_code
+        start_chapter (int): 시작 장
+        start_verse (int): 시작 절 (없으면 장의 첫 절)
+        end_chapter (int): 끝 장 (없으면 시작 장)
+        end_verse (int): 끝 절 (없으면 끝 장의 마지막 절)
+
+    Returns:
+        tuple: (시작 서수, 끝 서수) (잘못된 범위면 None)
+    """
+    end_chapter = end_chapter or start_chapter
+    first = verse_ordinal(book, start_chapter, start_verse or 1)
+    if end_verse is None:
+        end_range = chapter_ordinal_range(book, end_chapter)
+        last = end_range[1] if end_range else None
+    else:
+        last = verse_ordinal(book, end_chapter, end_verse)
+    if first is None or last is None or first > last:
+        return None
+    return first, last
+
+
+_PASSAGE_PATTERN = re.compile(
+    r'^\s*(?P<book>[가-힣0-9 ]+?)\s*(?P<c1>\d+)(?::(?P<v1>\d+))?'
+    r'(?:\s*[-–~]\s*(?:(?P<c2>\d+):)?(?P<n2>\d+))?\s*$'
+)
+
+
+def parse_passage(text):
+    """
+    '창세기 31:1-32:5', '창 31:1-5', '시편 23' 형식의 본문 표기를 절 서수 범위로 변환
+
+    Returns:
+        tuple: (시작 서수, 끝 서수) (해석할 수 없으면 None)
+    """
+    match = _PASSAGE_PATTERN.match(text or '')
+    if not match:
+        return None
+    book = resolve_book_name(match.group('book'))
+    if book is None:
+        return None
+
+    start_chapter = int(match.group('c1'))
+    start_verse = int(match.group('v1')) if match.group('v1') else None
+    n2 = int(match.group('n2')) if match.group('n2') else None
+
+    if match.group('c2'):
+        # 31:1-32:5
+        return passage_ordinal_range(book, start_chapter, start_verse, int(match.group('c2')), n2)
+    if n2 is None:
+        # 31:1 또는 31
+        return passage_ordinal_range(book, start_chapter, start_verse, start_chapter, start_verse)
+    if start_verse is None:
+        # 31-32 (장 범위)
+        return passage_ordinal_range(book, start_chapter, None, n2, None)
+    # 31:1-5
+    return passage_ordinal_range(book, start_chapter, start_verse, start_chapter, n2)
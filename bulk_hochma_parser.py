@@ -1,4 +1,3 @@
-import requests
 from bs4 import BeautifulSoup
 import re
 import pandas as pd
@@ -9,6 +8,10 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill
 from openpyxl.utils.dataframe import dataframe_to_rows
 import os
+from bible_reference import find_book_in_text
+from http_client import create_session
+from html_text import html_to_text
+from verse_records import ArticleInfo, VerseRecord, records_to_columns
 
 class BulkHochmaParser:
     def __init__(self):
@@ -16,6 +19,8 @@ class BulkHochmaParser:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        # keep-alive 공유 연결 풀 (게시글마다 새 TCP/TLS 연결을 맺지 않음)
+        self.session = create_session(self.headers)
         self.results = []
         self.failed_ids = []
         self.stats = {
@@ -84,7 +89,7 @@ class BulkHochmaParser:
         url = f"{self.base_url}/{article_id}"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
             # BeautifulSoup으로 파싱
@@ -113,37 +118,22 @@ class BulkHochmaParser:
                         commentary_name = commentary_match.group(1) + " 주석"
                 
                 # 성경책 이름과 장 추출
-                bible_books = ['창세기', '출애굽기', '레위기', '민수기', '신명기', '여호수아', '사사기', 
-                              '룻기', '사무엘상', '사무엘하', '열왕기상', '열왕기하', '역대상', '역대하', 
-                              '에스라', '느헤미야', '에스더', '욥기', '시편', '잠언', '전도서', '아가', 
-                              '이사야', '예레미야', '예레미야애가', '에스겔', '다니엘', '호세아', '요엘', 
-                              '아모스', '오바댜', '요나', '미가', '나훔', '하박국', '스바냐', '학개', 
-                              '스가랴', '말라기', '마태복음', '마가복음', '누가복음', '요한복음', 
-                              '사도행전', '로마서', '고린도전서', '고린도후서', '갈라디아서', '에베소서', 
-                              '빌립보서', '골로새서', '데살로니가전서', '데살로니가후서', '디모데전서', 
-                              '디모데후서', '디도서', '빌레몬서', '히브리서', '야고보서', '베드로전서', 
-                              '베드로후서', '요한1서', '요한2서', '요한3서', '유다서', '요한계시록']
-                
-                for book in bible_books:
-                    if book in title:
-                        book_name = book
-                        # 장 번호 추출
-                        chapter_match = re.search(f'{book}\\s*(\\d+)장', title)
-                        if chapter_match:
-                            chapter = chapter_match.group(1)
-                        break
+                matched_book = find_book_in_text(title)
+                if matched_book:
+                    book_name = matched_book
+                    # 장 번호 추출
+                    chapter_match = re.search(r'(\d+)장', title)
+                    if chapter_match:
+                        chapter = chapter_match.group(1)
             
-            # 본문 내용 추출 (BR 태그를 줄바꿈으로 변환)
+            # 본문 내용 추출 (<br>과 블록 경계를 줄바꿈으로)
             content = ""
             content_selectors = ['.xe_content', '.rd_body', '.rhymix_content', '.document_content']
             
             for selector in content_selectors:
                 content_div = soup.select_one(selector)
                 if content_div:
-                    # <br> 태그를 \n으로 변환
-                    for br in content_div.find_all('br'):
-                        br.replace_with('\n')
-                    content = content_div.get_text()
+                    content = html_to_text(content_div)
                     break
             
             if not content:
@@ -153,6 +143,9 @@ class BulkHochmaParser:
             # 절 패턴 감지 및 파싱
             pattern_type, pattern_data = self.detect_verse_pattern(content)
             
+            # 게시글 메타데이터는 한 번만 만들고 절마다 참조
+            article = ArticleInfo(article_id, url, title, commentary_name, book_name)
+            
             parsed_verses = []
             
             if pattern_type == 'equals':
@@ -163,18 +156,9 @@ class BulkHochmaParser:
                     if i + 1 < len(content_parts):
                         verse_content = content_parts[i + 1].strip()
                         if verse_content:
-                            parsed_verses.append({
-                                'article_id': article_id,
-                                'url': url,
-                                'title': title,
-                                'commentary_name': commentary_name,
-                                'book_name': book_name,
-                                'chapter': int(chapter_num),
-                                'verse': int(verse_num),
-                                'content': verse_content,
-                                'content_length': len(verse_content),
-                                'pattern_type': 'equals'
-                            })
+                            parsed_verses.append(VerseRecord(
+                                article, int(chapter_num), int(verse_num), verse_content, 'equals'
+                            ))
             
             elif pattern_type == 'lines':
                 # 줄바꿈 기반 패턴
@@ -197,33 +181,15 @@ class BulkHochmaParser:
                         for verse_str in individual_verses:
                             if ':' in verse_str:
                                 chapter_num, verse_num = verse_str.split(':')
-                                parsed_verses.append({
-                                    'article_id': article_id,
-                                    'url': url,
-                                    'title': title,
-                                    'commentary_name': commentary_name,
-                                    'book_name': book_name,
-                                    'chapter': int(chapter_num),
-                                    'verse': int(verse_num),
-                                    'content': verse_content,
-                                    'content_length': len(verse_content),
-                                    'pattern_type': 'lines'
-                                })
+                                parsed_verses.append(VerseRecord(
+                                    article, int(chapter_num), int(verse_num), verse_content, 'lines'
+                                ))
             
             else:
                 # 패턴이 없는 경우 전체를 하나의 항목으로
-                parsed_verses.append({
-                    'article_id': article_id,
-                    'url': url,
-                    'title': title,
-                    'commentary_name': commentary_name,
-                    'book_name': book_name,
-                    'chapter': chapter if chapter else 0,
-                    'verse': 0,
-                    'content': content.strip(),
-                    'content_length': len(content.strip()),
-                    'pattern_type': 'none'
-                })
+                parsed_verses.append(VerseRecord(
+                    article, chapter if chapter else 0, 0, content.strip(), 'none'
+                ))
             
             print(f"✅ {article_id}: {len(parsed_verses)}개 절 파싱 완료 ({pattern_type} 패턴)")
             return parsed_verses
@@ -284,7 +250,7 @@ class BulkHochmaParser:
         print(f"💾 엑셀 파일 저장 중: {filename}")
         
         # 데이터프레임 생성
-        df = pd.DataFrame(self.results)
+        df = pd.DataFrame(records_to_columns(self.results))
         
         # 엑셀 워크북 생성
         wb = Workbook()
@@ -0,0 +1,189 @@
+"""
+장 단위 번들 파일 빌드/읽기
+verses와 모든 주석 출처를 장 단위로 미리 합친 JSON을 하나의 파일에 이어 붙이고
+고정 크기 오프셋 인덱스를 앞에 둬서, 앱이 SQL 없이 한 번의 seek(또는 mmap 슬라이스)로
+장 하나를 읽을 수 있게 함
+
+파일 형식 (리틀 엔디언)
+- 헤더 16바이트: magic b'HCBD', 형식 버전(uint16), 예약(uint16), 장 수(uint32), 예약(uint32)
+- 인덱스: 장 수 x 12바이트 (오프셋 uint64, 길이 uint32)
+  장 인덱스는 bible_reference.chapter_index() 순서 (창세기 1장 = 0), 길이 0은 데이터 없음
+- 데이터: 장별 UTF-8 JSON
+  {"book": "창세기", "chapter": 1, "verses": [
+      {"verse": 1, "text": {"번역본": "본문"}, "title": {"번역본": "소제목"},
+       "commentaries": [{"name": "주석명", "text": "주석 본문"}]}]}
+"""
+
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import time
+
+import bible_reference
+import commentary_db
+
+BUNDLE_MAGIC = b'HCBD'
+BUNDLE_VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+INDEX_ENTRY = struct.Struct('<QI')
+
+
+def _chapter_rows(conn, select, book_name, chapter):
+    """
+    장 하나의 행 조회 (앱의 get-commentaries / get-bible-verses와 같은 book_name/chapter 조건)
+    절 서수 범위로 찾으면 서수가 없는 행(0절 서론, 범위 밖 절)이 빠지므로 컬럼으로 조회
+    """
+    return conn.execute(
+        f"{select} WHERE book_name = ? AND chapter = ? ORDER BY verse", (book_name, chapter)
+    ).fetchall()
+
+
+def build_chapter(conn, book_name, chapter, verse_select=None, commentary_select=None):
+    """
+    장 하나의 번들 데이터 (절마다 번역본 본문과 주석을 미리 합침)
+
+    Returns:
+        dict: 장 데이터 (절도 주석도 없으면 None)
+    """
+    verses = {}
+
+    def verse_entry(verse):
+        entry = verses.get(verse)
+        if entry is None:
+            entry = verses[verse] = {'verse': verse, 'text': {}, 'commentaries': []}
+        return entry
+
+    if verse_select:
+        for verse, version, text, title in _chapter_rows(conn, verse_select, book_name, chapter):
+            entry = verse_entry(verse)
+            entry['text'][version] = text
+            if title:
+                entry.setdefault('title', {})[version] = title
+
+    if commentary_select:
+        for verse, name, text in _chapter_rows(conn, commentary_select, book_name, chapter):
+            verse_entry(verse)['commentaries'].append({'name': name, 'text': text})
+
+    if not verses:
+        return None
+    return {'book': book_name, 'chapter': chapter, 'verses': [verses[v] for v in sorted(verses)]}
+
+
+def build_bundle(db_path='bible_database.db', output='chapter_bundle.bin'):
+    """
+    DB 전체를 장 단위 번들 파일로 빌드
+
+    Returns:
+        dict: 장 수, 데이터가 있는 장 수, 파일 크기
+    """
+    conn = sqlite3.connect(db_path)
+    commentary_db.register_functions(conn)
+
+    verse_columns = commentary_db.table_columns(conn, 'verses')
+    commentary_columns = commentary_db.table_columns(conn, 'commentaries')
+    verse_select = None
+    if verse_columns:
+        title = 'verse_title' if 'verse_title' in verse_columns else 'NULL'
+        verse_select = f"SELECT verse, version, text, {title} FROM verses"
+    commentary_select = None
+    if commentary_columns:
+        # 중복 제거/압축 저장 모드의 본문을 복원하는 서브쿼리
+        commentary_select = (f"SELECT verse, commentary_name, text FROM "
+                             f"({commentary_db.commentary_select(conn)})")
+
+    temp_path = output + '.tmp'
+    index = []
+    filled = 0
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, 0, bible_reference.TOTAL_CHAPTERS, 0))
+        f.write(b'\0' * INDEX_ENTRY.size * bible_reference.TOTAL_CHAPTERS)
+
+        for book_name in bible_reference.BOOK_NAMES:
+            for chapter in range(1, bible_reference.chapter_count(book_name) + 1):
+                data = build_chapter(conn, book_name, chapter, verse_select, commentary_select)
+                if data is None:
+                    index.append((0, 0))
+                    continue
+                payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                index.append((f.tell(), len(payload)))
+                f.write(payload)
+                filled += 1
+
+        f.seek(HEADER.size)
+        f.write(b''.join(INDEX_ENTRY.pack(offset, length) for offset, length in index))
+
+    conn.close()
+    os.replace(temp_path, output)
+    return {'chapters': len(index), 'filled': filled, 'size': os.path.getsize(output)}
+
+
+class ChapterBundle:
+    def __init__(self, path='chapter_bundle.bin'):
+        """
+        번들 파일 읽기 (mmap, 장 하나는 인덱스 조회 + 슬라이스 한 번)
+
+        Args:
+            path (str): build_bundle로 만든 파일 경로
+        """
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, chapter_count, _ = HEADER.unpack_from(self._mmap, 0)
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            self.close()
+            raise ValueError(f"지원하지 않는 번들 파일입니다: {path}")
+        self.chapter_count = chapter_count
+
+    def chapter_bytes(self, book, chapter):
+        """
+        장 데이터 원본 JSON 바이트 (memoryview, 복사 없음)
+
+        Returns:
+            memoryview: 장 JSON (데이터가 없으면 None)
+        """
+        index = bible_reference.chapter_index(book, chapter)
+        if index is None or index >= self.chapter_count:
+            return None
+        offset, length = INDEX_ENTRY.unpack_from(self._mmap, HEADER.size + index * INDEX_ENTRY.size)
+        if not length:
+            return None
+        return memoryview(self._mmap)[offset:offset + length]
+
+    def chapter(self, book, chapter):
+        """
+        장 데이터
+
+        Returns:
+            dict: 장 데이터 (데이터가 없으면 None)
+        """
+        data = self.chapter_bytes(book, chapter)
+        if data is None:
+            return None
+        try:
+            return json.loads(bytes(data))
+        finally:
+            data.release()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+if __name__ == "__main__":
+    db_path = sys.argv[1] if len(sys.argv) > 1 else 'bible_database.db'
+    output = sys.argv[2] if len(sys.argv) > 2 else 'chapter_bundle.bin'
+    print(f"장 번들 빌드: {db_path} -> {output}")
+    start = time.time()
+    result = build_bundle(db_path, output)
+    print(f"  {result['filled']:,}/{result['chapters']:,}개 장, "
+          f"{result['size'] / 1024 / 1024:.1f}MB ({time.time() - start:.1f}초)")
@@ -1,4 +1,4 @@
-import requests
+from http_client import create_session
 from bs4 import BeautifulSoup
 import re
 import sqlite3
@@ -6,11 +6,12 @@ import pandas as pd
 import json
 from collections import defaultdict
 import time
+from bible_reference import get_book_code
 
 class HochmaAvailabilityChecker:
     def __init__(self):
         self.base_url = "https://nocr.net/index.php?mid=com_kor_hochma&document_srl="
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
@@ -26,29 +27,15 @@ class HochmaAvailabilityChecker:
             query = """
             SELECT book_name, MAX(chapter) as max_chapter
             FROM verses 
-            GROUP BY book_name 
-            ORDER BY 
-                CASE book_name
-                    WHEN '창세기' THEN 1 WHEN '출애굽기' THEN 2 WHEN '레위기' THEN 3 WHEN '민수기' THEN 4 WHEN '신명기' THEN 5
-                    WHEN '여호수아' THEN 6 WHEN '사사기' THEN 7 WHEN '룻기' THEN 8 WHEN '사무엘상' THEN 9 WHEN '사무엘하' THEN 10
-                    WHEN '열왕기상' THEN 11 WHEN '열왕기하' THEN 12 WHEN '역대상' THEN 13 WHEN '역대하' THEN 14 WHEN '에스라' THEN 15
-                    WHEN '느헤미야' THEN 16 WHEN '에스더' THEN 17 WHEN '욥기' THEN 18 WHEN '시편' THEN 19 WHEN '잠언' THEN 20
-                    WHEN '전도서' THEN 21 WHEN '아가' THEN 22 WHEN '이사야' THEN 23 WHEN '예레미야' THEN 24 WHEN '예레미야애가' THEN 25
-                    WHEN '에스겔' THEN 26 WHEN '다니엘' THEN 27 WHEN '호세아' THEN 28 WHEN '요엘' THEN 29 WHEN '아모스' THEN 30
-                    WHEN '오바댜' THEN 31 WHEN '요나' THEN 32 WHEN '미가' THEN 33 WHEN '나훔' THEN 34 WHEN '하박국' THEN 35
-                    WHEN '스바냐' THEN 36 WHEN '학개' THEN 37 WHEN '스가랴' THEN 38 WHEN '말라기' THEN 39 WHEN '마태복음' THEN 40
-                    WHEN '마가복음' THEN 41 WHEN '누가복음' THEN 42 WHEN '요한복음' THEN 43 WHEN '사도행전' THEN 44 WHEN '로마서' THEN 45
-                    WHEN '고린도전서' THEN 46 WHEN '고린도후서' THEN 47 WHEN '갈라디아서' THEN 48 WHEN '에베소서' THEN 49 WHEN '빌립보서' THEN 50
-                    WHEN '골로새서' THEN 51 WHEN '데살로니가전서' THEN 52 WHEN '데살로니가후서' THEN 53 WHEN '디모데전서' THEN 54 WHEN '디모데후서' THEN 55
-                    WHEN '디도서' THEN 56 WHEN '빌레몬서' THEN 57 WHEN '히브리서' THEN 58 WHEN '야고보서' THEN 59 WHEN '베드로전서' THEN 60
-                    WHEN '베드로후서' THEN 61 WHEN '요한일서' THEN 62 WHEN '요한이서' THEN 63 WHEN '요한삼서' THEN 64 WHEN '유다서' THEN 65
-                    WHEN '요한계시록' THEN 66 ELSE 999
-                END
+            GROUP BY book_name
             """
             
             df = pd.read_sql_query(query, conn)
             conn.close()
             
+            # 정경 순서로 정렬
+            df = df.sort_values('book_name', key=lambda names: names.map(get_book_code), kind='stable')
+            
             result = {}
             for _, row in df.iterrows():
                 result[row['book_name']] = row['max_chapter']
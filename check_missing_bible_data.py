@@ -1,32 +1,11 @@
 import pandas as pd
 import sys
-import json
+from bible_reference import BOOK_NAMES, VERSE_COUNTS, chapter_count
 
 def check_missing_bible_data(excel_file_path, output_file_path):
-    # Hardcoded Bible structure (Protestant Canon: Book Name -> Number of Chapters)
-    bible_structure = {
-        "창세기": 50, "출애굽기": 40, "레위기": 27, "민수기": 36, "신명기": 34,
-        "여호수아": 24, "사사기": 21, "룻기": 4, "사무엘상": 31, "사무엘하": 24,
-        "열왕기상": 22, "열왕기하": 25, "역대상": 29, "역대하": 36, "에스라": 10,
-        "느헤미야": 13, "에스더": 10, "욥기": 42, "시편": 150, "잠언": 31,
-        "전도서": 12, "아가": 8, "이사야": 66, "예레미야": 52, "예레미야애가": 5,
-        "에스겔": 48, "다니엘": 12, "호세아": 14, "요엘": 3, "아모스": 9,
-        "오바댜": 1, "요나": 4, "미가": 7, "나훔": 3, "하박국": 3,
-        "스바냐": 3, "학개": 2, "스가랴": 14, "말라기": 4,
-        "마태복음": 28, "마가복음": 16, "누가복음": 24, "요한복음": 21, "사도행전": 28,
-        "로마서": 16, "고린도전서": 16, "고린도후서": 13, "갈라디아서": 6, "에베소서": 6,
-        "빌립보서": 4, "골로새서": 4, "데살로니가전서": 5, "데살로니가후서": 3,
-        "디모데전서": 6, "디모데후서": 4, "디도서": 3, "빌레몬서": 1,
-        "히브리서": 13, "야고보서": 5, "베드로전서": 5, "베드로후서": 3,
-        "요한일서": 5, "요한이서": 1, "요한삼서": 1, "유다서": 1, "요한계시록": 22
-    }
-
-    try:
-        with open('bible_verse_counts.json', 'r', encoding='utf-8') as f:
-            bible_verse_counts = json.load(f)
-    except FileNotFoundError:
-        print("bible_verse_counts.json 파일을 찾을 수 없습니다. 절 수 검증이 제한됩니다.")
-        bible_verse_counts = {}
+    # Bible structure (Protestant Canon: Book Name -> Number of Chapters)
+    bible_structure = {book: chapter_count(book) for book in BOOK_NAMES}
+    bible_verse_counts = VERSE_COUNTS
 
     original_stdout = sys.stdout
     with open(output_file_path, 'w', encoding='utf-8') as f:
@@ -1,5 +1,7 @@
 import sqlite3
 
+import commentary_db
+
 def check_table_structure():
     """commentaries 테이블 구조 확인"""
     db_path = 'bible_database.db'
@@ -47,83 +49,21 @@ def check_table_structure():
         conn.close()
 
 def fix_table_structure():
-    """테이블 구조 수정"""
+    """테이블 구조 수정 (commentary_db 통합 스키마로 제자리 마이그레이션)"""
     db_path = 'bible_database.db'
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
     
     try:
         print("테이블 구조 수정 시작...")
         
-        # 기존 테이블 백업
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS commentaries_backup AS 
-            SELECT * FROM commentaries
-        """)
-        
-        # 기존 테이블 삭제
-        cursor.execute("DROP TABLE IF EXISTS commentaries")
-        
-        # 새 테이블 생성
-        cursor.execute('''
-            CREATE TABLE commentaries ( 
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                commentary_name TEXT,
-                book_name TEXT,
-                book_code TEXT,
-                chapter INTEGER,
-                verse INTEGER,
-                text TEXT,
-                version TEXT DEFAULT 'hochma',
-                verse_title TEXT,
-                article_id INTEGER,
-                url TEXT,
-                parsed_date TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # 인덱스 생성
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_commentaries_book_chapter_verse 
-            ON commentaries(book_name, chapter, verse)
-        ''')
-        
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_commentaries_article_id 
-            ON commentaries(article_id)
-        ''')
-        
-        # 백업 데이터가 있다면 복원 (가능한 컬럼만)
-        cursor.execute("SELECT COUNT(*) FROM commentaries_backup")
-        backup_count = cursor.fetchone()[0]
-        
-        if backup_count > 0:
-            print(f"백업 데이터 {backup_count}개 복원 중...")
-            
-            # 공통 컬럼 확인
-            cursor.execute("PRAGMA table_info(commentaries_backup)")
-            backup_columns = [col[1] for col in cursor.fetchall()]
-            
-            cursor.execute("PRAGMA table_info(commentaries)")
-            new_columns = [col[1] for col in cursor.fetchall()]
-            
-            # 공통 컬럼만 복원
-            common_columns = [col for col in backup_columns if col in new_columns and col != 'id']
-            
-            if common_columns:
-                columns_str = ', '.join(common_columns)
-                cursor.execute(f"""
-                    INSERT INTO commentaries ({columns_str})
-                    SELECT {columns_str} FROM commentaries_backup
-                """)
-                print(f"  {len(common_columns)}개 컬럼 복원 완료")
+        # 구버전 스키마(v0)만 테이블을 복사하고, v1 이상은 빠진 인덱스/트리거만 추가
+        if not commentary_db.ensure_commentaries_schema(conn):
+            print("이미 최신 스키마입니다.")
         
-        conn.commit()
         print("테이블 구조 수정 완료!")
         
         # 수정된 구조 확인
-        cursor.execute("PRAGMA table_info(commentaries)")
+        cursor = conn.execute("PRAGMA table_info(commentaries)")
         columns = cursor.fetchall()
         
         print("\n수정된 테이블 구조:")
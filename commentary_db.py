@@ -0,0 +1,1307 @@
+"""
+주석 데이터베이스 공통 유틸리티
+commentaries 통합 스키마(버전은 PRAGMA user_version)와 구버전 스키마 마이그레이션,
+commentaries / verses 테이블의 전체 성경 절 서수(verse_ordinal) 컬럼과
+범위 조회용 인덱스, FTS5 전문 검색 인덱스를 관리
+
+본문 범위(예: 창세기 31:1-32:5)는 verse_ordinal BETWEEN ? AND ? 하나의
+인덱스 범위 스캔이 되고, 장을 넘나드는 조회도 다중 컬럼 정렬이 필요 없음
+
+본문 중복 제거 모드(commentary_contents 테이블이 있는 경우)에서는
+19:10-14 같은 범위 절이 공유하는 주석 본문을 해시 키로 한 번만 저장하고
+commentaries 행은 content_id로 참조 (commentaries.text는 빈 문자열)
+
+압축 저장 모드(commentary_dictionaries 테이블이 있는 경우)에서는
+commentary_contents.text에 학습된 공유 사전으로 압축한 zstd 프레임(BLOB)을
+저장하고, commentary_text() SQL 함수와 commentary_select()가 읽을 때 자동 복원
+(선택 의존성: pip install zstandard)
+
+전문 검색은 trigram 토크나이저를 쓰는 external content FTS5 테이블
+(commentaries_fts, verses_fts)로 처리하고, 원본 테이블의 트리거가
+INSERT/UPDATE/DELETE 때마다 인덱스를 갱신
+(압축 저장 모드의 commentary_contents_fts만 store_content / prune_contents가 직접 갱신)
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+
+from bible_reference import (BOOK_NAMES, chapter_count, get_book_code, parse_passage, resolve_book_name,
+                             verse_ordinal)
+
+# 테이블별 verse_ordinal 범위 조회 인덱스
+# commentaries: 서수 범위 스캔 + 주석명 필터를 인덱스에서 처리
+#   (SELECT * / commentary_select()는 나머지 컬럼을 테이블에서 읽으므로 커버링 인덱스는 아님)
+# verses: 번역본별 범위 스캔
+VERSE_ORDINAL_INDEXES = {
+    'commentaries': ('idx_commentaries_verse_ordinal', 'verse_ordinal, commentary_name'),
+    'verses': ('idx_verses_version_ordinal', 'version, verse_ordinal'),
+}
+
+# 앱(src/main/index.ts)이 commentaries.text를 직접 읽는 DB 파일 이름
+# 중복 제거/압축 저장 모드는 text를 비우므로 이 파일에는 적용하지 않고
+# 작업용 사본에 적용한 뒤 release_build.py로 본문을 복원한 배포 DB를 만듦
+APP_DATABASE_NAME = 'bible_database.db'
+
+
+def table_columns(conn, table):
+    """테이블 컬럼 이름 목록 (테이블이 없으면 빈 리스트)"""
+    cursor = conn.execute(f"PRAGMA table_info({table})")
+    return [info[1] for info in cursor.fetchall()]
+
+
+def _sql_verse_ordinal(book_name, book_code, chapter, verse):
+    """SQLite 사용자 함수: 성경책 이름(없으면 코드)으로 절 서수 계산"""
+    ordinal = verse_ordinal(book_name, chapter, verse)
+    if ordinal is None and book_code not in (None, ''):
+        ordinal = verse_ordinal(book_code, chapter, verse)
+    return ordinal
+
+
+def register_functions(conn):
+    """
+    연결에 SQL 함수 등록
+    - bible_verse_ordinal(book_name, book_code, chapter, verse)
+    - commentary_text(text): 압축된 본문 복원 (압축 사전도 함께 로드)
+    """
+    # 이미 등록된 연결은 다시 만들지 않음 (FTS5에 쓰는 중인 트랜잭션에서는 재정의가 실패함)
+    try:
+        conn.execute("SELECT commentary_text(NULL)")
+    except sqlite3.OperationalError:
+        conn.create_function('bible_verse_ordinal', 4, _sql_verse_ordinal, deterministic=True)
+        conn.create_function('commentary_text', 1, decode_text, deterministic=True)
+    _load_dictionaries(conn)
+
+
+def ensure_verse_ordinal(conn, table='commentaries'):
+    """
+    verse_ordinal 컬럼과 범위 조회 인덱스 보장
+
+    Returns:
+        bool: 테이블이 존재해서 처리했으면 True
+    """
+    columns = table_columns(conn, table)
+    if not columns:
+        return False
+
+    if 'verse_ordinal' not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN verse_ordinal INTEGER")
+        print(f"Added 'verse_ordinal' column to {table} table.")
+
+    index_name, index_columns = VERSE_ORDINAL_INDEXES.get(
+        table, (f'idx_{table}_verse_ordinal', 'verse_ordinal')
+    )
+    if not all(col.strip() in columns + ['verse_ordinal'] for col in index_columns.split(',')):
+        # 구버전 스키마 (예: commentary_name 없음)는 서수 단일 인덱스
+        index_columns = 'verse_ordinal'
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table}({index_columns})")
+    return True
+
+
+def backfill_verse_ordinals(conn, table='commentaries'):
+    """
+    verse_ordinal이 비어 있는 행을 채움
+
+    Returns:
+        int: 갱신된 행 수
+    """
+    if not ensure_verse_ordinal(conn, table):
+        return 0
+
+    columns = table_columns(conn, table)
+    book_column = 'book_name' if 'book_name' in columns else 'book'
+    code_column = 'book_code' if 'book_code' in columns else 'NULL'
+
+    register_functions(conn)
+    cursor = conn.execute(f"""
+        UPDATE {table}
+        SET verse_ordinal = bible_verse_ordinal({book_column}, {code_column}, chapter, verse)
+        WHERE verse_ordinal IS NULL
+    """)
+    return cursor.rowcount
+
+
+def commentary_ordinal(book_name, chapter, verse, book_code=None):
+    """저장 직전 행의 verse_ordinal 계산 (book_code는 이름을 모를 때 사용)"""
+    return _sql_verse_ordinal(book_name, book_code, chapter, verse)
+
+
+# commentaries 통합 스키마 버전 (PRAGMA user_version)
+# 1: 통합 컬럼/인덱스
+# 2: commentary_changes 변경 로그 (조회 캐시 무효화용)
+# 3: commentary_stats 성경책/주석별 집계 (트리거로 증분 갱신)
+# 4: 압축 저장 모드의 commentary_contents_fts 트리거 제거 (commentary_text() 없는 연결도 쓰기 가능)
+COMMENTARIES_SCHEMA_VERSION = 4
+
+COMMENTARIES_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        commentary_name TEXT NOT NULL,
+        book_name TEXT NOT NULL,
+        book_code INTEGER NOT NULL,
+        chapter INTEGER NOT NULL,
+        verse INTEGER NOT NULL,
+        verse_ordinal INTEGER,
+        text TEXT NOT NULL DEFAULT '',
+        content_id INTEGER,
+        version TEXT NOT NULL DEFAULT 'hochma',
+        verse_title TEXT,
+        article_id INTEGER,
+        original_url TEXT,
+        pattern_type TEXT,
+        verse_separator TEXT,
+        parsed_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+COMMENTARIES_COLUMNS = (
+    'id', 'commentary_name', 'book_name', 'book_code', 'chapter', 'verse', 'verse_ordinal',
+    'text', 'content_id', 'version', 'verse_title', 'article_id', 'original_url',
+    'pattern_type', 'verse_separator', 'parsed_date',
+)
+
+# 통합 스키마 인덱스 (앱의 book_name/chapter 조회, 서수 범위 조회, 게시글/본문 참조)
+COMMENTARIES_INDEXES = {
+    'idx_commentaries_verse_ordinal': 'verse_ordinal, commentary_name',
+    'idx_commentaries_book_chapter_verse': 'book_name, chapter, verse',
+    'idx_commentaries_article_id': 'article_id',
+    'idx_commentaries_content_id': 'content_id',
+}
+
+# 구버전 스키마에만 있던 인덱스 (book_chapter_verse의 접두사라 중복)
+LEGACY_COMMENTARIES_INDEXES = (
+    'idx_commentaries_book', 'idx_commentaries_chapter',
+    'idx_commentaries_verse', 'idx_commentaries_version',
+)
+
+
+def schema_version(conn):
+    """DB의 commentaries 스키마 버전 (PRAGMA user_version)"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _create_commentaries_indexes(conn):
+    for index_name in LEGACY_COMMENTARIES_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {index_name}")
+    for index_name, index_columns in COMMENTARIES_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON commentaries({index_columns})")
+
+
+def ensure_change_log(conn):
+    """
+    commentaries 변경 로그 테이블과 트리거 보장
+    (주석명, 성경책, 장)마다 마지막 변경 id 한 행만 유지하므로
+    WHERE id > ? 조회로 마지막 확인 이후 바뀐 장을 알 수 있음
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS commentary_changes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            commentary_name TEXT,
+            book_name TEXT,
+            chapter INTEGER,
+            UNIQUE(commentary_name, book_name, chapter)
+        )
+    """)
+    log_new = ("INSERT OR REPLACE INTO commentary_changes (commentary_name, book_name, chapter) "
+               "VALUES (new.commentary_name, new.book_name, new.chapter);")
+    log_old = ("INSERT OR REPLACE INTO commentary_changes (commentary_name, book_name, chapter) "
+               "VALUES (old.commentary_name, old.book_name, old.chapter);")
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS commentary_changes_ai AFTER INSERT ON commentaries BEGIN
+            {log_new}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS commentary_changes_au AFTER UPDATE ON commentaries BEGIN
+            {log_old}
+            {log_new}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS commentary_changes_ad AFTER DELETE ON commentaries BEGIN
+            {log_old}
+        END
+    """)
+
+
+def _stats_length_expr(conn, row):
+    """트리거 안에서 행(new/old)의 본문 글자 수를 구하는 SQL 식"""
+    if content_dedup_enabled(conn):
+        return (f"(length({row}.text) + COALESCE((SELECT text_length FROM commentary_contents "
+                f"WHERE id = {row}.content_id), 0))")
+    return f"length({row}.text)"
+
+
+def _ensure_content_lengths(conn, batch_size=1000):
+    """commentary_contents.text_length 컬럼 보장 (없던 DB는 본문을 복원해서 채움)"""
+    if not content_dedup_enabled(conn) or 'text_length' in table_columns(conn, 'commentary_contents'):
+        return
+    conn.execute("ALTER TABLE commentary_contents ADD COLUMN text_length INTEGER")
+    register_functions(conn)
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, text FROM commentary_contents WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, batch_size)
+        ).fetchall()
+        if not rows:
+            break
+        conn.executemany(
+            "UPDATE commentary_contents SET text_length = ? WHERE id = ?",
+            [(len(decode_text(text)), row_id) for row_id, text in rows]
+        )
+        last_id = rows[-1][0]
+
+
+def ensure_stats(conn):
+    """
+    commentary_stats 집계 테이블과 증분 갱신 트리거 보장
+    (주석명, 성경책)마다 주석 수와 본문 글자 수 합계를 유지해서
+    통계 조회가 전체 테이블 GROUP BY 대신 최대 66 x 주석 수 행만 읽음
+    트리거는 현재 저장 모드(중복 제거 여부)에 맞게 다시 만듦
+    """
+    _ensure_content_lengths(conn)
+    created = not has_table(conn, 'commentary_stats')
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS commentary_stats (
+            commentary_name TEXT NOT NULL,
+            book_name TEXT NOT NULL,
+            book_code INTEGER,
+            commentary_count INTEGER NOT NULL DEFAULT 0,
+            text_length INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (commentary_name, book_name)
+        ) WITHOUT ROWID
+    """)
+
+    add_new = f"""
+        INSERT INTO commentary_stats (commentary_name, book_name, book_code, commentary_count, text_length)
+        VALUES (new.commentary_name, new.book_name, new.book_code, 1, {_stats_length_expr(conn, 'new')})
+        ON CONFLICT (commentary_name, book_name) DO UPDATE SET
+            commentary_count = commentary_count + 1,
+            text_length = text_length + excluded.text_length;
+    """
+    remove_old = f"""
+        UPDATE commentary_stats SET
+            commentary_count = commentary_count - 1,
+            text_length = text_length - {_stats_length_expr(conn, 'old')}
+        WHERE commentary_name = old.commentary_name AND book_name = old.book_name;
+    """
+    for suffix in ('ai', 'ad', 'au'):
+        conn.execute(f"DROP TRIGGER IF EXISTS commentary_stats_{suffix}")
+    conn.execute(f"CREATE TRIGGER commentary_stats_ai AFTER INSERT ON commentaries BEGIN {add_new} END")
+    conn.execute(f"CREATE TRIGGER commentary_stats_ad AFTER DELETE ON commentaries BEGIN {remove_old} END")
+    conn.execute(f"""
+        CREATE TRIGGER commentary_stats_au
+        AFTER UPDATE OF commentary_name, book_name, text, content_id ON commentaries
+        BEGIN {remove_old} {add_new} END
+    """)
+
+    if created:
+        rebuild_stats(conn)
+
+
+def rebuild_stats(conn):
+    """commentary_stats를 commentaries 전체에서 다시 집계 (증분 갱신 복구용)"""
+    length = "length(c.text)"
+    join = ""
+    if content_dedup_enabled(conn):
+        length = "(length(c.text) + COALESCE(cc.text_length, 0))"
+        join = "LEFT JOIN commentary_contents cc ON cc.id = c.content_id"
+    conn.execute("DELETE FROM commentary_stats")
+    conn.execute(f"""
+        INSERT INTO commentary_stats (commentary_name, book_name, book_code, commentary_count, text_length)
+        SELECT c.commentary_name, c.book_name, MIN(c.book_code), COUNT(*), COALESCE(SUM({length}), 0)
+        FROM commentaries c {join}
+        GROUP BY c.commentary_name, c.book_name
+    """)
+
+
+def get_statistics(conn):
+    """
+    commentary_stats 기준 주석 통계
+
+    Returns:
+        dict: 전체 주석 수, 성경책별/주석별 주석 수, 본문 글자 수 합계
+    """
+    total_count, total_length = conn.execute(
+        "SELECT COALESCE(SUM(commentary_count), 0), COALESCE(SUM(text_length), 0) FROM commentary_stats"
+    ).fetchone()
+    book_stats = conn.execute("""
+        SELECT book_name, SUM(commentary_count) AS count
+        FROM commentary_stats
+        GROUP BY book_name
+        HAVING count > 0
+        ORDER BY MIN(book_code)
+    """).fetchall()
+    commentary_stats = conn.execute("""
+        SELECT commentary_name, SUM(commentary_count) AS count
+        FROM commentary_stats
+        GROUP BY commentary_name
+        HAVING count > 0
+        ORDER BY count DESC
+    """).fetchall()
+    return {
+        'total_commentaries': total_count,
+        'books': dict(book_stats),
+        'commentary_types': dict(commentary_stats),
+        'total_text_length': total_length,
+    }
+
+
+def get_chapter_coverage(conn, commentary_name=None):
+    """
+    성경책별 주석이 있는 장 / 없는 장 (정경 순서)
+
+    Args:
+        commentary_name (str): 주석명 (None이면 모든 주석)
+
+    Returns:
+        list: (성경책, 주석이 있는 장 수, 전체 장 수, 없는 장 리스트) 목록
+    """
+    sql = "SELECT DISTINCT book_name, CAST(chapter AS INTEGER) FROM commentaries"
+    params = ()
+    if commentary_name:
+        sql += " WHERE commentary_name = ?"
+        params = (commentary_name,)
+    covered = {}
+    for book_name, chapter in conn.execute(sql, params):
+        book = resolve_book_name(book_name)
+        if book:
+            covered.setdefault(book, set()).add(chapter)
+
+    coverage = []
+    for book in BOOK_NAMES:
+        total = chapter_count(book)
+        chapters = covered.get(book, set())
+        missing = [chapter for chapter in range(1, total + 1) if chapter not in chapters]
+        coverage.append((book, total - len(missing), total, missing))
+    return coverage
+
+
+# 실패 게시글 분류 (failed_articles.kind)
+FAILURE_KINDS = ('network', 'http', 'parse', 'db', 'exception')
+
+# 다시 받아도 결과가 같은 파싱 단계 실패 메시지 (네트워크 재시도 대상 아님)
+PARSE_FAILURES = ("제목 추출 실패", "성경책 정보 추출 실패", "본문 추출 실패", "절 파싱 실패")
+
+
+def failure_kind(error):
+    """게시글 파싱 오류 메시지의 분류 (FAILURE_KINDS)"""
+    error = error or ''
+    if error.startswith('HTTP '):
+        return 'http'
+    if error.startswith('network error'):
+        return 'network'
+    if error.startswith('db error'):
+        return 'db'
+    if error in PARSE_FAILURES:
+        return 'parse'
+    return 'exception'
+
+
+def ensure_failed_articles(conn):
+    """
+    수집 실패 게시글(dead-letter) 테이블 보장
+    재시도까지 실패한 게시글을 게시글당 한 행으로 남기고, 다시 성공하면 행을 삭제
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS failed_articles (
+            article_id INTEGER PRIMARY KEY,
+            url TEXT,
+            title TEXT,
+            kind TEXT NOT NULL,
+            error TEXT,
+            attempts INTEGER NOT NULL DEFAULT 1,
+            first_failed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_failed TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def record_failed_article(conn, article_id, kind, error, url=None, title=None):
+    """실패 게시글 기록 (이미 있으면 시도 횟수와 마지막 오류 갱신)"""
+    conn.execute("""
+        INSERT INTO failed_articles (article_id, url, title, kind, error)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (article_id) DO UPDATE SET
+            url = COALESCE(excluded.url, url),
+            title = COALESCE(excluded.title, title),
+            kind = excluded.kind,
+            error = excluded.error,
+            attempts = attempts + 1,
+            last_failed = CURRENT_TIMESTAMP
+    """, (article_id, url, title, kind, error))
+
+
+def resolve_failed_article(conn, article_id):
+    """
+    성공한 게시글을 실패 목록에서 제거
+
+    Returns:
+        bool: 실패 목록에 있었는지 여부
+    """
+    return conn.execute("DELETE FROM failed_articles WHERE article_id = ?", (article_id,)).rowcount > 0
+
+
+def get_failed_articles(conn, kinds=None, limit=None):
+    """
+    실패 게시글 목록 (article_id 순)
+
+    Args:
+        kinds (list): 가져올 분류 (None이면 전체)
+        limit (int): 최대 개수
+
+    Returns:
+        list: {'article_id', 'url', 'title', 'kind', 'error', 'attempts', 'last_failed'} 딕셔너리 리스트
+    """
+    if not has_table(conn, 'failed_articles'):
+        return []
+    sql = "SELECT article_id, url, title, kind, error, attempts, last_failed FROM failed_articles"
+    params = []
+    if kinds:
+        sql += f" WHERE kind IN ({', '.join('?' * len(kinds))})"
+        params.extend(kinds)
+    sql += " ORDER BY article_id LIMIT ?"
+    params.append(limit or -1)
+    columns = ('article_id', 'url', 'title', 'kind', 'error', 'attempts', 'last_failed')
+    return [dict(zip(columns, row)) for row in conn.execute(sql, params)]
+
+
+def _finish_schema(conn):
+    """최신 스키마의 인덱스, FTS, 변경 로그를 만들고 버전 기록"""
+    _create_commentaries_indexes(conn)
+    ensure_fts(conn, 'commentaries')
+    ensure_change_log(conn)
+    ensure_stats(conn)
+    conn.execute(f"PRAGMA user_version = {COMMENTARIES_SCHEMA_VERSION}")
+    conn.commit()
+
+
+def ensure_commentaries_schema(conn, batch_size=1000):
+    """
+    commentaries 통합 스키마 보장
+    테이블이 없으면 만들고, 구버전 스키마면 제자리 마이그레이션
+    (테이블 교체 도중 중단돼 commentaries_migrating만 남았으면 교체를 마무리)
+    이미 최신 버전이면 PRAGMA user_version 하나만 확인
+
+    Returns:
+        bool: 스키마를 만들거나 마이그레이션했으면 True
+    """
+    version = schema_version(conn)
+    if version >= COMMENTARIES_SCHEMA_VERSION and has_table(conn, 'commentaries'):
+        return False
+
+    if not has_table(conn, 'commentaries'):
+        if has_table(conn, 'commentaries_migrating'):
+            # 복사는 끝났고 구버전 테이블만 삭제된 상태
+            conn.execute("ALTER TABLE commentaries_migrating RENAME TO commentaries")
+        else:
+            conn.execute(COMMENTARIES_SCHEMA.format(table='commentaries'))
+    elif version < 1:
+        migrate_commentaries_schema(conn, batch_size)
+        return True
+    _finish_schema(conn)
+    return True
+
+
+def _convert_legacy_row(row):
+    """구버전 commentaries 행(딕셔너리)을 통합 스키마 값 튜플로 변환"""
+    book_name = row.get('book_name') or row.get('book') or ''
+    book_name = resolve_book_name(book_name) or book_name
+    book_code = row.get('book_code')
+    if isinstance(book_code, str):
+        book_code = int(book_code) if book_code.isdigit() else None
+    if not book_code:
+        book_code = get_book_code(book_name)
+
+    commentary_name = row.get('commentary_name')
+    text = row.get('text')
+    if text is None:
+        # import_commentaries.py 스키마: commentary = "주석서: 주석 내용"
+        text = row.get('commentary') or ''
+        if not commentary_name and ': ' in text:
+            commentary_name, text = text.split(': ', 1)
+
+    ordinal = row.get('verse_ordinal')
+    if ordinal is None:
+        ordinal = commentary_ordinal(book_name, row.get('chapter'), row.get('verse'), book_code)
+
+    return (
+        row['id'],
+        commentary_name or '호크마 주석',
+        book_name,
+        book_code,
+        row.get('chapter') or 0,
+        row.get('verse') or 0,
+        ordinal,
+        text,
+        row.get('content_id'),
+        row.get('version') or 'hochma',
+        row.get('verse_title'),
+        row.get('article_id'),
+        row.get('original_url') or row.get('url'),
+        row.get('pattern_type'),
+        row.get('verse_separator'),
+        row.get('parsed_date') or row.get('created_at'),
+    )
+
+
+def migrate_commentaries_schema(conn, batch_size=1000):
+    """
+    구버전 commentaries 스키마(벌크 파서, 고급 파서, 라인 기반 파서, import_commentaries)를
+    통합 스키마로 제자리 변환
+    id를 유지한 채 commentaries_migrating 테이블에 batch_size 단위로 복사하고
+    (배치마다 커밋하므로 중단돼도 이어서 진행) 마지막에 테이블을 교체
+
+    Returns:
+        int: 복사된 행 수
+    """
+    conn.execute(COMMENTARIES_SCHEMA.format(table='commentaries_migrating'))
+    old_columns = table_columns(conn, 'commentaries')
+    placeholders = ', '.join('?' for _ in COMMENTARIES_COLUMNS)
+    insert_sql = (f"INSERT INTO commentaries_migrating ({', '.join(COMMENTARIES_COLUMNS)}) "
+                  f"VALUES ({placeholders})")
+
+    last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM commentaries_migrating").fetchone()[0]
+    copied = 0
+    while True:
+        rows = conn.execute(
+            "SELECT * FROM commentaries WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+        ).fetchall()
+        if not rows:
+            break
+        conn.executemany(insert_sql, [_convert_legacy_row(dict(zip(old_columns, row))) for row in rows])
+        copied += len(rows)
+        last_id = rows[-1][0]
+        conn.commit()
+
+    # 테이블 교체 (FTS는 새 테이블 기준으로 다시 색인)
+    # DDL은 암묵적 트랜잭션을 열지 않으므로 명시적으로 묶음
+    # (DROP과 RENAME 사이에 중단되면 행이 commentaries_migrating에만 남음)
+    conn.commit()
+    conn.execute("BEGIN")
+    try:
+        _drop_fts(conn, 'commentaries')
+        conn.execute("DROP TABLE commentaries")
+        conn.execute("ALTER TABLE commentaries_migrating RENAME TO commentaries")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    _finish_schema(conn)
+    print(f"commentaries 스키마 v{COMMENTARIES_SCHEMA_VERSION} 마이그레이션 완료: {copied:,}개 행")
+    return copied
+
+
+def has_table(conn, name):
+    """테이블(가상 테이블 포함) 존재 여부"""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def content_dedup_enabled(conn):
+    """본문 중복 제거 모드 여부 (commentary_contents 테이블 존재)"""
+    return has_table(conn, 'commentary_contents')
+
+
+def _content_hash(text):
+    """본문 해시 키 (SHA-1 digest)"""
+    return hashlib.sha1(text.encode('utf-8')).digest()
+
+
+def store_content(conn, text):
+    """
+    본문을 commentary_contents에 한 번만 저장
+
+    Returns:
+        int: content_id
+    """
+    content_hash = _content_hash(text)
+    compressor = _content_compressor(conn)
+    cursor = conn.execute(
+        "INSERT OR IGNORE INTO commentary_contents (content_hash, text, text_length) VALUES (?, ?, ?)",
+        (content_hash, encode_text(text, compressor), len(text))
+    )
+    content_id = conn.execute(
+        "SELECT id FROM commentary_contents WHERE content_hash = ?", (content_hash,)
+    ).fetchone()[0]
+    # 압축 저장 모드의 FTS는 트리거가 없으므로 새 본문의 평문을 직접 색인
+    if cursor.rowcount > 0 and compressor is not None and has_table(conn, CONTENTS_FTS_TABLE):
+        conn.execute(f"INSERT INTO {CONTENTS_FTS_TABLE}(rowid, text) VALUES (?, ?)", (content_id, text))
+    return content_id
+
+
+def prepare_commentary_text(conn, text, dedup=None):
+    """
+    저장할 (text, content_id) 쌍 계산
+    중복 제거 모드면 본문은 commentary_contents로 가고 text는 빈 문자열
+
+    Args:
+        dedup (bool): 중복 제거 모드 여부 (None이면 DB에서 확인, 반복 저장 시 미리 전달)
+    """
+    if dedup is None:
+        dedup = content_dedup_enabled(conn)
+    if not dedup or not text:
+        return text, None
+    return '', store_content(conn, text)
+
+
+def insert_commentary_once(conn, commentary_name, book_name, chapter, verse, text, dedup=None):
+    """
+    주석 한 행 저장 (같은 주석명/절/본문 행이 이미 있으면 건너뜀)
+    같은 파일을 다시 가져와도 행이 중복되지 않음 (구버전 UNIQUE + INSERT OR REPLACE와 같은 효과)
+
+    Args:
+        dedup (bool): 중복 제거 모드 여부 (None이면 DB에서 확인, 반복 저장 시 미리 전달)
+
+    Returns:
+        bool: 새로 저장했으면 True
+    """
+    text, content_id = prepare_commentary_text(conn, text, dedup)
+    cursor = conn.execute("""
+        INSERT INTO commentaries
+        (commentary_name, book_name, book_code, chapter, verse, verse_ordinal, text, content_id)
+        SELECT ?, ?, ?, ?, ?, ?, ?, ?
+        WHERE NOT EXISTS (
+            SELECT 1 FROM commentaries
+            WHERE book_name = ? AND chapter = ? AND verse = ?
+              AND commentary_name = ? AND text = ? AND content_id IS ?
+        )
+    """, (commentary_name, book_name, get_book_code(book_name), chapter, verse,
+          commentary_ordinal(book_name, chapter, verse), text, content_id,
+          book_name, chapter, verse, commentary_name, text, content_id))
+    return cursor.rowcount > 0
+
+
+def ensure_content_id(conn):
+    """commentaries.content_id 컬럼과 인덱스 보장 (중복 제거 모드가 아니면 항상 NULL)"""
+    columns = table_columns(conn, 'commentaries')
+    if not columns:
+        return False
+    if 'content_id' not in columns:
+        conn.execute("ALTER TABLE commentaries ADD COLUMN content_id INTEGER")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_commentaries_content_id ON commentaries(content_id)")
+    return True
+
+
+def commentary_select(conn, alias='c'):
+    """
+    commentaries 조회용 SELECT ... FROM 절
+    중복 제거 모드면 text 컬럼을 commentary_contents에서 복원
+    (압축 저장 모드면 연결에 commentary_text 함수를 등록하고 압축 해제)
+    """
+    if not content_dedup_enabled(conn):
+        return f"SELECT {alias}.* FROM commentaries {alias}"
+    text_expr = f"COALESCE(cc.text, {alias}.text)"
+    if compression_enabled(conn):
+        register_functions(conn)
+        text_expr = f"commentary_text({text_expr})"
+    columns = ', '.join(
+        f"{text_expr} AS text" if col == 'text' else f"{alias}.{col}"
+        for col in table_columns(conn, 'commentaries')
+    )
+    return (f"SELECT {columns} FROM commentaries {alias} "
+            f"LEFT JOIN commentary_contents cc ON cc.id = {alias}.content_id")
+
+
+def enable_content_dedup(conn, batch_size=1000):
+    """
+    본문 중복 제거 모드로 전환하고 기존 행을 batch_size 단위로 이전
+    commentaries_fts는 commentary_contents_fts로 대체 (고유 본문만 색인)
+
+    Returns:
+        tuple: (이전된 행 수, 고유 본문 수)
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS commentary_contents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content_hash BLOB NOT NULL UNIQUE,
+            text TEXT NOT NULL,
+            text_length INTEGER
+        )
+    """)
+    ensure_content_id(conn)
+    _ensure_content_lengths(conn)
+    # 이전하는 동안 통계가 본문 길이를 commentary_contents에서 읽도록 트리거 갱신
+    if has_table(conn, 'commentary_stats'):
+        ensure_stats(conn)
+
+    moved = 0
+    last_id = 0
+    while True:
+        rows = conn.execute("""
+            SELECT id, text FROM commentaries
+            WHERE id > ? AND content_id IS NULL AND text IS NOT NULL AND text != ''
+            ORDER BY id LIMIT ?
+        """, (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        for row_id, text in rows:
+            conn.execute(
+                "UPDATE commentaries SET content_id = ?, text = '' WHERE id = ?",
+                (store_content(conn, text), row_id)
+            )
+        moved += len(rows)
+        last_id = rows[-1][0]
+        conn.commit()
+
+    # 행 단위 FTS는 빈 본문만 남으므로 제거하고 고유 본문 FTS로 전환
+    _drop_fts(conn, 'commentaries')
+    ensure_fts(conn, 'commentaries')
+
+    distinct = conn.execute("SELECT COUNT(*) FROM commentary_contents").fetchone()[0]
+    conn.commit()
+    return moved, distinct
+
+
+def prune_contents(conn):
+    """
+    어떤 commentaries 행도 참조하지 않는 본문 삭제
+    압축 저장 모드면 FTS 항목도 평문으로 직접 삭제 (트리거가 없음)
+    """
+    register_functions(conn)
+    orphaned = "WHERE id NOT IN (SELECT content_id FROM commentaries WHERE content_id IS NOT NULL)"
+    if compression_enabled(conn) and has_table(conn, CONTENTS_FTS_TABLE):
+        conn.executemany(
+            f"INSERT INTO {CONTENTS_FTS_TABLE}({CONTENTS_FTS_TABLE}, rowid, text) VALUES ('delete', ?, ?)",
+            [(row_id, decode_text(text))
+             for row_id, text in conn.execute(f"SELECT id, text FROM commentary_contents {orphaned}")]
+        )
+    cursor = conn.execute(f"DELETE FROM commentary_contents {orphaned}")
+    return cursor.rowcount
+
+
+# 압축 사전 학습 기본값 (zstd 권장 크기 약 110KB)
+DICTIONARY_SIZE = 112640
+COMPRESSION_LEVEL = 19
+
+# dict_id -> ZstdCompressionDict (dict_id 0은 사전 없음)
+_dictionaries = {}
+# zstandard 모듈 (압축 저장 모드에서 처음 필요할 때 import, 없으면 False)
+zstandard = None
+# zstd 압축기/해제기는 스레드 간 공유할 수 없어 스레드별로 캐시
+_codecs = threading.local()
+
+
+def compression_enabled(conn):
+    """압축 저장 모드 여부 (commentary_dictionaries 테이블 존재)"""
+    return has_table(conn, 'commentary_dictionaries')
+
+
+def _load_zstandard():
+    """zstandard 모듈 (설치되지 않았으면 None, 처음 호출할 때만 import)"""
+    global zstandard
+    if zstandard is None:
+        try:
+            import zstandard as module
+        except ImportError:
+            module = False
+        zstandard = module
+    return zstandard or None
+
+
+def _require_zstandard():
+    if _load_zstandard() is None:
+        raise RuntimeError("압축된 주석을 읽고 쓰려면 zstandard 패키지가 필요합니다: pip install zstandard")
+
+
+def _load_dictionaries(conn):
+    """DB에 저장된 압축 사전을 모듈 캐시에 로드"""
+    if not compression_enabled(conn) or _load_zstandard() is None:
+        return
+    for dict_id, data in conn.execute("SELECT dict_id, dictionary FROM commentary_dictionaries"):
+        if dict_id not in _dictionaries:
+            _dictionaries[dict_id] = zstandard.ZstdCompressionDict(data)
+
+
+def _decompressor(dict_id):
+    decompressors = _codecs.__dict__.setdefault('decompressors', {})
+    decompressor = decompressors.get(dict_id)
+    if decompressor is None:
+        if dict_id and dict_id not in _dictionaries:
+            raise RuntimeError(f"압축 사전을 찾을 수 없습니다: dict_id={dict_id}")
+        decompressor = zstandard.ZstdDecompressor(dict_data=_dictionaries.get(dict_id))
+        decompressors[dict_id] = decompressor
+    return decompressor
+
+
+def _compressor(dict_id, level=COMPRESSION_LEVEL):
+    compressors = _codecs.__dict__.setdefault('compressors', {})
+    compressor = compressors.get((dict_id, level))
+    if compressor is None:
+        compressor = zstandard.ZstdCompressor(level=level, dict_data=_dictionaries.get(dict_id))
+        compressors[(dict_id, level)] = compressor
+    return compressor
+
+
+def _content_compressor(conn):
+    """압축 저장 모드면 최신 사전의 압축기, 아니면 None"""
+    if not compression_enabled(conn):
+        return None
+    _require_zstandard()
+    row = conn.execute(
+        "SELECT dict_id FROM commentary_dictionaries ORDER BY id DESC LIMIT 1"
+    ).fetchone()
+    dict_id = row[0] if row else 0
+    if dict_id and dict_id not in _dictionaries:
+        _load_dictionaries(conn)
+    return _compressor(dict_id)
+
+
+def encode_text(text, compressor=None):
+    """
+    저장용 본문 값 (압축이 이득일 때만 zstd 프레임 BLOB, 아니면 원문 문자열)
+    """
+    if compressor is None or not text:
+        return text
+    raw = text.encode('utf-8')
+    compressed = compressor.compress(raw)
+    return compressed if len(compressed) < len(raw) else text
+
+
+def decode_text(value):
+    """저장된 본문 값을 문자열로 복원 (압축되지 않은 값은 그대로)"""
+    if not isinstance(value, bytes):
+        return value
+    _require_zstandard()
+    dict_id = zstandard.get_frame_parameters(value).dict_id
+    return _decompressor(dict_id).decompress(value).decode('utf-8')
+
+
+def enable_compression(conn, dict_size=DICTIONARY_SIZE, sample_limit=5000, batch_size=500):
+    """
+    압축 저장 모드로 전환
+    고유 본문 표본으로 공유 사전을 학습하고 기존 본문을 batch_size 단위로 압축
+    (중복 제거 모드가 아니면 먼저 전환)
+
+    Returns:
+        tuple: (압축된 본문 수, 사전 dict_id) (zstandard가 없으면 None)
+    """
+    if _load_zstandard() is None:
+        print("zstandard 패키지가 없어 압축 저장 모드를 사용할 수 없습니다: pip install zstandard")
+        return None
+
+    if not content_dedup_enabled(conn):
+        enable_content_dedup(conn)
+
+    samples = [
+        text.encode('utf-8') for (text,) in conn.execute(
+            "SELECT text FROM commentary_contents WHERE typeof(text) = 'text' ORDER BY random() LIMIT ?",
+            (sample_limit,)
+        )
+    ]
+    try:
+        dictionary = zstandard.train_dictionary(dict_size, samples)
+        dict_id = dictionary.dict_id()
+    except zstandard.ZstdError as e:
+        # 표본이 너무 적으면 사전 없이 압축
+        print(f"압축 사전 학습 실패 (사전 없이 압축): {e}")
+        dictionary = None
+        dict_id = 0
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS commentary_dictionaries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            dict_id INTEGER NOT NULL UNIQUE,
+            dictionary BLOB NOT NULL,
+            created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    if dictionary is not None:
+        _dictionaries[dict_id] = dictionary
+    conn.execute(
+        "INSERT OR IGNORE INTO commentary_dictionaries (dict_id, dictionary) VALUES (?, ?)",
+        (dict_id, dictionary.as_bytes() if dictionary is not None else b'')
+    )
+
+    # 본문 압축 중에는 FTS 갱신을 멈추고 끝난 뒤 압축 해제 뷰 기준으로 다시 만듦
+    _drop_fts(conn, 'commentary_contents')
+
+    compressor = _compressor(dict_id)
+    compressed = 0
+    last_id = 0
+    while True:
+        rows = conn.execute("""
+            SELECT id, text FROM commentary_contents
+            WHERE id > ? AND typeof(text) = 'text'
+            ORDER BY id LIMIT ?
+        """, (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        for row_id, text in rows:
+            value = encode_text(text, compressor)
+            if value is not text:
+                conn.execute("UPDATE commentary_contents SET text = ? WHERE id = ?", (value, row_id))
+                compressed += 1
+        last_id = rows[-1][0]
+        conn.commit()
+
+    ensure_fts(conn, 'commentaries')
+    conn.commit()
+    return compressed, dict_id
+
+
+def get_commentaries_by_range(conn, start_ordinal, end_ordinal, commentary_name=None):
+    """
+    절 서수 범위로 주석 조회 (verse_ordinal 순)
+
+    Returns:
+        list: 주석 데이터 딕셔너리 리스트
+    """
+    query = commentary_select(conn) + " WHERE verse_ordinal BETWEEN ? AND ?"
+    params = [start_ordinal, end_ordinal]
+
+    if commentary_name:
+        query += " AND commentary_name = ?"
+        params.append(commentary_name)
+
+    query += " ORDER BY verse_ordinal"
+
+    cursor = conn.execute(query, params)
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def get_commentaries_by_passage(conn, passage, commentary_name=None):
+    """
+    '창세기 31:1-32:5' 형식의 본문 범위로 주석 조회
+
+    Returns:
+        list: 주석 데이터 딕셔너리 리스트 (본문 표기를 해석할 수 없으면 빈 리스트)
+    """
+    ordinal_range = parse_passage(passage)
+    if ordinal_range is None:
+        print(f"본문 범위를 해석할 수 없습니다: {passage}")
+        return []
+    return get_commentaries_by_range(conn, ordinal_range[0], ordinal_range[1], commentary_name)
+
+
+# 원본 테이블 -> FTS5 테이블 이름
+FTS_TABLES = {
+    'commentaries': 'commentaries_fts',
+    'verses': 'verses_fts',
+    'commentary_contents': 'commentary_contents_fts',
+}
+CONTENTS_FTS_TABLE = FTS_TABLES['commentary_contents']
+
+# trigram 토크나이저는 3글자 이상 검색어만 인덱스로 찾을 수 있음
+FTS_MIN_TERM_LENGTH = 3
+
+
+def _text_column(columns):
+    """본문 컬럼 이름 (구버전 import_commentaries 스키마는 commentary)"""
+    return 'text' if 'text' in columns else 'commentary'
+
+
+def _fts_source(conn, table):
+    """실제로 색인할 테이블 (중복 제거 모드의 commentaries는 commentary_contents)"""
+    if table == 'commentaries' and content_dedup_enabled(conn):
+        return 'commentary_contents'
+    return table
+
+
+def ensure_fts(conn, table='commentaries'):
+    """
+    FTS5 전문 검색 테이블과 동기화 트리거 보장
+    처음 만들 때는 기존 행 전체를 색인
+    압축 저장 모드의 commentary_contents는 트리거 없이 store_content / prune_contents가 직접 갱신
+    (트리거가 commentary_text()를 부르면 함수를 등록하지 않은 연결은 본문을 쓰거나 지울 수 없음)
+
+    Returns:
+        bool: FTS 인덱스를 사용할 수 있으면 True
+    """
+    table = _fts_source(conn, table)
+    columns = table_columns(conn, table)
+    if not columns:
+        return False
+
+    fts_table = FTS_TABLES.get(table, f'{table}_fts')
+    text_column = _text_column(columns)
+    exists = has_table(conn, fts_table)
+
+    # 압축된 본문은 압축 해제 뷰를 content 테이블로 색인
+    content_table = table
+    triggers = True
+    if table == 'commentary_contents' and compression_enabled(conn):
+        register_functions(conn)
+        content_table = f"{table}_plain"
+        triggers = False
+        conn.execute(f"""
+            CREATE VIEW IF NOT EXISTS {content_table} AS
+            SELECT id, commentary_text({text_column}) AS {text_column} FROM {table}
+        """)
+
+    try:
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                {text_column}, content='{content_table}', content_rowid='id', tokenize='trigram'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        print(f"FTS5 인덱스를 만들 수 없습니다 ({table}): {e}")
+        return False
+
+    if triggers:
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts_table}(rowid, {text_column}) VALUES (new.id, new.{text_column});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts_table}({fts_table}, rowid, {text_column})
+                VALUES ('delete', old.id, old.{text_column});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {text_column} ON {table} BEGIN
+                INSERT INTO {fts_table}({fts_table}, rowid, {text_column})
+                VALUES ('delete', old.id, old.{text_column});
+                INSERT INTO {fts_table}(rowid, {text_column}) VALUES (new.id, new.{text_column});
+            END
+        """)
+    else:
+        # v3 이하 DB의 commentary_text() 트리거 제거
+        for suffix in ('ai', 'ad', 'au'):
+            conn.execute(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}")
+
+    if not exists:
+        conn.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+        print(f"FTS5 인덱스 생성 완료: {fts_table}")
+    return True
+
+
+def _drop_fts(conn, table):
+    """FTS 테이블과 동기화 트리거 삭제"""
+    fts_table = FTS_TABLES.get(table, f'{table}_fts')
+    for suffix in ('ai', 'ad', 'au'):
+        conn.execute(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}")
+    conn.execute(f"DROP TABLE IF EXISTS {fts_table}")
+
+
+def rebuild_fts(conn, table='commentaries'):
+    """FTS 인덱스를 원본 테이블 기준으로 다시 만듦 (대량 수정 후 복구용)"""
+    if ensure_fts(conn, table):
+        source = _fts_source(conn, table)
+        fts_table = FTS_TABLES.get(source, f'{source}_fts')
+        conn.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+
+
+def _make_snippet(text, term, width=32):
+    """LIKE 검색 결과용 간단한 스니펫 ([검색어] 강조)"""
+    text = text or ''
+    pos = text.find(term)
+    if pos < 0:
+        return text[:width * 2]
+    start = max(pos - width, 0)
+    end = min(pos + len(term) + width, len(text))
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if end < len(text) else ''
+    return f"{prefix}{text[start:pos]}[{term}]{text[pos + len(term):end]}{suffix}"
+
+
+def _fts_search(conn, table, query, filters, limit, snippet_tokens=16):
+    """
+    FTS5 검색 공통 처리
+    3글자 이상 검색어는 MATCH (bm25 순위)로 찾고, trigram으로 찾을 수 없는
+    짧은 검색어는 원본 본문의 LIKE 조건으로 처리
+
+    Args:
+        filters (list): (SQL 조건, 파라미터) 목록 - 원본 테이블 별칭 t 기준
+    """
+    terms = query.split()
+    if not terms:
+        return []
+
+    source = _fts_source(conn, table)
+    fts_table = FTS_TABLES.get(source, f'{source}_fts')
+    if not has_table(conn, fts_table) and not ensure_fts(conn, table):
+        return []
+
+    columns = table_columns(conn, table)
+    text_column = _text_column(columns)
+    if source == table:
+        text_expr = f"t.{text_column}"
+        select_columns = "t.*"
+        from_clause = f"{fts_table} f JOIN {table} t ON t.id = f.rowid"
+    else:
+        # 중복 제거 모드: 고유 본문 하나가 여러 절 행으로 펼쳐짐
+        text_expr = "cc.text"
+        if compression_enabled(conn):
+            register_functions(conn)
+            text_expr = "commentary_text(cc.text)"
+        select_columns = ', '.join(
+            f"{text_expr} AS {col}" if col == text_column else f"t.{col}" for col in columns
+        )
+        from_clause = (f"{fts_table} f JOIN commentary_contents cc ON cc.id = f.rowid "
+                       f"JOIN {table} t ON t.content_id = cc.id")
+
+    long_terms = [t for t in terms if len(t) >= FTS_MIN_TERM_LENGTH]
+    short_terms = [t for t in terms if len(t) < FTS_MIN_TERM_LENGTH]
+
+    where = []
+    params = []
+    if long_terms:
+        where.append(f"{fts_table} MATCH ?")
+        params.append(' AND '.join('"' + t.replace('"', '""') + '"' for t in long_terms))
+    for term in short_terms:
+        where.append(f"{text_expr} LIKE ?")
+        params.append(f"%{term}%")
+    for condition, value in filters:
+        where.append(condition)
+        params.append(value)
+
+    if long_terms:
+        select_extra = (f"snippet({fts_table}, 0, '[', ']', '…', {snippet_tokens}) AS snippet, "
+                        f"bm25({fts_table}) AS rank")
+        order_by = "rank"
+    else:
+        select_extra = "NULL AS snippet, 0.0 AS rank"
+        order_by = "t.verse_ordinal" if 'verse_ordinal' in columns else "t.id"
+
+    cursor = conn.execute(f"""
+        SELECT {select_columns}, {select_extra}
+        FROM {from_clause}
+        WHERE {' AND '.join(where)}
+        ORDER BY {order_by}
+        LIMIT ?
+    """, params + [limit])
+    result_columns = [description[0] for description in cursor.description]
+    results = [dict(zip(result_columns, row)) for row in cursor.fetchall()]
+
+    for row in results:
+        if row['snippet'] is None:
+            row['snippet'] = _make_snippet(row.get(text_column), short_terms[0])
+    return results
+
+
+def search_commentaries(conn, query, commentary_name=None, limit=20):
+    """
+    주석 본문 전문 검색
+
+    Args:
+        query (str): 검색어 (공백으로 구분된 단어는 AND 조건)
+        commentary_name (str): 주석명 필터 (선택사항)
+        limit (int): 최대 결과 수
+
+    Returns:
+        list: 순위순 주석 딕셔너리 리스트 ('snippet', 'rank' 포함)
+    """
+    filters = []
+    if commentary_name:
+        filters.append(("t.commentary_name = ?", commentary_name))
+    return _fts_search(conn, 'commentaries', query, filters, limit)
+
+
+def search_verses(conn, query, version=None, limit=50):
+    """
+    성경 본문 전문 검색 (search-verses IPC 핸들러의 LIKE 검색 대체)
+
+    Returns:
+        list: 순위순 절 딕셔너리 리스트 ('snippet', 'rank' 포함)
+    """
+    filters = []
+    if version:
+        filters.append(("t.version = ?", version))
+    return _fts_search(conn, 'verses', query, filters, limit)
+
+
+def migrate_database(db_path):
+    """
+    commentaries를 통합 스키마로 마이그레이션하고
+    commentaries / verses 테이블에 verse_ordinal 컬럼, 인덱스, 값과 FTS 인덱스를 채움
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        if has_table(conn, 'commentaries'):
+            ensure_commentaries_schema(conn)
+        for table in ('commentaries', 'verses'):
+            if not table_columns(conn, table):
+                print(f"  {table}: 테이블 없음")
+                continue
+            updated = backfill_verse_ordinals(conn, table)
+            missing = conn.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE verse_ordinal IS NULL"
+            ).fetchone()[0]
+            print(f"  {table}: {updated:,}개 행 갱신 (서수 없음: {missing:,}개)")
+            ensure_fts(conn, table)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _refuse_app_database(db_path, force):
+    """
+    앱이 읽는 DB면 안내를 출력하고 True 반환 (force면 항상 False)
+
+    앱은 commentaries.text를 직접 읽으므로 중복 제거/압축 저장 후에는 빈 본문을 표시함
+    """
+    if force or os.path.basename(db_path) != APP_DATABASE_NAME:
+        return False
+    print(f"  {db_path}: 앱이 commentaries.text를 직접 읽는 DB라 본문을 비우는 작업을 하지 않습니다")
+    print("  작업용 사본에서 실행한 뒤 release_build.py로 본문을 복원한 배포 DB를 만드세요 (무시하려면 --force)")
+    return True
+
+
+def dedupe_database(db_path, batch_size=1000, force=False):
+    """commentaries 본문을 commentary_contents로 이전 (중복 제거 모드 전환, 앱 DB는 force일 때만)"""
+    if _refuse_app_database(db_path, force):
+        return
+    conn = sqlite3.connect(db_path)
+    try:
+        if not table_columns(conn, 'commentaries'):
+            print("  commentaries: 테이블 없음")
+            return
+        moved, distinct = enable_content_dedup(conn, batch_size)
+        pruned = prune_contents(conn)
+        conn.commit()
+        print(f"  이전된 행: {moved:,}개, 고유 본문: {distinct - pruned:,}개")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+
+def compress_database(db_path, force=False):
+    """주석 본문을 공유 사전 zstd 압축으로 저장 (압축 저장 모드 전환, 앱 DB는 force일 때만)"""
+    if _refuse_app_database(db_path, force):
+        return
+    size_before = os.path.getsize(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        if not table_columns(conn, 'commentaries'):
+            print("  commentaries: 테이블 없음")
+            return
+        result = enable_compression(conn)
+        if result is None:
+            return
+        compressed, dict_id = result
+        prune_contents(conn)
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    size_after = os.path.getsize(db_path)
+    print(f"  압축된 본문: {compressed:,}개 (사전 dict_id={dict_id})")
+    print(f"  DB 크기: {size_before / 1024 / 1024:.1f}MB -> {size_after / 1024 / 1024:.1f}MB")
+
+
+COMMANDS = {
+    'migrate': (migrate_database, "스키마 / verse_ordinal / FTS 마이그레이션"),
+    'dedupe': (dedupe_database, "주석 본문 중복 제거"),
+    'compress': (compress_database, "주석 본문 압축 저장"),
+}
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    command = args.pop(0) if args and args[0] in COMMANDS else 'migrate'
+    db_path = args[0] if args else APP_DATABASE_NAME
+    func, description = COMMANDS[command]
+    print(f"{description}: {db_path}")
+    if command != 'migrate' and '--force' in sys.argv:
+        func(db_path, force=True)
+    else:
+        func(db_path)
@@ -0,0 +1,569 @@
+"""
+읽기 전용 주석 조회 서비스
+장 단위 조회가 반복될 때마다 연결을 새로 열고 SQL을 문자열로 이어 붙이던 비용을 없앰
+
+- ConnectionPool: 읽기 전용(mode=ro) 연결을 재사용하는 작은 연결 풀
+- 조회 형태별로 한 번만 만든 고정 SQL 문자열을 재사용해서
+  sqlite3 연결의 prepared statement 캐시가 항상 적중
+- row_factory로 dict / sqlite3.Row / tuple 결과를 선택하고,
+  iterate()로 fetchmany 단위 반복자 제공
+- ChapterCache: (주석명, 성경책, 장) 키의 LRU 캐시
+  writer 트리거가 남기는 commentary_changes 로그로 바뀐 장만 무효화
+- export(): 커서를 fetchmany로 읽으며 바로 쓰는 스트리밍 내보내기
+  (.ndjson/.jsonl은 줄 단위 JSON, .json은 JSON 배열, .gz가 붙으면 gzip 압축)
+"""
+
+import gzip
+import json
+import os
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+import bible_reference
+import commentary_db
+
+# 연결별 prepared statement 캐시 크기 (sqlite3 기본값 128)
+STATEMENT_CACHE_SIZE = 256
+
+# 장 캐시 기본 크기 (장 단위 항목 수, 전체 성경 1,189장)
+CHAPTER_CACHE_SIZE = 256
+
+
+def dict_factory(cursor, row):
+    """행을 {컬럼명: 값} 딕셔너리로 변환하는 row factory"""
+    fields = [column[0] for column in cursor.description]
+    return dict(zip(fields, row))
+
+
+class ConnectionPool:
+    def __init__(self, db_path, size=4, timeout=30):
+        """
+        읽기 전용 SQLite 연결 풀
+
+        Args:
+            db_path (str): SQLite 데이터베이스 파일 경로
+            size (int): 최대 연결 수
+            timeout (float): 연결을 기다리는 최대 시간(초)
+        """
+        self.uri = Path(db_path).resolve().as_uri() + '?mode=ro'
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.uri, uri=True, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.execute("PRAGMA mmap_size = 268435456")
+        commentary_db.register_functions(conn)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """풀에서 연결을 빌려 쓰고 반납"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                conn = self._idle.get(timeout=self.timeout)
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        """유휴 연결을 모두 닫음"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._created -= 1
+
+
+def _open_export_file(filename):
+    """내보내기 파일 열기 (.gz로 끝나면 gzip 텍스트 스트림)"""
+    if filename.endswith('.gz'):
+        return gzip.open(filename, 'wt', encoding='utf-8', compresslevel=6)
+    return open(filename, 'w', encoding='utf-8')
+
+
+def write_rows(rows, filename):
+    """
+    행 반복자를 파일에 스트리밍으로 기록 (메모리에 모으지 않음)
+    .json(.gz)은 JSON 배열, 그 외(.ndjson, .jsonl 등)는 줄 단위 JSON
+
+    Returns:
+        int: 기록한 행 수
+    """
+    as_array = filename[:-3].endswith('.json') if filename.endswith('.gz') else filename.endswith('.json')
+    count = 0
+    with _open_export_file(filename) as f:
+        if as_array:
+            f.write('[')
+        for row in rows:
+            if as_array:
+                f.write(',\n' if count else '\n')
+                f.write(json.dumps(row, ensure_ascii=False, indent=2, default=str))
+            else:
+                f.write(json.dumps(row, ensure_ascii=False, default=str))
+                f.write('\n')
+            count += 1
+        if as_array:
+            f.write('\n]\n' if count else ']\n')
+    return count
+
+
+def _partition_filename(filename, index, book_name):
+    """성경책별 분할 파일 이름 (예: out.ndjson.gz -> out-01-창세기.ndjson.gz)"""
+    suffix = ''
+    if filename.endswith('.gz'):
+        filename, suffix = filename[:-3], '.gz'
+    base, ext = os.path.splitext(filename)
+    return f"{base}-{index:02d}-{book_name}{ext}{suffix}"
+
+
+class ChapterCache:
+    def __init__(self, maxsize=CHAPTER_CACHE_SIZE):
+        """
+        (주석명, 성경책, 장) 키의 크기 제한 LRU 캐시
+
+        Args:
+            maxsize (int): 최대 항목 수
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.last_change_id = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(source, book_name, chapter):
+        """캐시 키 (성경책 약칭/별칭은 정식 이름으로)"""
+        return source, bible_reference.resolve_book_name(book_name) or book_name, int(chapter)
+
+    def get(self, key):
+        """캐시된 값 (없으면 None), 조회할 때마다 적중/실패 집계"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, source, book_name, chapter):
+        """바뀐 장의 항목 삭제 (해당 주석명 항목과 전체 주석 항목)"""
+        with self._lock:
+            for key in (self.key(source, book_name, chapter), self.key(None, book_name, chapter)):
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """
+        캐시 통계
+
+        Returns:
+            dict: 적중/실패/무효화 수, 적중률, 현재 항목 수
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hit_rate,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+
+class DatabaseReader:
+    def __init__(self, db_path, pool_size=4, row_factory=dict_factory):
+        """
+        읽기 전용 조회 서비스 기반 클래스
+
+        Args:
+            db_path (str): SQLite 데이터베이스 파일 경로
+            pool_size (int): 연결 풀 크기
+            row_factory: 기본 row factory (dict_factory, sqlite3.Row, None=tuple)
+        """
+        self.db_path = db_path
+        self.pool = ConnectionPool(db_path, size=pool_size)
+        self.row_factory = row_factory
+
+    def query(self, sql, params=(), row_factory=...):
+        """
+        조회 결과 전체를 리스트로 반환
+
+        Returns:
+            list: row_factory 형식의 행 리스트
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = self.row_factory if row_factory is ... else row_factory
+            return cursor.execute(sql, params).fetchall()
+
+    def query_one(self, sql, params=(), row_factory=...):
+        """조회 결과 첫 행 (없으면 None)"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = self.row_factory if row_factory is ... else row_factory
+            return cursor.execute(sql, params).fetchone()
+
+    def iterate(self, sql, params=(), batch_size=500, row_factory=...):
+        """
+        조회 결과를 fetchmany(batch_size) 단위로 읽는 반복자
+        반복이 끝나거나 반복자가 닫힐 때까지 연결 하나를 점유
+
+        Yields:
+            row_factory 형식의 행
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = self.row_factory if row_factory is ... else row_factory
+            cursor.execute(sql, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from rows
+            finally:
+                cursor.close()
+
+    def export(self, sql, params, filename, batch_size=500):
+        """
+        조회 결과를 파일로 스트리밍 내보내기 (write_rows 형식 규칙)
+
+        Returns:
+            int: 내보낸 행 수
+        """
+        return write_rows(self.iterate(sql, params, batch_size=batch_size, row_factory=dict_factory), filename)
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class CommentaryReader(DatabaseReader):
+    """commentaries 테이블 조회 서비스 (commentary_db 통합 스키마 기준)"""
+
+    def __init__(self, db_path='bible_database.db', pool_size=4, row_factory=dict_factory,
+                 cache_size=CHAPTER_CACHE_SIZE):
+        """
+        Args:
+            cache_size (int): 장 캐시 크기 (0이면 캐시 사용 안 함)
+        """
+        super().__init__(db_path, pool_size=pool_size, row_factory=row_factory)
+        with self.pool.connection() as conn:
+            # 중복 제거/압축 저장 모드에 맞는 SELECT 절 (연결마다 다시 계산하지 않음)
+            self._select = commentary_db.commentary_select(conn)
+            # 변경 로그가 없는 구버전 DB는 무효화할 방법이 없으므로 캐시 사용 안 함
+            has_change_log = commentary_db.has_table(conn, 'commentary_changes')
+            if has_change_log:
+                last_change_id = conn.execute(
+                    "SELECT COALESCE(MAX(id), 0) FROM commentary_changes"
+                ).fetchone()[0]
+        self._statements = {}
+        self.cache = None
+        if cache_size and has_change_log:
+            self.cache = ChapterCache(cache_size)
+            self.cache.last_change_id = last_change_id
+
+    def _sync_cache(self):
+        """마지막 확인 이후 commentary_changes에 기록된 장을 캐시에서 제거"""
+        changes = self.query(
+            "SELECT id, commentary_name, book_name, chapter FROM commentary_changes WHERE id > ? ORDER BY id",
+            (self.cache.last_change_id,), row_factory=None
+        )
+        for change_id, source, book_name, chapter in changes:
+            if chapter is not None:
+                self.cache.invalidate(source, book_name, chapter)
+            self.cache.last_change_id = max(self.cache.last_change_id, change_id)
+
+    def _statement(self, by_ordinal, by_book, by_chapter, by_verse, name_filter):
+        """조회 형태별 고정 SQL (같은 형태는 항상 같은 문자열이라 statement 캐시 적중)"""
+        key = (by_ordinal, by_book, by_chapter, by_verse, name_filter)
+        sql = self._statements.get(key)
+        if sql is None:
+            sql = self._build_statement(*key)
+            self._statements[key] = sql
+        return sql
+
+    def _build_statement(self, by_ordinal, by_book, by_chapter, by_verse, name_filter):
+        conditions = []
+        column_conditions = []
+        if by_book:
+            column_conditions.append("book_name = ?")
+        if by_chapter:
+            column_conditions.append("chapter = ?")
+        if by_verse:
+            column_conditions.append("verse = ?")
+        if by_ordinal and column_conditions:
+            # 서수 범위 스캔 + 서수가 없는 행(0절 서론, 범위 밖 절, 알 수 없는 성경책)은 컬럼으로 찾음
+            conditions.append(
+                "(verse_ordinal BETWEEN ? AND ? OR (verse_ordinal IS NULL AND "
+                + " AND ".join(column_conditions) + "))"
+            )
+        elif by_ordinal:
+            conditions.append("verse_ordinal BETWEEN ? AND ?")
+        else:
+            conditions.extend(column_conditions)
+        if name_filter == 'exact':
+            conditions.append("commentary_name = ?")
+        elif name_filter == 'partial':
+            conditions.append("commentary_name LIKE ?")
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        # 장 안에서는 절 순서 (서수가 없는 행도 제자리에), 범위 조회는 서수 순서
+        order_by = "verse" if by_ordinal and column_conditions else "verse_ordinal"
+        return f"{self._select}{where} ORDER BY {order_by} LIMIT ?"
+
+    def _commentaries_query(self, book_name=None, chapter=None, verse=None,
+                            commentary_name=None, limit=None, partial_name=False):
+        """조회 조건을 (SQL, 파라미터)로 변환"""
+        # 성경책+장(+절)은 절 서수 범위로 변환해서 인덱스 범위 스캔 (서수가 없는 행은 컬럼 조건으로 보충)
+        ordinal_range = None
+        if book_name and chapter:
+            if verse:
+                ordinal_range = bible_reference.passage_ordinal_range(book_name, chapter, verse, chapter, verse)
+            else:
+                ordinal_range = bible_reference.chapter_ordinal_range(book_name, chapter)
+
+        params = list(ordinal_range) if ordinal_range else []
+        shape = [bool(ordinal_range), bool(book_name), bool(chapter), bool(verse)]
+        params.extend(value for value in (book_name, chapter, verse) if value)
+
+        name_filter = None
+        if commentary_name:
+            name_filter = 'partial' if partial_name else 'exact'
+            params.append(f"%{commentary_name}%" if partial_name else commentary_name)
+
+        params.append(limit if limit else -1)
+        return self._statement(*shape, name_filter), params
+
+    def commentaries(self, book_name=None, chapter=None, verse=None,
+                     commentary_name=None, limit=None, partial_name=False):
+        """
+        조건에 맞는 주석 조회 (verse_ordinal 순)
+
+        Args:
+            partial_name (bool): commentary_name을 부분 일치(LIKE)로 비교
+
+        Returns:
+            list: 주석 행 리스트
+        """
+        sql, params = self._commentaries_query(book_name, chapter, verse, commentary_name, limit, partial_name)
+        return self.query(sql, params)
+
+    def iter_commentaries(self, book_name=None, chapter=None, commentary_name=None,
+                          partial_name=False, batch_size=500, row_factory=...):
+        """조건에 맞는 주석을 fetchmany 단위로 읽는 반복자"""
+        sql, params = self._commentaries_query(book_name, chapter, None, commentary_name, None, partial_name)
+        return self.iterate(sql, params, batch_size=batch_size, row_factory=row_factory)
+
+    def _export_books(self, commentary_name=None, partial_name=False):
+        """내보낼 성경책 목록 (정경 순서)"""
+        sql = "SELECT DISTINCT book_name FROM commentaries"
+        params = ()
+        if commentary_name:
+            sql += " WHERE commentary_name LIKE ?" if partial_name else " WHERE commentary_name = ?"
+            params = (f"%{commentary_name}%" if partial_name else commentary_name,)
+        books = [row[0] for row in self.query(sql, params, row_factory=None)]
+        return sorted(books, key=lambda name: (bible_reference.get_book_code(name), name or ''))
+
+    def export(self, filename, book_name=None, chapter=None, commentary_name=None, partial_name=False,
+               partition_by_book=False, workers=4, batch_size=500):
+        """
+        주석을 파일로 스트리밍 내보내기 (일정한 메모리 사용)
+
+        Args:
+            filename (str): 출력 파일 (.ndjson/.jsonl/.json, 뒤에 .gz를 붙이면 gzip 압축)
+            partition_by_book (bool): 성경책마다 별도 파일로 나눠 workers개 스레드로 병렬 기록
+            workers (int): 분할 내보내기 동시 작업 수 (연결 풀 크기를 넘지 않음)
+
+        Returns:
+            dict: {파일 이름: 행 수}
+        """
+        if not partition_by_book:
+            rows = self.iter_commentaries(book_name, chapter, commentary_name, partial_name,
+                                          batch_size=batch_size, row_factory=dict_factory)
+            return {filename: write_rows(rows, filename)}
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        books = [book_name] if book_name else self._export_books(commentary_name, partial_name)
+
+        def export_book(index, book):
+            path = _partition_filename(filename, index, book)
+            rows = self.iter_commentaries(book, chapter, commentary_name, partial_name,
+                                          batch_size=batch_size, row_factory=dict_factory)
+            return path, write_rows(rows, path)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, self.pool.size))) as executor:
+            futures = [
+                executor.submit(export_book, bible_reference.get_book_code(book, default=0) or index, book)
+                for index, book in enumerate(books, 1)
+            ]
+            return dict(future.result() for future in futures)
+
+    def chapter(self, book_name, chapter, commentary_name=None):
+        """
+        장 전체 주석 조회 (장 캐시 사용)
+
+        Returns:
+            list: 주석 행 리스트 (캐시된 행의 복사본이라 수정해도 캐시에 영향 없음)
+        """
+        if self.cache is None:
+            return self.commentaries(book_name, chapter, commentary_name=commentary_name)
+
+        self._sync_cache()
+        key = self.cache.key(commentary_name, book_name, chapter)
+        rows = self.cache.get(key)
+        if rows is None:
+            rows = self.commentaries(book_name, chapter, commentary_name=commentary_name)
+            self.cache.put(key, rows)
+        return [dict(row) for row in rows]
+
+    def cache_stats(self):
+        """장 캐시 통계 (캐시를 쓰지 않으면 None)"""
+        return self.cache.stats() if self.cache is not None else None
+
+    def passage(self, passage, commentary_name=None):
+        """'창세기 31:1-32:5' 형식의 본문 범위로 주석 조회"""
+        ordinal_range = bible_reference.parse_passage(passage)
+        if ordinal_range is None:
+            return []
+        name_filter = 'exact' if commentary_name else None
+        params = list(ordinal_range) + ([commentary_name] if commentary_name else []) + [-1]
+        return self.query(self._statement(True, False, False, False, name_filter), params)
+
+    def statistics(self):
+        """
+        주석 데이터베이스 통계 정보
+        commentary_stats 집계 테이블이 있으면 그 행만 읽음
+
+        Returns:
+            dict: 전체 주석 수, 성경책별/주석별 주석 수
+        """
+        with self.pool.connection() as conn:
+            if commentary_db.has_table(conn, 'commentary_stats'):
+                return commentary_db.get_statistics(conn)
+
+        total_count = self.query_one("SELECT COUNT(*) FROM commentaries", row_factory=None)[0]
+        book_stats = self.query("""
+            SELECT book_name, COUNT(*) AS count
+            FROM commentaries
+            GROUP BY book_name
+            ORDER BY book_code
+        """, row_factory=None)
+        commentary_stats = self.query("""
+            SELECT commentary_name, COUNT(*) AS count
+            FROM commentaries
+            GROUP BY commentary_name
+            ORDER BY count DESC
+        """, row_factory=None)
+        return {
+            'total_commentaries': total_count,
+            'books': dict(book_stats),
+            'commentary_types': dict(commentary_stats)
+        }
+
+
+class ArticleReader(DatabaseReader):
+    """HochmaParser articles 테이블 조회 서비스"""
+
+    ARTICLES_SQL = "SELECT * FROM articles ORDER BY article_id DESC LIMIT ?"
+    ARTICLES_BY_BOOK_SQL = "SELECT * FROM articles WHERE book_name = ? ORDER BY article_id DESC LIMIT ?"
+
+    def __init__(self, db_path='hochma_articles.db', pool_size=2, row_factory=dict_factory):
+        super().__init__(db_path, pool_size=pool_size, row_factory=row_factory)
+
+    def articles(self, book_name=None, limit=None):
+        """게시글 조회 (article_id 내림차순)"""
+        if book_name:
+            return self.query(self.ARTICLES_BY_BOOK_SQL, (book_name, limit or -1))
+        return self.query(self.ARTICLES_SQL, (limit or -1,))
+
+    def export_articles(self, filename, book_name=None, batch_size=500):
+        """
+        게시글을 파일로 스트리밍 내보내기 (write_rows 형식 규칙)
+
+        Returns:
+            int: 내보낸 게시글 수
+        """
+        if book_name:
+            return self.export(self.ARTICLES_BY_BOOK_SQL, (book_name, -1), filename, batch_size)
+        return self.export(self.ARTICLES_SQL, (-1,), filename, batch_size)
+
+    def statistics(self):
+        """
+        게시글 통계 정보
+        article_stats 집계 테이블이 있으면 그 행만 읽음
+
+        Returns:
+            dict: 전체 게시글 수, 성경책별 게시글 수
+        """
+        if self.query_one("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'article_stats'",
+                          row_factory=None):
+            book_stats = self.query(
+                "SELECT book_name, article_count FROM article_stats ORDER BY article_count DESC",
+                row_factory=None
+            )
+            return {
+                'total_articles': sum(count for _, count in book_stats),
+                'books': {book: count for book, count in book_stats if book != '' and count > 0}
+            }
+
+        total_count = self.query_one("SELECT COUNT(*) FROM articles", row_factory=None)[0]
+        book_stats = self.query("""
+            SELECT book_name, COUNT(*) AS count
+            FROM articles
+            WHERE book_name != ''
+            GROUP BY book_name
+            ORDER BY count DESC
+        """, row_factory=None)
+        return {
+            'total_articles': total_count,
+            'books': dict(book_stats)
+        }
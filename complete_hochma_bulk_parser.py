@@ -1,21 +1,46 @@
-import requests
+from requests import RequestException
+from http_client import HedgePolicy, RateBudget, create_session
 from bs4 import BeautifulSoup
 import re
 import sqlite3
-import pandas as pd
 import json
 import time
 from datetime import datetime
 import os
+import sys
+import commentary_db
+import verse_spans
+from bible_reference import get_book_code
+from commentary_db import failure_kind
+from article_profiler import ArticleProfiler
+from metrics import CrawlMetrics, start_metrics_server
+from stage_timing import JsonLinesSink, StageTimer, timed_get
+from html_stream import parse_response
+from html_text import html_to_text
 
 class CompleteHochmaBulkParser:
-    def __init__(self, db_path='bible_database.db'):
+    def __init__(self, db_path='bible_database.db', timer=None, metrics=None, hedge=None, stream=False):
+        if hedge is not None and stream:
+            # 헤징은 본문까지 받은 응답을 고르는 방식이라 받는 대로 파싱하는 스트리밍 요청에는 쓸 수 없음
+            raise ValueError("hedge and stream cannot be used together")
         self.db_path = db_path
+        # 단계별 시간 측정 (싱크를 붙인 StageTimer를 넘기면 구간별 기록도 남김)
+        self.timer = timer or StageTimer()
+        # Prometheus 메트릭 (CrawlMetrics, 단계별 소요 시간도 함께 집계)
+        self.metrics = metrics
+        # 본문을 받은 응답을 넘겨받는 관찰자 (observe_response(response, size) 메서드, 프로파일러 등)
+        self.response_observers = []
+        if metrics:
+            self.timer.sinks.append(metrics)
+            self.response_observers.append(metrics)
         self.base_url = "https://nocr.net/com_kor_hochma"
-        self.session = requests.Session()
+        # 헤지 요청 정책 (http_client.HedgePolicy, None이면 헤징 안 함)
+        self.session = create_session(hedge=hedge)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        # 본문을 받는 대로 증분 파싱 (다운로드와 HTML 파싱을 겹침, hedge와 함께 쓸 수 없음)
+        self.stream = stream
         
         # 통계 변수
         self.total_processed = 0
@@ -28,53 +53,13 @@ class CompleteHochmaBulkParser:
     def setup_database(self):
         """데이터베이스 테이블 설정"""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # commentaries 테이블 생성 (기존 bible_database.db와 호환)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS commentaries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                commentary_name TEXT,
-                book_name TEXT,
-                book_code TEXT,
-                chapter INTEGER,
-                verse INTEGER,
-                text TEXT,
-                version TEXT DEFAULT 'hochma',
-                verse_title TEXT,
-                article_id INTEGER,  -- Ensure this column exists
-                url TEXT,  -- Ensure this column exists
-                parsed_date TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Check if article_id column exists, and add it if not
-        cursor.execute("PRAGMA table_info(commentaries)")
-        columns = [info[1] for info in cursor.fetchall()]
-        if 'article_id' not in columns:
-            cursor.execute("ALTER TABLE commentaries ADD COLUMN article_id INTEGER")
-            print("Added 'article_id' column to commentaries table.")
-        
-        # Check if url column exists, and add it if not
-        cursor.execute("PRAGMA table_info(commentaries)")
-        columns = [info[1] for info in cursor.fetchall()]
-        if 'url' not in columns:
-            cursor.execute("ALTER TABLE commentaries ADD COLUMN url TEXT")
-            print("Added 'url' column to commentaries table.")
-
-        # 인덱스 생성
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_commentaries_book_chapter_verse 
-            ON commentaries(book_name, chapter, verse)
-        ''')
-        
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_commentaries_article_id 
-            ON commentaries(article_id)
-        ''')
         
+        # commentaries 통합 스키마 (구버전 스키마는 자동 마이그레이션)
+        commentary_db.ensure_commentaries_schema(conn)
+        # 재시도 후에도 실패한 게시글 (retry-failed로 다시 처리)
+        commentary_db.ensure_failed_articles(conn)
         conn.commit()
+        
         conn.close()
         print("Database table setup complete.")
     
@@ -95,46 +80,77 @@ class CompleteHochmaBulkParser:
         url = f"{self.base_url}/{article_id}"
         
         try:
-            response = self.session.get(url, timeout=15)
-            response.encoding = 'utf-8'
+            response = timed_get(self.timer, self.session, url, article_id, timeout=15, stream=self.stream)
+            if self.stream:
+                soup = self.parse_stream(response, article_id)
+            else:
+                response.encoding = 'utf-8'
+                self.observe_response(response)
             
             if response.status_code != 200:
                 return None, f"HTTP {response.status_code}"
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 제목 추출
-            title = self.extract_title(soup)
-            if not title:
-                return None, "제목 추출 실패"
+            if not self.stream:
+                with self.timer.span('html_parse', article_id):
+                    soup = BeautifulSoup(response.text, 'html.parser')
             
-            # 제목에서 성경책명과 장 추출
-            book_info = self.extract_book_info(title)
-            if not book_info:
-                return None, "성경책 정보 추출 실패"
-            
-            # 본문 추출
-            content = self.extract_content(soup)
-            if not content:
-                return None, "본문 추출 실패"
+            with self.timer.span('extract', article_id):
+                # 제목 추출
+                title = self.extract_title(soup)
+                if not title:
+                    return None, "제목 추출 실패"
+                
+                # 제목에서 성경책명과 장 추출
+                book_info = self.extract_book_info(title)
+                if not book_info:
+                    return None, "성경책 정보 추출 실패"
+                
+                # 본문 추출
+                content = self.extract_content(soup)
+                if not content:
+                    return None, "본문 추출 실패"
             
-            # 절별로 파싱
-            verses = self.parse_verses(content, book_info['book_name'], book_info['chapter'])
+            # 절 범위를 한 번만 계산 (절 수, 절 본문, 스팬 저장 오프셋 모두 이 결과를 씀)
+            with self.timer.span('segment', article_id):
+                spans = list(self.iter_verse_spans(content, book_info['chapter']))
             
-            if not verses:
+            if not spans:
                 return None, "절 파싱 실패"
             
             return {
                 'title': title,
                 'book_name': book_info['book_name'],
                 'chapter': book_info['chapter'],
-                'verses': verses,
-                'url': url
+                # 절 본문은 저장하면서 spans에서 잘라 냄
+                'verses': self.iter_verses(content, book_info['chapter'], spans),
+                'url': url,
+                # 절 범위 (절 번호 목록, 시작, 끝) 문자 오프셋 / 스팬 저장 모드에서 본문을 한 번만 저장할 때 사용
+                'spans': spans,
+                'content': content
             }, None
             
+        except RequestException as e:
+            # http_client 재시도 정책으로 재시도한 뒤에도 남은 연결/읽기 오류
+            return None, f"network error: {e}"
         except Exception as e:
             return None, str(e)
     
+    def parse_stream(self, response, article_id):
+        """stream=True 응답 본문을 받는 대로 파싱 (200이 아니면 본문을 받지 않고 None)"""
+        soup, size = None, 0
+        with response:
+            if response.status_code == 200:
+                # 본문 다운로드와 HTML 파싱이 겹치므로 한 구간으로 기록
+                with self.timer.span('download_parse', article_id):
+                    soup, size = parse_response(response)
+        self.observe_response(response, size)
+        return soup
+    
+    def observe_response(self, response, size=None):
+        """응답 관찰자에 응답 전달 (stream=True로 이미 읽은 응답은 size로 바이트 수를 넘김)"""
+        for observer in self.response_observers:
+            observer.observe_response(response, size)
+    
     def extract_title(self, soup):
         """제목 추출"""
         # H1 태그에서 제목 찾기
@@ -180,20 +196,45 @@ class CompleteHochmaBulkParser:
         for selector in selectors:
             content_div = soup.select_one(selector)
             if content_div:
-                # <br> 태그를 줄바꿈으로 변환
-                for br in content_div.find_all('br'):
-                    br.replace_with('\n')
-                
-                text = content_div.get_text()
+                # <br>과 블록 경계를 줄바꿈으로 (트리는 그대로 둠)
+                text = html_to_text(content_div)
                 if text.strip():
                     return text
         
         return None
     
     def parse_verses(self, content, book_name, chapter):
-        """본문을 절별로 파싱 (순차적 절 번호 검증 추가)"""
-        verses = []
-        
+        """본문을 절별로 파싱 (iter_verses 제너레이터, 여러 번 훑으려면 list()로)"""
+        return self.iter_verses(content, chapter)
+    
+    def iter_verses(self, content, chapter, spans=None):
+        """
+        본문을 절별로 나눠 하나씩 내보내는 제너레이터 (iter_verse_spans 범위의 부분 문자열)
+        
+        Args:
+            spans: 이미 계산한 iter_verse_spans 결과 (None이면 여기서 분할)
+        
+        Yields:
+            dict: {'verse': 절 번호, 'content': 주석 본문} (범위 절은 같은 본문으로 절마다 하나씩)
+        """
+        if spans is None:
+            spans = self.iter_verse_spans(content, chapter)
+        for verse_nums, start, end in spans:
+            verse_content = content[start:end]
+            for verse_num in verse_nums:
+                yield {
+                    'verse': verse_num,
+                    'content': verse_content
+                }
+    
+    def iter_verse_spans(self, content, chapter):
+        """
+        본문의 절 범위를 하나씩 내보내는 제너레이터 (순차적 절 번호 검증)
+        절 구분자를 한 번만 훑으면서, 다음 유효 구분자를 만나면 직전 절을 바로 내보냄
+        
+        Yields:
+            tuple: (절 번호 목록, 시작, 끝) 앞뒤 공백을 뺀 주석 본문의 문자 오프셋 (빈 절은 건너뜀)
+        """
         # 모든 가능한 절 패턴을 찾는 통합 정규식
         # 패턴 예시: =1:1, =1:1-5, 1:1, 1:3,5
         # \b (word boundary)를 추가하여 숫자만 있는 경우의 오탐을 줄임
@@ -201,59 +242,37 @@ class CompleteHochmaBulkParser:
             r'\b={0,}' + re.escape(str(chapter)) + r':(\d+(?:-\d+)?(?:,\d+)*)\b'
         )
         
-        matches = list(chapter_verse_pattern.finditer(content))
-        
-        if not matches:
-            return []
-
-        processed_matches = []
         expected_verse_num = 1 # 절은 무조건 순서대로 등장 (1, 2, 3...)
-
-        for i, match in enumerate(matches):
-            matched_verse_str_raw = match.group(1) # e.g., "1", "1-5", "3,5"
-            
-            # parse_verse_range를 사용하여 실제 절 번호 목록을 얻음
-            current_match_verse_nums = self.parse_verse_range(matched_verse_str_raw)
+        previous = None # (직전 유효 구분자, 그 절 번호 목록)
+        
+        for match in chapter_verse_pattern.finditer(content):
+            # parse_verse_range를 사용하여 실제 절 번호 목록을 얻음 (e.g., "1", "1-5", "3,5")
+            verse_nums = self.parse_verse_range(match.group(1))
             
-            if not current_match_verse_nums:
-                continue # 유효한 절 번호가 없으면 건너뜀
-
-            first_verse_in_match = current_match_verse_nums[0]
-
-            # 순차적 절 번호 검증
-            if first_verse_in_match == expected_verse_num:
-                # 이 매치는 유효한 주석 절 시작으로 간주
-                processed_matches.append(match)
-                # 다음 예상 절 번호 업데이트
-                expected_verse_num = current_match_verse_nums[-1] + 1
-            elif first_verse_in_match > expected_verse_num:
-                # 예상 절 번호보다 크면, 중간에 누락된 절이 있거나 참조 구절일 수 있음
-                # 여기서는 순차적 파싱을 위해 이 매치를 무시하고 다음 매치를 기다림
-                # (만약 누락된 절을 포함해야 한다면 로직 변경 필요)
-                # 현재는 참조 구절을 걸러내는 데 중점을 둠
-                continue
-            else: # first_verse_in_match < expected_verse_num
-                # 이미 처리했거나 이전 절 번호이면 무시 (참조 구절)
+            # 유효한 절 번호가 없거나 순서가 맞지 않으면 건너뜀
+            # (예상보다 크면 참조 구절이거나 누락된 절, 작으면 이미 처리한 절을 가리키는 참조 구절)
+            if not verse_nums or verse_nums[0] != expected_verse_num:
                 continue
-
-        # 이제 유효한 매치들로만 절 내용을 추출
-        verses = []
-        for i, match in enumerate(processed_matches):
-            matched_verse_str = match.group(1) # This is the verse string from the regex
             
-            start_pos = match.end()
-            end_pos = processed_matches[i+1].start() if i + 1 < len(processed_matches) else len(content)
-            verse_content = content[start_pos:end_pos].strip()
-
-            if verse_content:
-                verse_nums = self.parse_verse_range(matched_verse_str)
-                for verse_num in verse_nums:
-                    verses.append({
-                        'verse': verse_num,
-                        'content': verse_content
-                    })
-        
-        return verses
+            # 다음 유효 구분자를 찾았으므로 직전 절의 범위가 확정됨
+            if previous:
+                yield from self._verse_span(content, previous, match.start())
+            previous = (match, verse_nums)
+            expected_verse_num = verse_nums[-1] + 1
+        
+        if previous:
+            yield from self._verse_span(content, previous, len(content))
+    
+    def _verse_span(self, content, previous, end_pos):
+        """구분자 뒤부터 end_pos까지에서 앞뒤 공백을 뺀 범위 (str.strip()과 같은 기준)"""
+        match, verse_nums = previous
+        start = match.end()
+        while start < end_pos and content[start].isspace():
+            start += 1
+        while end_pos > start and content[end_pos - 1].isspace():
+            end_pos -= 1
+        if start < end_pos:
+            yield verse_nums, start, end_pos
     
     def parse_verse_range(self, verse_str):
         """절 범위 파싱 (예: "37,38" 또는 "33-35")"""
@@ -285,31 +304,31 @@ class CompleteHochmaBulkParser:
         
         return verse_nums
     
-    def save_to_database(self, parsed_data, article_id):
-        """파싱된 데이터를 데이터베이스에 저장"""
+    def save_to_database(self, parsed_data, article_id, replace=False):
+        """
+        파싱된 데이터를 데이터베이스에 저장 (replace=True면 같은 게시글의 기존 주석을 먼저 삭제)
+        parsed_data['verses']는 parse_single_article이 돌려준 제너레이터 그대로 (리스트도 가능)
+        스팬 저장 모드(verse_spans 테이블이 있는 경우)면 commentaries 대신 본문 한 번과 절 오프셋만 저장
+        
+        Returns:
+            int: 저장한 절 수
+        """
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         
         try:
-            for verse_data in parsed_data['verses']:
-                cursor.execute('''
-                    INSERT INTO commentaries 
-                    (commentary_name, book_name, book_code, chapter, verse, text, article_id, url, parsed_date)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    '호크마 주석',
-                    parsed_data['book_name'],
-                    '', # Add an empty string for book_code
-                    parsed_data['chapter'],
-                    verse_data['verse'],
-                    verse_data['content'],
-                    article_id,
-                    parsed_data['url'],
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                ))
+            if verse_spans.span_storage_enabled(conn) and parsed_data.get('content'):
+                saved = self.save_spans(conn, parsed_data, article_id)
+            else:
+                saved = self.save_commentaries(conn, parsed_data, article_id, replace)
             
-            conn.commit()
-            return len(parsed_data['verses'])
+            # 저장에 성공하면 실패 목록에서 제거 (같은 트랜잭션)
+            commentary_db.resolve_failed_article(conn, article_id)
+            
+            if self.metrics:
+                self.metrics.time_commit(conn)
+            else:
+                conn.commit()
+            return saved
             
         except Exception as e:
             conn.rollback()
@@ -317,8 +336,55 @@ class CompleteHochmaBulkParser:
         finally:
             conn.close()
     
+    def save_commentaries(self, conn, parsed_data, article_id, replace=False):
+        """commentaries 테이블에 절마다 한 행씩 저장 (커밋은 호출한 쪽에서)"""
+        cursor = conn.cursor()
+        if replace:
+            cursor.execute('DELETE FROM commentaries WHERE article_id = ?', (article_id,))
+        dedup = commentary_db.content_dedup_enabled(conn)
+        saved = 0
+        for verse_data in parsed_data['verses']:
+            text, content_id = commentary_db.prepare_commentary_text(conn, verse_data['content'], dedup)
+            cursor.execute('''
+                INSERT INTO commentaries 
+                (commentary_name, book_name, book_code, chapter, verse, text, article_id, original_url, parsed_date, verse_ordinal, content_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                '호크마 주석',
+                parsed_data['book_name'],
+                get_book_code(parsed_data['book_name']),
+                parsed_data['chapter'],
+                verse_data['verse'],
+                text,
+                article_id,
+                parsed_data['url'],
+                datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                commentary_db.commentary_ordinal(parsed_data['book_name'], parsed_data['chapter'], verse_data['verse']),
+                content_id
+            ))
+            saved += 1
+        return saved
+    
+    def save_spans(self, conn, parsed_data, article_id):
+        """
+        스팬 저장 모드: 게시글 본문과 절 오프셋 저장 (같은 게시글은 항상 교체)
+        parse_single_article이 계산한 parsed_data['spans']를 그대로 쓰고, 없을 때만 본문을 분할
+        """
+        content = parsed_data['content']
+        spans = parsed_data.get('spans')
+        if spans is None:
+            spans = self.iter_verse_spans(content, parsed_data['chapter'])
+        return verse_spans.store_article(
+            conn, article_id, content, spans,
+            url=parsed_data['url'], title=parsed_data['title'],
+            book_name=parsed_data['book_name'], chapter=parsed_data['chapter']
+        )
+    
     def save_to_excel(self, articles, output_file):
         """결과를 엑셀로 저장"""
+        # pandas는 엑셀 저장에만 필요하므로 여기서 import (DB만 저장하는 크롤링은 로드하지 않음)
+        import pandas as pd
+        
         print(f"Excel file creation in progress: {output_file}")
         
         all_data = []
@@ -384,6 +450,33 @@ class CompleteHochmaBulkParser:
         
         print(f"Excel file saved: {output_file}")
     
+    def print_hedge_report(self):
+        """헤징을 켰으면 헤지 요청 수와 헤징 전/후 p99 가져오기 지연 출력"""
+        hedge = getattr(self.session, 'hedge', None)
+        if hedge is None:
+            return
+        report = hedge.report()
+        if not report['requests']:
+            return
+        print(f"\nHedged requests: {report['hedged']}/{report['requests']} "
+              f"({report['hedged'] / report['requests'] * 100:.1f}%), "
+              f"won {report['hedge_wins']}, skipped by rate budget {report['skipped']}")
+        for percent in (50, 95, 99):
+            unhedged = report[f'unhedged_p{percent}']
+            hedged = report[f'p{percent}']
+            change = f" ({(hedged - unhedged) / unhedged * 100:+.1f}%)" if unhedged else ""
+            print(f"  p{percent} fetch latency: {unhedged:.3f}s without hedging -> {hedged:.3f}s{change}")
+    
+    def record_failure(self, article_id, kind, error, title=None):
+        """실패한 게시글을 failed_articles(dead-letter) 테이블에 기록"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            commentary_db.record_failed_article(conn, article_id, kind, error,
+                                                f"{self.base_url}/{article_id}", title)
+            conn.commit()
+        finally:
+            conn.close()
+    
     def bulk_parse(self, json_file, save_to_db=True, save_to_excel=True, batch_size=50):
         """대량 파싱 실행"""
         print("Hochma Commentary Bulk Parsing Start")
@@ -391,6 +484,30 @@ class CompleteHochmaBulkParser:
         
         # 게시글 목록 로드
         articles = self.load_article_list(json_file)
+        return self.parse_articles(articles, save_to_db, save_to_excel)
+    
+    def retry_failed(self, kinds=None, limit=None):
+        """failed_articles에 남은 게시글을 일반 파이프라인으로 다시 처리 (성공하면 목록에서 제거)"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            failed = commentary_db.get_failed_articles(conn, kinds, limit)
+        finally:
+            conn.close()
+        
+        print(f"Retrying failed articles: {len(failed)}")
+        if not failed:
+            return []
+        articles = [{'article_id': row['article_id'], 'title': row['title']} for row in failed]
+        return self.parse_articles(articles, save_to_db=True, save_to_excel=False, replace=True)
+    
+    def parse_articles(self, articles, save_to_db=True, save_to_excel=True, replace=False):
+        """
+        게시글 목록 파싱 (실패한 게시글은 save_to_db일 때 failed_articles에 기록)
+
+        Args:
+            articles (list): {'article_id', 'title'} 딕셔너리 리스트
+            replace (bool): 같은 게시글의 기존 주석 행을 교체
+        """
         self.total_processed = len(articles)
         
         print(f"Parsing target: {self.total_processed} articles")
@@ -399,6 +516,9 @@ class CompleteHochmaBulkParser:
         print("=" * 60)
         
         start_time = time.time()
+        self.timer.reset()
+        if self.metrics:
+            self.metrics.queue_depth.set(self.total_processed, queue='articles')
         results = []
         
         for i, article in enumerate(articles, 1):
@@ -410,17 +530,36 @@ class CompleteHochmaBulkParser:
             # 파싱 실행
             parsed_data, error = self.parse_single_article(article_id)
             
+            if self.metrics:
+                self.metrics.queue_depth.dec(queue='articles')
+            
             if parsed_data:
-                verse_count = len(parsed_data['verses'])
+                # 절 수는 절 범위에서 바로 계산 (범위 절은 절마다 하나, 절 본문은 만들지 않음)
+                verse_count = sum(len(verse_nums) for verse_nums, _, _ in parsed_data['spans'])
                 print(f"{verse_count} verses")
+                if save_to_excel:
+                    # 엑셀 저장은 절 목록을 여러 번 훑으므로 리스트로 받아 둠
+                    parsed_data['verses'] = list(parsed_data['verses'])
                 
-                # 데이터베이스 저장
+                # 데이터베이스 저장 (절 제너레이터는 저장하면서 소비)
                 if save_to_db:
                     try:
-                        saved_count = self.save_to_database(parsed_data, article_id)
+                        with self.timer.span('db_write', article_id):
+                            saved_count = self.save_to_database(parsed_data, article_id, replace)
                         self.total_verses += saved_count
                     except Exception as e:
+                        # 저장하지 못한 게시글은 실패로 집계 (failed_articles에는 'db'로 기록)
                         print(f"  DB save failed: {e}")
+                        parsed_data, error = None, f"db error: {e}"
+            else:
+                print(f"Parsing failed ({error})")
+            
+            if parsed_data:
+                if self.metrics:
+                    self.metrics.article_succeeded(verse_count)
+                # 본문과 절 범위는 저장에만 필요하므로 결과 목록에는 남기지 않음
+                parsed_data.pop('content', None)
+                parsed_data.pop('spans', None)
                 
                 results.append({
                     'article_id': article['article_id'],
@@ -433,7 +572,10 @@ class CompleteHochmaBulkParser:
                 
                 self.successful_parses += 1
             else:
-                print(f"Parsing failed")
+                if self.metrics:
+                    self.metrics.article_failed(error)
+                if save_to_db:
+                    self.record_failure(article_id, failure_kind(error), error, title)
                 results.append({
                     'article_id': article['article_id'],
                     'title': title,
@@ -452,7 +594,8 @@ class CompleteHochmaBulkParser:
                 print(f"Progress: {progress:.1f}% ({i}/{self.total_processed}) - Elapsed: {elapsed:.1f}s")
             
             # 요청 간격 (서버 부하 방지)
-            time.sleep(0.1)
+            with self.timer.span('throttle', article_id):
+                time.sleep(0.1)
         
         # 최종 결과
         elapsed_time = time.time() - start_time
@@ -461,44 +604,109 @@ class CompleteHochmaBulkParser:
         print(f"  Success: {self.successful_parses}")
         print(f"  Failed: {self.failed_parses}")
         print(f"  Total verses: {self.total_verses}")
-        print(f"  Success rate: {(self.successful_parses/self.total_processed)*100:.1f}%")
+        print(f"  Success rate: {(self.successful_parses/max(self.total_processed, 1))*100:.1f}%")
         
         # 엑셀 저장
         if save_to_excel:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             excel_file = f"complete_hochma_parsed_{timestamp}.xlsx"
-            self.save_to_excel(results, excel_file)
+            with self.timer.span('excel_write'):
+                self.save_to_excel(results, excel_file)
+        
+        # 단계별 소요 시간 (엑셀 저장 포함 전체 경과 시간 기준)
+        self.timer.print_breakdown(time.time() - start_time)
+        self.print_hedge_report()
         
         return results
 
-def main():
-    """메인 함수"""
+def find_article_list():
+    """가장 최근 게시글 목록 JSON (extract_all_hochma_links.py 결과, 없으면 None)"""
+    json_files = [f for f in os.listdir('.') if f.startswith('hochma_all_links_') and f.endswith('.json')]
+    return sorted(json_files)[-1] if json_files else None
+
+def main(metrics_port=None, profile_top_n=None, json_file=None, db_path='bible_database.db',
+         save_to_db=False, save_to_excel=True, hedge_rate=None, stream=False, timings_file=None):
+    """
+    메인 함수
+
+    Args:
+        metrics_port (int): 지정하면 이 포트로 /metrics 엔드포인트 실행
+        profile_top_n (int): 지정하면 가장 느린 N개 게시글 프로파일을 profiles/에 저장
+        json_file (str): 게시글 목록 JSON (None이면 가장 최근 hochma_all_links_*.json)
+        db_path (str): 주석 데이터베이스 경로
+        save_to_db (bool): 데이터베이스 저장 여부
+        save_to_excel (bool): 엑셀 저장 여부
+        hedge_rate (float): 지정하면 p95를 넘긴 요청을 헤징 (원 요청+헤지 요청 합계 초당 요청 수 예산)
+        stream (bool): 본문을 받는 대로 증분 파싱 (hedge_rate와 함께 쓸 수 없음)
+        timings_file (str): 지정하면 단계별 구간을 이 파일에 JSON Lines로 기록
+
+    Returns:
+        list: 게시글별 결과 (parse_articles 반환값, 파싱을 시작하지 못했으면 None)
+    """
     print("Hochma Commentary Complete Parsing System")
     print("=" * 50)
+
+    if hedge_rate and stream:
+        print("--hedge and --stream cannot be used together.")
+        print("   Hedging picks whichever response finishes first, so the body cannot be parsed while it streams.")
+        return
     
-    # JSON 파일 확인
-    json_files = [f for f in os.listdir('.') if f.startswith('hochma_all_links_') and f.endswith('.json')]
+    # JSON 파일 확인 (지정하지 않으면 가장 최근 파일 사용)
+    json_file = json_file or find_article_list()
     
-    if not json_files:
+    if not json_file:
         print("No article list JSON file found.")
         print("   Please run extract_all_hochma_links.py first.")
         return
     
-    # 가장 최근 파일 사용
-    json_file = sorted(json_files)[-1]
     print(f"Using article list: {json_file}")
     
     # 파서 초기화
-    parser = CompleteHochmaBulkParser()
+    metrics = None
+    server = None
+    if metrics_port:
+        metrics = CrawlMetrics()
+        server = start_metrics_server(metrics.registry, metrics_port)
+    hedge = HedgePolicy(budget=RateBudget(hedge_rate)) if hedge_rate else None
+    timer = StageTimer([JsonLinesSink(timings_file)]) if timings_file else None
+    parser = CompleteHochmaBulkParser(db_path, timer=timer, metrics=metrics, hedge=hedge, stream=stream)
+    profiler = None
+    if profile_top_n:
+        profiler = ArticleProfiler(top_n=profile_top_n).attach(parser)
     
     # 대량 파싱 실행
-    results = parser.bulk_parse(
-        json_file=json_file,
-        save_to_db=False,
-        save_to_excel=True
-    )
+    try:
+        results = parser.bulk_parse(
+            json_file=json_file,
+            save_to_db=save_to_db,
+            save_to_excel=save_to_excel
+        )
+    finally:
+        # 싱크 버퍼에 남은 구간 기록
+        parser.timer.close()
+        if server:
+            server.shutdown()
+        if profiler:
+            profiler.write('profiles')
+            print("Slowest article profiles saved: profiles/")
     
     print(f"\nAll tasks complete!")
+    return results
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # python complete_hochma_bulk_parser.py [--metrics-port 9464] [--profile 10] [--hedge 10 | --stream]
+    #                                       [--timings stages.jsonl]
+    port = None
+    if '--metrics-port' in sys.argv:
+        port = int(sys.argv[sys.argv.index('--metrics-port') + 1])
+    top_n = None
+    if '--profile' in sys.argv:
+        top_n = int(sys.argv[sys.argv.index('--profile') + 1])
+    hedge_rate = None
+    if '--hedge' in sys.argv:
+        hedge_rate = float(sys.argv[sys.argv.index('--hedge') + 1])
+    timings_file = None
+    if '--timings' in sys.argv:
+        timings_file = sys.argv[sys.argv.index('--timings') + 1]
+    main(metrics_port=port, profile_top_n=top_n, hedge_rate=hedge_rate, stream='--stream' in sys.argv,
+         timings_file=timings_file)
\ No newline at end of file
@@ -1,37 +1,21 @@
-import requests
+from http_client import create_session
 from bs4 import BeautifulSoup
 import pandas as pd
 import re
 import time
 from datetime import datetime
 import json
+from bible_reference import resolve_book_name
+from html_text import html_to_lines
+from verse_records import ArticleInfo, VerseRecord, records_to_columns
 
 class CorrectedHochmaParser:
     def __init__(self):
         self.base_url = "https://nocr.net/index.php?mid=com_kor_hochma&document_srl="
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
-        
-        # 성경책 정규화 매핑
-        self.book_name_mapping = {
-            '창세기': '창세기', '출애굽기': '출애굽기', '레위기': '레위기', '민수기': '민수기', '신명기': '신명기',
-            '여호수아': '여호수아', '사사기': '사사기', '룻기': '룻기', 
-            '사무엘상': '사무엘상', '사무엘하': '사무엘하', '열왕기상': '열왕기상', '열왕기하': '열왕기하',
-            '역대상': '역대상', '역대하': '역대하', '에스라': '에스라', '느헤미야': '느헤미야', '에스더': '에스더',
-            '욥기': '욥기', '시편': '시편', '잠언': '잠언', '전도서': '전도서', '아가': '아가',
-            '이사야': '이사야', '예레미야': '예레미야', '예레미야애가': '예레미야애가', '에스겔': '에스겔', '다니엘': '다니엘',
-            '호세아': '호세아', '요엘': '요엘', '아모스': '아모스', '오바댜': '오바댜', '요나': '요나', 
-            '미가': '미가', '나훔': '나훔', '하박국': '하박국', '스바냐': '스바냐', '학개': '학개', '스가랴': '스가랴', '말라기': '말라기',
-            '마태복음': '마태복음', '마가복음': '마가복음', '누가복음': '누가복음', '요한복음': '요한복음', '사도행전': '사도행전',
-            '로마서': '로마서', '고린도전서': '고린도전서', '고린도후서': '고린도후서', '갈라디아서': '갈라디아서',
-            '에베소서': '에베소서', '빌립보서': '빌립보서', '골로새서': '골로새서', 
-            '데살로니가전서': '데살로니가전서', '데살로니가후서': '데살로니가후서',
-            '디모데전서': '디모데전서', '디모데후서': '디모데후서', '디도서': '디도서', '빌레몬서': '빌레몬서',
-            '히브리서': '히브리서', '야고보서': '야고보서', '베드로전서': '베드로전서', '베드로후서': '베드로후서',
-            '요한일서': '요한일서', '요한이서': '요한이서', '요한삼서': '요한삼서', '유다서': '유다서', '요한계시록': '요한계시록'
-        }
 
     def extract_title_and_info(self, article_id):
         """게시글에서 올바른 제목과 성경 정보 추출"""
@@ -65,7 +49,7 @@ class CorrectedHochmaParser:
             chapter = int(match.group(2))
             
             # 성경책명 정규화
-            book_name = self.book_name_mapping.get(book_name_raw, book_name_raw)
+            book_name = resolve_book_name(book_name_raw) or book_name_raw
             
             return title_text, "호크마 주석", book_name, chapter
             
@@ -106,14 +90,11 @@ class CorrectedHochmaParser:
                 print(f"⚠️  게시글 {article_id}: 본문 영역을 찾을 수 없음")
                 return []
             
-            # <br> 태그를 \n으로 변환
-            for br in content_area.find_all('br'):
-                br.replace_with('\n')
-            
-            full_text = content_area.get_text()
-            lines = [line.strip() for line in full_text.split('\n') if line.strip()]
+            # <br>과 블록 경계 기준 줄 목록
+            lines = html_to_lines(content_area)
             
-            # 절별 파싱
+            # 절별 파싱 (게시글 메타데이터는 한 번만 만들고 절마다 참조)
+            article = ArticleInfo(article_id, url, title, commentary_name, book_name)
             verses_data = []
             
             # 패턴 1: ====31:1 또는 ===31:1 형식
@@ -134,8 +115,7 @@ class CorrectedHochmaParser:
                     if current_verses and current_content:
                         content_text = '\n'.join(current_content).strip()
                         if content_text:
-                            self._add_verses_data(verses_data, article_id, url, title, commentary_name, 
-                                                book_name, chapter, current_verses, content_text, "equals")
+                            self._add_verses_data(verses_data, article, chapter, current_verses, content_text, "equals")
                     
                     # 새 절 시작
                     ch = int(equals_match.group(1))
@@ -152,8 +132,7 @@ class CorrectedHochmaParser:
                     if current_verses and current_content:
                         content_text = '\n'.join(current_content).strip()
                         if content_text:
-                            self._add_verses_data(verses_data, article_id, url, title, commentary_name, 
-                                                book_name, chapter, current_verses, content_text, "lines")
+                            self._add_verses_data(verses_data, article, chapter, current_verses, content_text, "lines")
                     
                     # 새 절 시작
                     ch = int(line_match.group(1))
@@ -171,25 +150,13 @@ class CorrectedHochmaParser:
             if current_verses and current_content:
                 content_text = '\n'.join(current_content).strip()
                 if content_text:
-                    self._add_verses_data(verses_data, article_id, url, title, commentary_name, 
-                                        book_name, chapter, current_verses, content_text, pattern_type)
+                    self._add_verses_data(verses_data, article, chapter, current_verses, content_text, pattern_type)
             
             # 절을 찾지 못한 경우 전체 내용을 1절로 저장
             if not verses_data and lines:
                 full_content = '\n'.join(lines).strip()
                 if full_content:
-                    verses_data.append({
-                        'article_id': article_id,
-                        'url': url,
-                        'title': title,
-                        'commentary_name': commentary_name,
-                        'book_name': book_name,
-                        'chapter': chapter,
-                        'verse': 1,
-                        'content': full_content,
-                        'content_length': len(full_content),
-                        'pattern_type': 'none'
-                    })
+                    verses_data.append(VerseRecord(article, chapter, 1, full_content, 'none'))
             
             return verses_data
             
@@ -213,22 +180,10 @@ class CorrectedHochmaParser:
         
         return verses
 
-    def _add_verses_data(self, verses_data, article_id, url, title, commentary_name, 
-                        book_name, chapter, verses, content, pattern_type):
-        """절 데이터를 추가"""
+    def _add_verses_data(self, verses_data, article, chapter, verses, content, pattern_type):
+        """절 데이터를 추가 (범위 절은 같은 본문 문자열을 공유)"""
         for verse in verses:
-            verses_data.append({
-                'article_id': article_id,
-                'url': url,
-                'title': title,
-                'commentary_name': commentary_name,
-                'book_name': book_name,
-                'chapter': chapter,
-                'verse': verse,
-                'content': content,
-                'content_length': len(content),
-                'pattern_type': pattern_type
-            })
+            verses_data.append(VerseRecord(article, chapter, verse, content, pattern_type))
 
     def parse_multiple_articles(self, article_ids, progress_callback=None):
         """여러 게시글 파싱"""
@@ -281,7 +236,7 @@ class CorrectedHochmaParser:
         
         print(f"💾 엑셀 파일로 저장 중: {filename}")
         
-        df = pd.DataFrame(data)
+        df = pd.DataFrame(records_to_columns(data))
         
         # 통계 생성
         stats_data = []
@@ -370,7 +325,7 @@ def main():
         filename = parser.save_to_excel(data)
         
         # 결과 분석
-        df = pd.DataFrame(data)
+        df = pd.DataFrame(records_to_columns(data))
         print(f"\n📊 파싱 결과 분석:")
         print(f"  총 절 수: {len(df):,}")
         print(f"  성경책 수: {df['book_name'].nunique()}")
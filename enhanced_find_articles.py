@@ -1,4 +1,4 @@
-import requests
+import http_client
 from bs4 import BeautifulSoup
 import time
 import json
@@ -33,7 +33,7 @@ def enhanced_find_articles():
             url = f"{base_url}/com_kor_hochma/{article_id}"
             
             try:
-                response = requests.get(url, headers=headers, timeout=5)
+                response = http_client.get(url, headers=headers, timeout=5)
                 
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.text, 'html.parser')
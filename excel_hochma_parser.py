@@ -1,4 +1,5 @@
 import requests
+from http_client import create_session
 from bs4 import BeautifulSoup
 import sqlite3
 import time
@@ -8,6 +9,9 @@ import json
 from datetime import datetime
 import pandas as pd
 import os
+from bible_reference import get_book_code
+import commentary_db
+from html_text import html_to_text
 
 class ExcelHochmaParser:
     def __init__(self, db_path="bible_database.db"):
@@ -15,7 +19,7 @@ class ExcelHochmaParser:
         엑셀 우선 저장 호크마 성경주석 파서
         """
         self.base_url = "https://nocr.net"
-        self.session = requests.Session()
+        self.session = create_session()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
@@ -24,23 +28,7 @@ class ExcelHochmaParser:
     
     def get_book_code(self, book_name):
         """성경책 이름으로부터 book_code 조회"""
-        book_mapping = {
-            '창세기': 1, '출애굽기': 2, '레위기': 3, '민수기': 4, '신명기': 5,
-            '여호수아': 6, '사사기': 7, '룻기': 8, '사무엘상': 9, '사무엘하': 10,
-            '열왕기상': 11, '열왕기하': 12, '역대상': 13, '역대하': 14, '에스라': 15,
-            '느헤미야': 16, '에스더': 17, '욥기': 18, '시편': 19, '잠언': 20,
-            '전도서': 21, '아가': 22, '이사야': 23, '예레미야': 24, '예레미야애가': 25,
-            '에스겔': 26, '다니엘': 27, '호세아': 28, '요엘': 29, '아모스': 30,
-            '오바댜': 31, '요나': 32, '미가': 33, '나훔': 34, '하박국': 35,
-            '스바냐': 36, '학개': 37, '스가랴': 38, '말라기': 39,
-            '마태복음': 40, '마가복음': 41, '누가복음': 42, '요한복음': 43, '사도행전': 44,
-            '로마서': 45, '고린도전서': 46, '고린도후서': 47, '갈라디아서': 48, '에베소서': 49,
-            '빌립보서': 50, '골로새서': 51, '데살로니가전서': 52, '데살로니가후서': 53,
-            '디모데전서': 54, '디모데후서': 55, '디도서': 56, '빌레몬서': 57,
-            '히브리서': 58, '야고보서': 59, '베드로전서': 60, '베드로후서': 61,
-            '요한일서': 62, '요한이서': 63, '요한삼서': 64, '유다서': 65, '요한계시록': 66
-        }
-        return book_mapping.get(book_name, 999)
+        return get_book_code(book_name)
     
     def fetch_page(self, url, timeout=10):
         """웹 페이지 가져오기"""
@@ -97,7 +85,7 @@ class ExcelHochmaParser:
         content_element = soup.find(class_='xe_content') or soup.find(class_='rd_body') or soup.find(class_='rhymix_content')
         
         if content_element:
-            content_text = content_element.get_text(strip=True)
+            content_text = html_to_text(content_element).strip()
             
             # 3개 이상 등호로 절 구분자 찾기 (수정된 패턴)
             verse_pattern = r'={3,}(\d+):(\d+)'
@@ -309,42 +297,32 @@ class ExcelHochmaParser:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        # commentaries 테이블 생성
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS commentaries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                book_name TEXT NOT NULL,
-                book_code INTEGER NOT NULL,
-                chapter INTEGER NOT NULL,
-                verse INTEGER NOT NULL,
-                text TEXT NOT NULL,
-                version TEXT NOT NULL,
-                verse_title TEXT,
-                commentary_name TEXT NOT NULL,
-                original_url TEXT,
-                parsed_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        # commentaries 통합 스키마 (구버전 스키마는 자동 마이그레이션)
+        commentary_db.ensure_commentaries_schema(conn)
+        dedup = commentary_db.content_dedup_enabled(conn)
         
         # 데이터 삽입
         saved_count = 0
         for _, row in df.iterrows():
+            text, content_id = commentary_db.prepare_commentary_text(conn, row['주석_내용'], dedup)
             cursor.execute('''
                 INSERT OR REPLACE INTO commentaries 
                 (book_name, book_code, chapter, verse, text, version, verse_title, 
-                 commentary_name, original_url, parsed_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 commentary_name, original_url, parsed_date, verse_ordinal, content_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 row['성경책'],
                 row['성경책_코드'],
                 row['장'],
                 row['절'],
-                row['주석_내용'],
+                text,
                 row['버전'],
                 None,
                 row['주석명'],
                 row['원본_URL'],
-                row['파싱_날짜']
+                row['파싱_날짜'],
+                commentary_db.commentary_ordinal(row['성경책'], row['장'], row['절'], row['성경책_코드']),
+                content_id
             ))
             saved_count += 1
         
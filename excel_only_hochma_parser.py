@@ -1,4 +1,4 @@
-import requests
+from http_client import create_session
 from bs4 import BeautifulSoup
 import re
 import pandas as pd
@@ -6,11 +6,12 @@ import json
 import time
 from datetime import datetime
 import os
+from html_text import html_to_text
 
 class ExcelOnlyHochmaParser:
     def __init__(self):
         self.base_url = "https://nocr.net/com_kor_hochma"
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
@@ -123,87 +124,82 @@ class ExcelOnlyHochmaParser:
         for selector in selectors:
             content_div = soup.select_one(selector)
             if content_div:
-                # <br> 태그를 줄바꿈으로 변환
-                for br in content_div.find_all('br'):
-                    br.replace_with('\n')
-                
-                text = content_div.get_text()
+                # <br>과 블록 경계를 줄바꿈으로 (트리는 그대로 둠)
+                text = html_to_text(content_div)
                 if text.strip():
                     return text
         
         return None
     
     def parse_verses(self, content, book_name, chapter):
-        """본문을 절별로 파싱"""
-        verses = []
+        """본문을 절별로 파싱 (iter_verses 결과를 리스트로)"""
+        return list(self.iter_verses(content))
+    
+    def iter_verses(self, content):
+        """
+        본문을 절별로 나눠 하나씩 내보내는 제너레이터
         
+        Yields:
+            dict: {'verse': 절 번호, 'content': 주석 본문}
+        """
         # 패턴 1: ====31:1 (4개 등호) 또는 ===31:1 (3개 등호)
-        equals_pattern = r'={3,}(\d+):(\d+)'
-        equals_matches = list(re.finditer(equals_pattern, content))
-        
-        if equals_matches:
-            # 등호 패턴으로 절 구분
-            for i, match in enumerate(equals_matches):
-                verse_num = int(match.group(2))
-                start_pos = match.end()
-                
-                if i < len(equals_matches) - 1:
-                    end_pos = equals_matches[i + 1].start()
-                    verse_content = content[start_pos:end_pos].strip()
-                else:
-                    verse_content = content[start_pos:].strip()
-                
-                if verse_content:
-                    verses.append({
-                        'verse': verse_num,
-                        'content': verse_content
-                    })
-        else:
-            # 패턴 2: 줄바꿈 기반 절 구분
-            lines = content.split('\n')
-            current_verse = None
-            current_content = []
-            
-            verse_pattern = r'^(\d+):(\d+(?:,\d+)*(?:-\d+)*)$'
+        equals_pattern = re.compile(r'={3,}(\d+):(\d+)')
+        previous = None
+        
+        for match in equals_pattern.finditer(content):
+            # 다음 구분자를 만나면 직전 절의 범위가 확정됨
+            if previous:
+                yield from self._equals_verse(content, previous, match.start())
+            previous = match
+        
+        if previous:
+            yield from self._equals_verse(content, previous, len(content))
+            return
+        
+        # 패턴 2: 줄바꿈 기반 절 구분
+        current_verse = None
+        current_content = []
+        
+        verse_pattern = re.compile(r'^(\d+):(\d+(?:,\d+)*(?:-\d+)*)$')
+        
+        for line in content.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
             
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
+            match = verse_pattern.match(line)
+            if match:
+                # 이전 절 내보내기
+                yield from self._line_verses(current_verse, current_content)
                 
-                match = re.match(verse_pattern, line)
-                if match:
-                    # 이전 절 저장
-                    if current_verse and current_content:
-                        content_text = '\n'.join(current_content).strip()
-                        if content_text:
-                            # 콤마나 하이픈으로 구분된 절 처리
-                            verse_nums = self.parse_verse_range(current_verse)
-                            for verse_num in verse_nums:
-                                verses.append({
-                                    'verse': verse_num,
-                                    'content': content_text
-                                })
-                    
-                    # 새 절 시작
-                    current_verse = match.group(2)
-                    current_content = []
-                else:
-                    if current_verse:
-                        current_content.append(line)
-            
-            # 마지막 절 저장
-            if current_verse and current_content:
-                content_text = '\n'.join(current_content).strip()
-                if content_text:
-                    verse_nums = self.parse_verse_range(current_verse)
-                    for verse_num in verse_nums:
-                        verses.append({
-                            'verse': verse_num,
-                            'content': content_text
-                        })
-        
-        return verses
+                # 새 절 시작
+                current_verse = match.group(2)
+                current_content = []
+            elif current_verse:
+                current_content.append(line)
+        
+        # 마지막 절
+        yield from self._line_verses(current_verse, current_content)
+    
+    def _equals_verse(self, content, match, end_pos):
+        verse_content = content[match.end():end_pos].strip()
+        if verse_content:
+            yield {
+                'verse': int(match.group(2)),
+                'content': verse_content
+            }
+    
+    def _line_verses(self, verse_str, lines):
+        if not verse_str or not lines:
+            return
+        content_text = '\n'.join(lines).strip()
+        if content_text:
+            # 콤마나 하이픈으로 구분된 절 처리
+            for verse_num in self.parse_verse_range(verse_str):
+                yield {
+                    'verse': verse_num,
+                    'content': content_text
+                }
     
     def parse_verse_range(self, verse_str):
         """절 범위 파싱 (예: "37,38" 또는 "33-35")"""
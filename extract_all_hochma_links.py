@@ -1,4 +1,4 @@
-import requests
+from http_client import create_session
 from bs4 import BeautifulSoup
 import re
 import json
@@ -9,7 +9,7 @@ import pandas as pd
 class HochmaLinkExtractor:
     def __init__(self):
         self.base_url = "https://nocr.net/com_kor_hochma"
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
@@ -1,4 +1,4 @@
-import requests
+import http_client
 from bs4 import BeautifulSoup
 import re
 import time
@@ -34,7 +34,7 @@ def find_all_article_ids():
         url = f"{base_url}/com_kor_hochma/{article_id}"
         
         try:
-            response = requests.get(url, headers=headers, timeout=5)
+            response = http_client.get(url, headers=headers, timeout=5)
             
             if response.status_code == 200:
                 # 실제 호크마 주석 페이지인지 확인
@@ -98,7 +98,7 @@ def find_all_article_ids():
             url = f"{base_url}/com_kor_hochma/{article_id}"
             
             try:
-                response = requests.get(url, headers=headers, timeout=3)
+                response = http_client.get(url, headers=headers, timeout=3)
                 
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.text, 'html.parser')
@@ -1,4 +1,5 @@
 import requests
+from http_client import create_session
 from bs4 import BeautifulSoup
 import sqlite3
 import time
@@ -8,6 +9,8 @@ import json
 from datetime import datetime
 import pandas as pd
 import os
+from bible_reference import VERSE_COUNTS, get_book_code
+from html_text import html_to_lines
 
 class FlexibleHochmaParser:
     def __init__(self, db_path="bible_database.db"):
@@ -15,41 +18,17 @@ class FlexibleHochmaParser:
         유연한 호크마 성경주석 파서 - 다양한 절 구분 패턴 지원
         """
         self.base_url = "https://nocr.net"
-        self.session = requests.Session()
+        self.session = create_session()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         self.session.headers.update(self.headers)
         self.db_path = db_path
-        self.bible_verse_counts = self._load_bible_verse_counts()
-
-    def _load_bible_verse_counts(self):
-        try:
-            with open('bible_verse_counts.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            print("bible_verse_counts.json 파일을 찾을 수 없습니다. 절 수 검증이 비활성화됩니다.")
-            return {}
+        self.bible_verse_counts = VERSE_COUNTS
     
     def get_book_code(self, book_name):
         """성경책 이름으로부터 book_code 조회"""
-        book_mapping = {
-            '창세기': 1, '출애굽기': 2, '레위기': 3, '민수기': 4, '신명기': 5,
-            '여호수아': 6, '사사기': 7, '룻기': 8, '사무엘상': 9, '사무엘하': 10,
-            '열왕기상': 11, '열왕기하': 12, '역대상': 13, '역대하': 14, '에스라': 15,
-            '느헤미야': 16, '에스더': 17, '욥기': 18, '시편': 19, '잠언': 20,
-            '전도서': 21, '아가': 22, '이사야': 23, '예레미야': 24, '예레미야애가': 25,
-            '에스겔': 26, '다니엘': 27, '호세아': 28, '요엘': 29, '아모스': 30,
-            '오바댜': 31, '요나': 32, '미가': 33, '나훔': 34, '하박국': 35,
-            '스바냐': 36, '학개': 37, '스가랴': 38, '말라기': 39,
-            '마태복음': 40, '마가복음': 41, '누가복음': 42, '요한복음': 43, '사도행전': 44,
-            '로마서': 45, '고린도전서': 46, '고린도후서': 47, '갈라디아서': 48, '에베소서': 49,
-            '빌립보서': 50, '골로새서': 51, '데살로니가전서': 52, '데살로니가후서': 53,
-            '디모데전서': 54, '디모데후서': 55, '디도서': 56, '빌레몬서': 57,
-            '히브리서': 58, '야고보서': 59, '베드로전서': 60, '베드로후서': 61,
-            '요한일서': 62, '요한이서': 63, '요한삼서': 64, '유다서': 65, '요한계시록': 66
-        }
-        return book_mapping.get(book_name, 999)
+        return get_book_code(book_name)
     
     def fetch_page(self, url, timeout=10):
         """웹 페이지 가져오기"""
@@ -100,75 +79,87 @@ class FlexibleHochmaParser:
         return best_pattern, pattern_counts[best_pattern] if best_pattern else []
     
     def parse_verses_by_pattern(self, content_text, pattern_type, matches, book_name, chapter_num):
-        """패턴에 따라 절별로 분할하고, 예상 절 수에 맞춰 정규화"""
+        """패턴에 따라 절별로 분할하고, 예상 절 수를 알면 현재 장의 1절부터 순서대로 정규화"""
+        verses = self.iter_verses_by_pattern(content_text, pattern_type, matches)
+        
+        # 예상 절 수에 맞춰 정규화 (다른 장의 절은 빼고, 같은 절이 여러 번 나오면 마지막 것, 빠진 절은 플레이스홀더)
+        if self._chapter_verse_count(book_name, chapter_num):
+            return list(self.fill_missing_verses(verses, book_name, chapter_num))
+        
+        # 예상 절 수 정보가 없으면 파싱된 절만 사용 (같은 장·절은 처음 나온 자리에 마지막 본문)
         parsed_verses = {}
+        for verse_data in verses:
+            parsed_verses[(verse_data['chapter'], verse_data['verse'])] = verse_data
+        verse_commentaries = list(parsed_verses.values())
+        
+        # 파싱된 절이 없으면 전체 장을 하나의 주석으로 처리
+        if not verse_commentaries and len(content_text) > 100:
+            verse_commentaries.append({
+                'chapter': chapter_num,
+                'verse': 1,
+                'commentary': content_text
+            })
+        
+        return verse_commentaries
+    
+    def iter_verses_by_pattern(self, content_text, pattern_type, matches):
+        """
+        패턴에 따라 절별로 분할해서 하나씩 내보내는 제너레이터 (본문 순서대로)
         
+        Yields:
+            dict: {'chapter': 장, 'verse': 절, 'commentary': 주석 본문}
+        """
         if pattern_type == 'line_start':
             lines = content_text.split('\n')
-            for i, (line_idx, chapter, verse) in enumerate(matches):
-                current_verse = int(verse)
-                current_chapter = int(chapter)
-                
-                # 다음 절의 시작 위치 찾기
-                next_line_idx = len(lines)
-                if i + 1 < len(matches):
-                    next_line_idx = matches[i + 1][0]
-                
-                verse_content_lines = lines[line_idx + 1:next_line_idx]
-                verse_content = '\n'.join(verse_content_lines).strip()
-                verse_content = re.sub(r'\n\s*\n', '\n\n', verse_content)
-                
-                if verse_content.strip():
-                    parsed_verses[(current_chapter, current_verse)] = verse_content
+            end = len(lines)
         else:
-            for i, (pos, chapter, verse) in enumerate(matches):
-                current_verse = int(verse)
-                current_chapter = int(chapter)
-                
-                start_pos = content_text.find('\n', pos)
+            end = len(content_text)
+        
+        for i, (position, chapter, verse) in enumerate(matches):
+            # 다음 절의 시작 위치 (줄 번호 또는 문자 위치)
+            next_position = matches[i + 1][0] if i + 1 < len(matches) else end
+            
+            if pattern_type == 'line_start':
+                verse_content = '\n'.join(lines[position + 1:next_position])
+            else:
+                start_pos = content_text.find('\n', position)
                 if start_pos == -1:
                     continue
-                start_pos += 1
-                
-                if i + 1 < len(matches):
-                    end_pos = matches[i + 1][0]
-                else:
-                    end_pos = len(content_text)
-                
-                verse_content = content_text[start_pos:end_pos].strip()
-                verse_content = re.sub(r'\n\s*\n', '\n\n', verse_content)
-                
-                if verse_content.strip():
-                    parsed_verses[(current_chapter, current_verse)] = verse_content
-
-        # 예상 절 수에 맞춰 정규화
-        normalized_verse_commentaries = []
-        if book_name in self.bible_verse_counts and chapter_num <= len(self.bible_verse_counts[book_name]):
-            expected_verses_in_chapter = self.bible_verse_counts[book_name][chapter_num - 1]
-            for i in range(1, expected_verses_in_chapter + 1):
-                commentary_content = parsed_verses.get((chapter_num, i), '[누락된 절]')
-                normalized_verse_commentaries.append({
-                    'chapter': chapter_num,
-                    'verse': i,
-                    'commentary': commentary_content
-                })
-        else:
-            # 예상 절 수 정보가 없으면 파싱된 절만 사용
-            for (chap, ver), content in parsed_verses.items():
-                normalized_verse_commentaries.append({
-                    'chapter': chap,
-                    'verse': ver,
-                    'commentary': content
-                })
-            # 파싱된 절이 없는데 전체 장으로 처리된 경우
-            if not normalized_verse_commentaries and len(content_text) > 100:
-                normalized_verse_commentaries.append({
-                    'chapter': chapter_num,
-                    'verse': 1,
-                    'commentary': content_text
-                })
-
-        return normalized_verse_commentaries
+                verse_content = content_text[start_pos + 1:next_position]
+            
+            verse_content = re.sub(r'\n\s*\n', '\n\n', verse_content.strip())
+            if verse_content:
+                yield {
+                    'chapter': int(chapter),
+                    'verse': int(verse),
+                    'commentary': verse_content
+                }
+    
+    def _chapter_verse_count(self, book_name, chapter_num):
+        """장의 예상 절 수 (모르면 None)"""
+        verse_counts = self.bible_verse_counts.get(book_name) if self.bible_verse_counts else None
+        if not verse_counts or not 1 <= chapter_num <= len(verse_counts):
+            return None
+        return verse_counts[chapter_num - 1]
+    
+    def fill_missing_verses(self, verse_commentaries, book_name, chapter_num):
+        """
+        절 목록을 예상 절 수에 맞춰 1절부터 순서대로 내보내는 제너레이터
+        빠진 절은 '[누락된 절]' 플레이스홀더로 채움 (같은 절이 여러 번 나오면 마지막 것, 다른 장의 절은 제외)
+        예상 절 수를 모르면 입력을 그대로 내보냄
+        
+        Args:
+            verse_commentaries: 절 딕셔너리 (리스트 또는 iter_verses_by_pattern 제너레이터)
+        """
+        expected_verses = self._chapter_verse_count(book_name, chapter_num)
+        if not expected_verses:
+            yield from verse_commentaries
+            return
+        
+        parsed_verses = {verse_data['verse']: verse_data for verse_data in verse_commentaries
+                         if verse_data.get('chapter', chapter_num) == chapter_num}
+        for verse in range(1, expected_verses + 1):
+            yield parsed_verses.get(verse) or {'chapter': chapter_num, 'verse': verse, 'commentary': '[누락된 절]'}
     
     def extract_flexible_commentary(self, soup, url):
         """유연한 주석 데이터 추출"""
@@ -209,7 +200,7 @@ class FlexibleHochmaParser:
         content_element = soup.find(class_='xe_content') or soup.find(class_='rd_body') or soup.find(class_='rhymix_content')
         
         if content_element:
-            content_text = content_element.get_text('\n', strip=True)
+            content_text = '\n'.join(html_to_lines(content_element))
             pattern_type, matches = self.detect_verse_pattern(content_text)
             
             if pattern_type and matches:
@@ -255,36 +246,13 @@ class FlexibleHochmaParser:
                 'dataframe': pd.DataFrame()
             }
         
-        # 정규화된 절 목록 생성
-        normalized_verse_commentaries = []
+        # 예상 절 수에 맞춰 누락된 절을 플레이스홀더로 채움 (엑셀 시트는 1절부터 빠짐없이)
         book_name = article_data.get('book_name')
         chapter = article_data.get('chapter')
-
-        if book_name and chapter and self.bible_verse_counts:
-            chapter_int = int(chapter)
-            if book_name in self.bible_verse_counts and chapter_int <= len(self.bible_verse_counts[book_name]):
-                expected_verses_in_chapter = self.bible_verse_counts[book_name][chapter_int - 1]
-                
-                parsed_verses_map = {v['verse']: v for v in article_data['verse_commentaries']}
-                
-                for i in range(1, expected_verses_in_chapter + 1):
-                    if i in parsed_verses_map:
-                        normalized_verse_commentaries.append(parsed_verses_map[i])
-                    else:
-                        # 누락된 절에 대한 플레이스홀더 추가
-                        normalized_verse_commentaries.append({
-                            'chapter': chapter_int,
-                            'verse': i,
-                            'commentary': '[누락된 절]'
-                        })
-            else:
-                # 성경책 또는 장 정보가 bible_verse_counts에 없는 경우 기존 데이터 사용
-                normalized_verse_commentaries = article_data['verse_commentaries']
-        else:
-            # bible_verse_counts가 로드되지 않았거나 정보가 없는 경우 기존 데이터 사용
-            normalized_verse_commentaries = article_data['verse_commentaries']
-
-        article_data['verse_commentaries'] = normalized_verse_commentaries
+        if book_name and chapter:
+            article_data['verse_commentaries'] = list(
+                self.fill_missing_verses(article_data['verse_commentaries'], book_name, int(chapter))
+            )
 
         # Excel 파일명 생성
         if not excel_filename:
@@ -0,0 +1,340 @@
+"""
+호크마 주석 파이프라인 명령줄 도구 (비대화형)
+input() 메뉴 대신 하위 명령과 옵션으로 실행해서 cron 등에서 그대로 쓸 수 있음
+
+    python hochma_cli.py discover [--max-pages 50]
+    python hochma_cli.py crawl [--articles hochma_all_links_*.json] [--no-db] [--excel]
+                               [--metrics-port 9464] [--profile 10] [--hedge 10 | --stream]
+                               [--timings stages.jsonl]
+    python hochma_cli.py reparse 139453 139477 ... | --book 창세기
+    python hochma_cli.py retry-failed [--kind network --kind http] [--list]
+    python hochma_cli.py export commentaries.ndjson.gz [--book 창세기] [--chapter 1] [--partition]
+    python hochma_cli.py coverage [--commentary 호크마 주석] [--missing]
+    python hochma_cli.py stats [--articles-db hochma_articles.db]
+    python hochma_cli.py spans [--enable] [--resegment [article_id ...]]
+
+requests / bs4 / pandas 같은 무거운 모듈은 필요한 하위 명령 안에서만 import하므로
+--help, stats, coverage, export는 파서 모듈을 로드하지 않고 바로 시작함
+"""
+
+import argparse
+import os
+import sys
+
+DEFAULT_DB = 'bible_database.db'
+HOCHMA_COMMENTARY = '호크마 주석'
+# commentary_db.FAILURE_KINDS (--help가 commentary_db를 로드하지 않도록 복사)
+FAILURE_KINDS = ('network', 'http', 'parse', 'db', 'exception')
+
+
+def _require_db(db_path):
+    """데이터베이스 파일 확인 (없으면 안내 출력 후 False)"""
+    if os.path.exists(db_path):
+        return True
+    print(f"데이터베이스 파일이 없습니다: {db_path}")
+    return False
+
+
+def cmd_discover(args):
+    """게시판 목록 페이지에서 모든 게시글 링크를 추출해 hochma_all_links_*.json으로 저장"""
+    from extract_all_hochma_links import HochmaLinkExtractor
+
+    extractor = HochmaLinkExtractor()
+    links = extractor.extract_all_links(max_pages=args.max_pages)
+    if not links:
+        print("링크를 찾을 수 없습니다.")
+        return 1
+    book_articles = extractor.analyze_extracted_links(links)
+    extractor.save_results(links, book_articles)
+    print(f"발견된 게시글: {len(links)}개, 성경책: {len(book_articles)}개")
+    return 0
+
+
+def cmd_crawl(args):
+    """게시글 목록 전체를 파싱해서 데이터베이스(및 엑셀)에 저장 (실패한 게시글이 있으면 1 반환)"""
+    import complete_hochma_bulk_parser
+
+    json_file = args.articles or complete_hochma_bulk_parser.find_article_list()
+    if not json_file:
+        print("게시글 목록 JSON이 없습니다. 먼저 discover를 실행하세요.")
+        return 1
+    if not os.path.exists(json_file):
+        print(f"게시글 목록 파일이 없습니다: {json_file}")
+        return 1
+    results = complete_hochma_bulk_parser.main(
+        metrics_port=args.metrics_port,
+        profile_top_n=args.profile,
+        json_file=json_file,
+        db_path=args.db,
+        save_to_db=not args.no_db,
+        save_to_excel=args.excel,
+        hedge_rate=args.hedge,
+        stream=args.stream,
+        timings_file=args.timings,
+    )
+    if results is None:
+        return 1
+    return 1 if any(result['status'] == 'failed' for result in results) else 0
+
+
+def _book_article_ids(db_path, book_name):
+    """데이터베이스에 저장된 성경책의 게시글 번호 목록"""
+    import sqlite3
+
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT DISTINCT article_id FROM commentaries "
+            "WHERE book_name = ? AND commentary_name = ? AND article_id IS NOT NULL ORDER BY article_id",
+            (book_name, HOCHMA_COMMENTARY)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [row[0] for row in rows]
+
+
+def cmd_reparse(args):
+    """게시글을 다시 받아 파싱하고 기존 주석 행을 교체"""
+    import time
+
+    article_ids = list(args.article_ids)
+    if args.book:
+        if not _require_db(args.db):
+            return 1
+        article_ids.extend(_book_article_ids(args.db, args.book))
+    if not article_ids:
+        print("다시 파싱할 게시글이 없습니다 (게시글 번호 또는 --book 지정).")
+        return 1
+
+    from complete_hochma_bulk_parser import CompleteHochmaBulkParser, failure_kind
+
+    parser = CompleteHochmaBulkParser(args.db)
+    failed = []
+    for i, article_id in enumerate(article_ids, 1):
+        parsed_data, error = parser.parse_single_article(article_id)
+        if parsed_data:
+            try:
+                saved = parser.save_to_database(parsed_data, article_id, replace=True)
+            except Exception as e:
+                # 저장 실패는 기록하고 다음 게시글 계속 처리
+                print(f"[{i}/{len(article_ids)}] {article_id}: DB 저장 실패 ({e})")
+                parser.record_failure(article_id, 'db', str(e))
+                failed.append(article_id)
+            else:
+                print(f"[{i}/{len(article_ids)}] {article_id}: {saved}개 절 저장")
+        else:
+            print(f"[{i}/{len(article_ids)}] {article_id}: 실패 ({error})")
+            parser.record_failure(article_id, failure_kind(error), error)
+            failed.append(article_id)
+        time.sleep(args.delay)
+
+    print(f"완료: 성공 {len(article_ids) - len(failed)}개, 실패 {len(failed)}개")
+    if failed:
+        print(f"실패한 게시글: {' '.join(str(article_id) for article_id in failed)}")
+    return 1 if failed else 0
+
+
+def cmd_retry_failed(args):
+    """failed_articles(dead-letter)에 남은 게시글을 일반 크롤링 파이프라인으로 다시 처리"""
+    if not _require_db(args.db):
+        return 1
+    if args.list:
+        import sqlite3
+        import commentary_db
+
+        conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+        try:
+            failed = commentary_db.get_failed_articles(conn, args.kind, args.limit)
+        finally:
+            conn.close()
+        for row in failed:
+            print(f"{row['article_id']}  {row['kind']:9} 시도 {row['attempts']}회  {row['last_failed']}  {row['error']}")
+        print(f"실패 게시글: {len(failed)}개")
+        return 0
+
+    from complete_hochma_bulk_parser import CompleteHochmaBulkParser
+
+    parser = CompleteHochmaBulkParser(args.db)
+    results = parser.retry_failed(args.kind, args.limit)
+    return 1 if any(result['status'] == 'failed' for result in results) else 0
+
+
+def cmd_export(args):
+    """주석을 JSON / NDJSON (.gz)으로 스트리밍 내보내기"""
+    if not _require_db(args.db):
+        return 1
+    from commentary_reader import CommentaryReader
+
+    with CommentaryReader(args.db, cache_size=0) as reader:
+        files = reader.export(args.output, book_name=args.book, chapter=args.chapter,
+                              commentary_name=args.commentary, partition_by_book=args.partition)
+    for filename, count in files.items():
+        print(f"{filename}: {count:,}개 행")
+    return 0
+
+
+def cmd_coverage(args):
+    """성경책별 주석이 있는 장 비율 (--missing이면 없는 장 번호도 출력)"""
+    if not _require_db(args.db):
+        return 1
+    import sqlite3
+    import commentary_db
+
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    try:
+        coverage = commentary_db.get_chapter_coverage(conn, args.commentary)
+    finally:
+        conn.close()
+
+    covered_total = sum(covered for _, covered, _, _ in coverage)
+    chapters_total = sum(total for _, _, total, _ in coverage)
+    print(f"장 커버리지 ({args.commentary or '전체 주석'}): {covered_total}/{chapters_total}장 "
+          f"({covered_total / chapters_total * 100:.1f}%)")
+    for book, covered, total, missing in coverage:
+        line = f"  {book:6} {covered:4}/{total:<4}"
+        if args.missing and missing:
+            line += f"  없음: {', '.join(str(chapter) for chapter in missing)}"
+        print(line)
+    return 0
+
+
+def cmd_stats(args):
+    """주석(및 게시글) 데이터베이스 통계"""
+    if not _require_db(args.db):
+        return 1
+    from commentary_reader import ArticleReader, CommentaryReader
+
+    with CommentaryReader(args.db, pool_size=1, cache_size=0) as reader:
+        stats = reader.statistics()
+    print(f"전체 주석: {stats['total_commentaries']:,}개")
+    if 'total_text_length' in stats:
+        print(f"본문 글자 수: {stats['total_text_length']:,}자")
+    print("주석별:")
+    for name, count in stats['commentary_types'].items():
+        print(f"  {name}: {count:,}개")
+    print("성경책별:")
+    for book, count in stats['books'].items():
+        print(f"  {book}: {count:,}개")
+
+    if args.articles_db:
+        if not _require_db(args.articles_db):
+            return 1
+        with ArticleReader(args.articles_db, pool_size=1) as reader:
+            article_stats = reader.statistics()
+        print(f"전체 게시글: {article_stats['total_articles']:,}개 ({args.articles_db})")
+        for book, count in article_stats['books'].items():
+            print(f"  {book}: {count:,}개")
+    return 0
+
+
+def cmd_spans(args):
+    """스팬 저장 모드 전환 / 저장된 본문으로 재분할 / 저장소 크기 요약"""
+    if not _require_db(args.db):
+        return 1
+    import sqlite3
+    import verse_spans
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.enable:
+            verse_spans.enable_span_storage(conn)
+            conn.commit()
+            print("스팬 저장 모드를 켰습니다 (이후 crawl / reparse는 본문과 절 오프셋만 저장).")
+        if not verse_spans.span_storage_enabled(conn):
+            print("스팬 저장 모드가 아닙니다 (--enable로 전환).")
+            return 1
+        if args.resegment is not None:
+            from complete_hochma_bulk_parser import CompleteHochmaBulkParser
+
+            parser = CompleteHochmaBulkParser(args.db)
+            articles, verses = verse_spans.resegment(conn, parser.iter_verse_spans, args.resegment)
+            conn.commit()
+            print(f"재분할: 게시글 {articles:,}개, 절 {verses:,}개")
+        stats = verse_spans.span_storage_stats(conn)
+    finally:
+        conn.close()
+    print(f"게시글 본문: {stats['articles']:,}개 ({stats['body_bytes']:,}바이트)")
+    print(f"절 오프셋: {stats['verses']:,}개 (절마다 복사했다면 {stats['span_bytes']:,}바이트)")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='hochma_cli.py',
+        description='호크마 주석 수집/조회 파이프라인 (비대화형)',
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+
+    discover = subparsers.add_parser('discover', help='게시글 링크 목록 추출')
+    discover.add_argument('--max-pages', type=int, default=50, help='최대 목록 페이지 수 (기본 50)')
+    discover.set_defaults(func=cmd_discover)
+
+    crawl = subparsers.add_parser('crawl', help='게시글 목록 전체 파싱')
+    crawl.add_argument('--articles', help='게시글 목록 JSON (기본: 가장 최근 hochma_all_links_*.json)')
+    crawl.add_argument('--db', default=DEFAULT_DB, help=f'주석 데이터베이스 (기본 {DEFAULT_DB})')
+    crawl.add_argument('--no-db', action='store_true', help='데이터베이스에 저장하지 않음')
+    crawl.add_argument('--excel', action='store_true', help='결과 엑셀 파일도 저장')
+    crawl.add_argument('--metrics-port', type=int, help='/metrics 엔드포인트 포트')
+    crawl.add_argument('--profile', type=int, metavar='N', help='가장 느린 N개 게시글 프로파일 저장')
+    # 헤징은 본문까지 받은 응답을 고르므로 받는 대로 파싱하는 --stream과 함께 쓸 수 없음
+    fetch_mode = crawl.add_mutually_exclusive_group()
+    fetch_mode.add_argument('--hedge', type=float, metavar='RATE',
+                            help='p95를 넘긴 요청을 한 번 더 보냄 (RATE: 헤지 포함 초당 요청 수 예산)')
+    fetch_mode.add_argument('--stream', action='store_true',
+                            help='본문을 받는 대로 증분 파싱 (다운로드와 HTML 파싱을 겹침, --hedge와 함께 쓸 수 없음)')
+    crawl.add_argument('--timings', metavar='FILE', help='단계별 구간을 JSON Lines 파일에 기록')
+    crawl.set_defaults(func=cmd_crawl)
+
+    reparse = subparsers.add_parser('reparse', help='게시글을 다시 파싱해서 기존 주석 교체')
+    reparse.add_argument('article_ids', nargs='*', type=int, metavar='article_id', help='게시글 번호')
+    reparse.add_argument('--book', help='이 성경책의 저장된 게시글 전체')
+    reparse.add_argument('--db', default=DEFAULT_DB, help=f'주석 데이터베이스 (기본 {DEFAULT_DB})')
+    reparse.add_argument('--delay', type=float, default=0.1, help='요청 간격 (초, 기본 0.1)')
+    reparse.set_defaults(func=cmd_reparse)
+
+    retry_failed = subparsers.add_parser('retry-failed', help='실패 게시글(dead-letter) 다시 처리')
+    retry_failed.add_argument('--db', default=DEFAULT_DB, help=f'주석 데이터베이스 (기본 {DEFAULT_DB})')
+    retry_failed.add_argument('--kind', action='append', choices=FAILURE_KINDS,
+                              help='이 분류만 처리 (여러 번 지정 가능, 기본: 전체)')
+    retry_failed.add_argument('--limit', type=int, help='최대 게시글 수')
+    retry_failed.add_argument('--list', action='store_true', help='다시 처리하지 않고 목록만 출력')
+    retry_failed.set_defaults(func=cmd_retry_failed)
+
+    export = subparsers.add_parser('export', help='주석 내보내기 (.json / .ndjson, .gz 압축)')
+    export.add_argument('output', help='출력 파일')
+    export.add_argument('--db', default=DEFAULT_DB, help=f'주석 데이터베이스 (기본 {DEFAULT_DB})')
+    export.add_argument('--book', help='성경책')
+    export.add_argument('--chapter', type=int, help='장')
+    export.add_argument('--commentary', help='주석명')
+    export.add_argument('--partition', action='store_true', help='성경책마다 별도 파일로 나눔')
+    export.set_defaults(func=cmd_export)
+
+    coverage = subparsers.add_parser('coverage', help='성경책별 장 커버리지')
+    coverage.add_argument('--db', default=DEFAULT_DB, help=f'주석 데이터베이스 (기본 {DEFAULT_DB})')
+    coverage.add_argument('--commentary', help='주석명 (기본: 전체 주석)')
+    coverage.add_argument('--missing', action='store_true', help='없는 장 번호도 출력')
+    coverage.set_defaults(func=cmd_coverage)
+
+    stats = subparsers.add_parser('stats', help='데이터베이스 통계')
+    stats.add_argument('--db', default=DEFAULT_DB, help=f'주석 데이터베이스 (기본 {DEFAULT_DB})')
+    stats.add_argument('--articles-db', help='게시글 데이터베이스 (예: hochma_articles.db)')
+    stats.set_defaults(func=cmd_stats)
+
+    spans = subparsers.add_parser('spans', help='스팬 저장 모드 (본문 한 번 + 절 오프셋)')
+    spans.add_argument('--db', default=DEFAULT_DB, help=f'주석 데이터베이스 (기본 {DEFAULT_DB})')
+    spans.add_argument('--enable', action='store_true', help='스팬 저장 모드로 전환')
+    spans.add_argument('--resegment', nargs='*', type=int, metavar='article_id',
+                       help='저장된 본문으로 절 분할만 다시 해서 오프셋 교체 (번호를 주지 않으면 전체)')
+    spans.set_defaults(func=cmd_spans)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,16 @@
 import requests
+from http_client import create_session
 from bs4 import BeautifulSoup
 import sqlite3
 import time
 import re
 from urllib.parse import urljoin, urlparse
-import json
 from datetime import datetime
+import commentary_reader
+from html_text import SKIP_TAGS, html_to_text
+
+# 본문 영역 안에서도 건너뛸 태그
+NOISE_TAGS = SKIP_TAGS | {'nav', 'footer', 'header'}
 
 class HochmaParser:
     def __init__(self, db_path="hochma_articles.db"):
@@ -16,13 +21,14 @@ class HochmaParser:
             db_path (str): SQLite 데이터베이스 파일 경로
         """
         self.base_url = "https://nocr.net"
-        self.session = requests.Session()
+        self.session = create_session()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         self.session.headers.update(self.headers)
         
         self.db_path = db_path
+        self._reader = None
         self.init_database()
     
     def init_database(self):
@@ -52,6 +58,41 @@ class HochmaParser:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_book_name ON articles(book_name)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_chapter ON articles(chapter)')
         
+        # 성경책별 게시글 수/본문 길이 집계 (트리거로 증분 갱신)
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'article_stats'")
+        stats_exists = cursor.fetchone() is not None
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS article_stats (
+                book_name TEXT PRIMARY KEY,
+                article_count INTEGER NOT NULL DEFAULT 0,
+                content_length INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS article_stats_ai AFTER INSERT ON articles BEGIN
+                INSERT INTO article_stats (book_name, article_count, content_length)
+                VALUES (COALESCE(new.book_name, ''), 1, COALESCE(length(new.content), 0))
+                ON CONFLICT (book_name) DO UPDATE SET
+                    article_count = article_count + 1,
+                    content_length = content_length + excluded.content_length;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS article_stats_ad AFTER DELETE ON articles BEGIN
+                UPDATE article_stats SET
+                    article_count = article_count - 1,
+                    content_length = content_length - COALESCE(length(old.content), 0)
+                WHERE book_name = COALESCE(old.book_name, '');
+            END
+        ''')
+        if not stats_exists:
+            cursor.execute('''
+                INSERT INTO article_stats (book_name, article_count, content_length)
+                SELECT COALESCE(book_name, ''), COUNT(*), COALESCE(SUM(length(content)), 0)
+                FROM articles
+                GROUP BY COALESCE(book_name, '')
+            ''')
+        
         conn.commit()
         conn.close()
         print(f"데이터베이스 초기화 완료: {self.db_path}")
@@ -131,26 +172,20 @@ class HochmaParser:
         # 1. .xe_content 클래스 (가장 정확한 본문)
         xe_content = soup.find(class_='xe_content')
         if xe_content:
-            # 불필요한 태그 제거
-            for unwanted in xe_content(['script', 'style', 'nav', 'footer', 'header']):
-                unwanted.decompose()
-            content_text = xe_content.get_text(strip=True)
+            # 불필요한 태그는 건너뜀
+            content_text = html_to_text(xe_content, NOISE_TAGS).strip()
         
         # 2. .rd_body 클래스 (대안)
         if not content_text or len(content_text) < 100:
             rd_body = soup.find(class_='rd_body')
             if rd_body:
-                for unwanted in rd_body(['script', 'style', 'nav', 'footer', 'header']):
-                    unwanted.decompose()
-                content_text = rd_body.get_text(strip=True)
+                content_text = html_to_text(rd_body, NOISE_TAGS).strip()
         
         # 3. .rhymix_content 클래스 (대안)
         if not content_text or len(content_text) < 100:
             rhymix_content = soup.find(class_='rhymix_content')
             if rhymix_content:
-                for unwanted in rhymix_content(['script', 'style', 'nav', 'footer', 'header']):
-                    unwanted.decompose()
-                content_text = rhymix_content.get_text(strip=True)
+                content_text = html_to_text(rhymix_content, NOISE_TAGS).strip()
         
         # 4. 마지막 수단: 전체 페이지에서 추출 (하지만 노이즈 제거)
         if not content_text or len(content_text) < 50:
@@ -200,6 +235,8 @@ class HochmaParser:
         """
         try:
             conn = sqlite3.connect(self.db_path)
+            # REPLACE로 지워지는 기존 행도 article_stats_ad 트리거가 반영하도록
+            conn.execute("PRAGMA recursive_triggers = ON")
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -284,6 +321,13 @@ class HochmaParser:
         print(f"파싱 완료: 총 {len(parsed_articles)}개 게시글")
         return parsed_articles
     
+    @property
+    def reader(self):
+        """읽기 전용 조회 서비스 (연결 풀/고정 SQL 재사용, 처음 조회할 때 생성)"""
+        if self._reader is None:
+            self._reader = commentary_reader.ArticleReader(self.db_path)
+        return self._reader
+    
     def get_articles_from_db(self, book_name=None, limit=None):
         """
         데이터베이스에서 게시글 조회
@@ -295,43 +339,20 @@ class HochmaParser:
         Returns:
             list: 게시글 데이터 리스트
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM articles"
-        params = []
-        
-        if book_name:
-            query += " WHERE book_name = ?"
-            params.append(book_name)
-        
-        query += " ORDER BY article_id DESC"
-        
-        if limit:
-            query += " LIMIT ?"
-            params.append(limit)
-        
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        articles = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        conn.close()
-        return articles
+        return self.reader.articles(book_name=book_name, limit=limit)
     
     def export_to_json(self, filename, book_name=None):
         """
-        데이터베이스 내용을 JSON 파일로 내보내기
+        데이터베이스 내용을 JSON 파일로 내보내기 (커서를 스트리밍으로 기록)
         
         Args:
-            filename (str): 저장할 파일명
+            filename (str): 저장할 파일명 (.json: JSON 배열, .ndjson/.jsonl: 줄 단위 JSON,
+                            .gz를 붙이면 gzip 압축)
             book_name (str): 성경책 이름으로 필터링 (선택사항)
         """
-        articles = self.get_articles_from_db(book_name=book_name)
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(articles, f, ensure_ascii=False, indent=2, default=str)
+        count = self.reader.export_articles(filename, book_name=book_name)
         
-        print(f"JSON 내보내기 완료: {filename} ({len(articles)}개 게시글)")
+        print(f"JSON 내보내기 완료: {filename} ({count}개 게시글)")
     
     def get_statistics(self):
         """
@@ -340,30 +361,7 @@ class HochmaParser:
         Returns:
             dict: 통계 정보
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # 전체 게시글 수
-        cursor.execute("SELECT COUNT(*) FROM articles")
-        total_count = cursor.fetchone()[0]
-        
-        # 성경책별 게시글 수
-        cursor.execute("""
-            SELECT book_name, COUNT(*) as count 
-            FROM articles 
-            WHERE book_name != '' 
-            GROUP BY book_name 
-            ORDER BY count DESC
-        """)
-        book_stats = cursor.fetchall()
-        
-        conn.close()
-        
-        return {
-            'total_articles': total_count,
-            'books': dict(book_stats)
-        }
-
+        return self.reader.statistics()
 
 def main():
     """
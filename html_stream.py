@@ -0,0 +1,143 @@
+"""
+증분 HTML 파싱
+stream=True 응답의 본문을 소켓에서 받는 대로 조각(chunk) 단위로 html.parser에 넣어서
+다운로드와 트리 생성을 겹침 (본문 다운로드가 끝나면 트리도 거의 다 만들어져 있음)
+
+- 조각은 증분 UTF-8 디코더로 바로 디코딩 (response.content 전체 바이트와
+  response.text 전체 문자열을 따로 만들지 않음)
+- 결과는 BeautifulSoup(response.text, 'html.parser')와 같은 트리
+  (표준 html.parser 이벤트를 BeautifulSoup 공개 트리 생성 메서드로 넘김, bs4 내부 파서 클래스는 쓰지 않음)
+- 문자 참조는 html.unescape 규칙으로 풀어서, 잘못된 참조(&#0; 등)나 알 수 없는 엔티티처럼
+  드문 입력에서만 bs4 html.parser 빌더와 결과 문자가 다를 수 있음
+- <br> 뒤의 <br/>은 bs4 4.13 이상처럼 바로 닫음 (4.12는 뒤따르는 내용을 <br/> 안에 넣음)
+
+사용법
+    response = session.get(url, stream=True)
+    soup, size = parse_response(response)
+"""
+
+import codecs
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+from bs4.element import CData, Comment, Declaration, Doctype, ProcessingInstruction
+
+DEFAULT_CHUNK_SIZE = 16 * 1024
+
+
+class _SoupTreeParser(HTMLParser):
+    def __init__(self, soup):
+        """
+        표준 html.parser 이벤트를 BeautifulSoup의 트리 생성 메서드
+        (handle_starttag/handle_endtag/handle_data/endData)로 넘기는 파서
+        bs4 내부 파서 클래스 대신 공개 API만 써서 bs4 버전이 바뀌어도 그대로 동작함
+
+        Args:
+            soup (BeautifulSoup): 노드를 추가할 빈 트리
+        """
+        # 문자 참조(&amp; &#44032; 등)는 html.parser가 html.unescape 규칙으로 풀어서 handle_data로 넘김
+        super().__init__(convert_charrefs=True)
+        self.soup = soup
+        # 닫는 태그 없이 이미 닫은 빈 요소 (<br> 뒤에 </br>이 오면 무시)
+        self.already_closed_empty_element = []
+
+    def handle_startendtag(self, name, attrs):
+        # <br/>처럼 스스로 닫은 태그는 앞에서 닫은 빈 요소 목록과 상관없이 바로 닫음
+        self.handle_starttag(name, attrs, handle_empty_element=False)
+        self.handle_endtag(name, check_already_closed=False)
+
+    def handle_starttag(self, name, attrs, handle_empty_element=True):
+        # 값이 없는 속성은 빈 문자열, 같은 속성이 여러 번 나오면 마지막 값 (bs4 기본값과 같음)
+        attr_dict = {key: '' if value is None else value for key, value in attrs}
+        sourceline, sourcepos = self.getpos()
+        tag = self.soup.handle_starttag(name, None, None, attr_dict,
+                                        sourceline=sourceline, sourcepos=sourcepos)
+        if tag is not None and tag.is_empty_element and handle_empty_element:
+            # html.parser는 <br> 같은 빈 요소의 끝 이벤트를 보내지 않으므로 바로 닫음
+            self.handle_endtag(name, check_already_closed=False)
+            self.already_closed_empty_element.append(name)
+
+    def handle_endtag(self, name, check_already_closed=True):
+        if check_already_closed and name in self.already_closed_empty_element:
+            self.already_closed_empty_element.remove(name)
+        else:
+            self.soup.handle_endtag(name)
+
+    def handle_data(self, data):
+        self.soup.handle_data(data)
+
+    def _special(self, data, node_class):
+        self.soup.endData()
+        self.soup.handle_data(data)
+        self.soup.endData(node_class)
+
+    def handle_comment(self, data):
+        self._special(data, Comment)
+
+    def handle_decl(self, decl):
+        self._special(decl[len('DOCTYPE '):], Doctype)
+
+    def unknown_decl(self, data):
+        if data.upper().startswith('CDATA['):
+            self._special(data[len('CDATA['):], CData)
+        else:
+            self._special(data, Declaration)
+
+    def handle_pi(self, data):
+        self._special(data, ProcessingInstruction)
+
+
+class IncrementalSoup:
+    def __init__(self, encoding='utf-8'):
+        """
+        조각 단위로 받은 바이트로 BeautifulSoup 트리를 만드는 파서
+
+        Args:
+            encoding (str): 본문 인코딩 (디코딩할 수 없는 바이트는 U+FFFD로 바꿈)
+        """
+        self.soup = BeautifulSoup('', 'html.parser')
+        self._parser = _SoupTreeParser(self.soup)
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self.bytes_read = 0
+
+    def feed(self, chunk):
+        """바이트 조각 하나를 디코딩해서 파서에 넣음 (멀티바이트 문자가 잘려도 다음 조각과 이어서 처리)"""
+        self.bytes_read += len(chunk)
+        text = self._decoder.decode(chunk)
+        if text:
+            self._parser.feed(text)
+
+    def close(self):
+        """
+        남은 입력을 처리하고 열린 태그를 모두 닫음
+
+        Returns:
+            BeautifulSoup: 완성된 트리
+        """
+        text = self._decoder.decode(b'', final=True)
+        if text:
+            self._parser.feed(text)
+        self._parser.close()
+        soup = self.soup
+        soup.endData()
+        while soup.currentTag is not None and soup.currentTag.name != soup.ROOT_TAG_NAME:
+            soup.popTag()
+        return soup
+
+
+def parse_response(response, encoding='utf-8', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    응답 본문을 받는 대로 파싱 (stream=True로 요청한 응답, 이미 받은 응답도 가능)
+
+    Args:
+        response (requests.Response): 응답
+        encoding (str): 본문 인코딩 (사이트가 헤더에 charset을 주지 않아서 기본 utf-8)
+        chunk_size (int): 소켓에서 한 번에 읽을 바이트 수
+
+    Returns:
+        tuple: (BeautifulSoup, 본문 바이트 수 (압축 해제 후))
+    """
+    parser = IncrementalSoup(encoding)
+    for chunk in response.iter_content(chunk_size):
+        parser.feed(chunk)
+    return parser.close(), parser.bytes_read
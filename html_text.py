@@ -0,0 +1,87 @@
+"""
+본문 HTML -> 텍스트 변환
+본문 요소를 한 번만 순회하면서 <br>과 블록 요소(p, div, li 등) 경계를 줄바꿈으로 내보냄
+트리를 수정하지 않으므로 (br.replace_with 불필요) 같은 soup을 다시 써도 되고 복사본도 필요 없음
+
+- <br>: 항상 줄바꿈 하나 (<br><br>은 빈 줄)
+- 블록 요소: 시작과 끝에서 줄바꿈 (이미 줄 처음이면 생략)
+- 인라인 요소(b, span, a 등): 경계 없이 이어 붙임
+- script/style/주석 등 텍스트가 아닌 노드는 건너뜀
+
+이전 추출 방식과 달라진 출력 (저장되는 주석 text가 바뀜)
+- advanced/excel_hochma/hochma_parser: get_text(strip=True)는 문자열 조각의 앞뒤 공백을 지우고
+  구분자 없이 이어 붙였지만, 이제 <br>과 블록 경계에 줄바꿈이 들어가고 조각 사이 공백도 남음
+  (절 주석 최소 길이 검사도 바뀐 텍스트 기준)
+- line_based_parser: 예전 텍스트에는 줄바꿈이 없어 한 줄로 처리됐지만 이제 <br>/블록 단위 줄로 나뉨
+- flexible_hochma_parser: 인라인 태그(b, span 등) 경계에서 더 이상 줄을 나누지 않음
+- bulk/complete/excel_only/corrected/complete_hochma_bulk: <br>은 전과 같이 줄바꿈이고
+  블록 경계에 줄바꿈이 추가됨 (이미 줄 처음이면 추가하지 않음)
+
+사용법
+    text = html_to_text(content_element)     # 줄 구조가 살아 있는 원문 텍스트
+    lines = html_to_lines(content_element)   # 앞뒤 공백을 지운 비어 있지 않은 줄 목록
+"""
+
+from bs4.element import CData, NavigableString
+
+BLOCK_TAGS = frozenset([
+    'address', 'article', 'aside', 'blockquote', 'center', 'dd', 'details', 'dialog', 'div', 'dl', 'dt',
+    'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+    'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'summary', 'table', 'tbody', 'td', 'tfoot',
+    'th', 'thead', 'tr', 'ul',
+])
+SKIP_TAGS = frozenset(['script', 'style', 'template', 'noscript', 'head', 'title'])
+
+# 텍스트로 내보낼 문자열 노드 (Comment, Doctype 등 다른 NavigableString 하위 클래스는 제외)
+_TEXT_TYPES = (NavigableString, CData)
+
+# 블록 요소 끝 표시
+_BLOCK_END = object()
+
+
+def _newline(parts):
+    if parts and not parts[-1].endswith('\n'):
+        parts.append('\n')
+
+
+def html_to_text(element, skip_tags=SKIP_TAGS):
+    """
+    요소의 텍스트를 줄 구조를 살려 추출 (트리를 수정하지 않음)
+
+    Args:
+        element: BeautifulSoup Tag
+        skip_tags (frozenset): 하위 내용까지 건너뛸 태그 이름
+
+    Returns:
+        str: <br>과 블록 경계가 줄바꿈으로 들어간 텍스트
+    """
+    parts = []
+    stack = list(reversed(element.contents))
+    while stack:
+        node = stack.pop()
+        if node is _BLOCK_END:
+            _newline(parts)
+            continue
+        if isinstance(node, NavigableString):
+            if type(node) in _TEXT_TYPES:
+                parts.append(node)
+            continue
+        name = node.name
+        if name == 'br':
+            parts.append('\n')
+        elif name not in skip_tags:
+            if name in BLOCK_TAGS:
+                _newline(parts)
+                stack.append(_BLOCK_END)
+            stack.extend(reversed(node.contents))
+    return ''.join(parts)
+
+
+def html_to_lines(element):
+    """
+    요소의 텍스트를 줄 단위로 추출 (앞뒤 공백 제거, 빈 줄 제외)
+
+    Returns:
+        list: 줄 문자열 목록
+    """
+    return [line for line in (line.strip() for line in html_to_text(element).split('\n')) if line]
@@ -0,0 +1,416 @@
+"""
+공유 HTTP 클라이언트
+모든 수집 도구가 같은 설정의 requests.Session을 쓰도록 하는 팩토리
+
+- keep-alive: 세션의 연결 풀이 호스트별 TCP/TLS 연결을 재사용해서
+  게시글마다 새로 핸드셰이크하지 않음 (bare requests.get은 매번 새 연결)
+- 연결 풀 크기: 기본 어댑터(10)보다 크게 잡아 동시 요청이 풀 대기로 막히지 않게 함
+- Accept-Encoding: urllib3가 해제할 수 있는 압축 형식 전부
+  (gzip/deflate, brotli 패키지가 있으면 br, zstandard가 있으면 zstd)
+- 기본 타임아웃: (연결, 읽기) 초, 요청에서 timeout을 주면 그 값을 사용
+- 재시도: 연결/읽기 오류와 429/5xx 응답만 지수 백오프 + jitter로 재시도
+  (404 등 4xx와 파싱 실패는 재시도하지 않음, Retry-After 헤더가 있으면 따름)
+  재시도 후에도 5xx면 마지막 응답을 그대로 돌려주고 연결 오류면 예외 발생
+- 헤징 (선택, HedgePolicy): GET이 관측된 p95보다 오래 걸리면 같은 요청을 한 번 더 보내
+  먼저 끝난 응답을 쓰고 나머지는 본문을 더 받지 않고 닫음 (RateBudget을 원 요청과 함께 사용)
+  진 요청이 본문을 받는 중이면 다음 조각을 읽기 전에 멈추고 연결을 닫음
+- 연결 설정 시간: 세션의 urllib3 연결이 새 연결을 열 때 DNS 조회 + TCP 연결과 TLS 핸드셰이크
+  시간을 재서 connection_setup_timing() 블록에 모음 (재사용된 연결은 0)
+
+사용법
+    session = create_session()            # 클래스별 전용 세션
+    response = http_client.get(url)       # 프로세스 공유 세션 (스크립트용)
+"""
+
+import functools
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+# (연결, 읽기) 타임아웃 (초)
+DEFAULT_TIMEOUT = (5, 15)
+
+# 호스트별로 유지할 연결 풀 수 / 풀당 최대 연결 수
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 32
+
+# 재시도 횟수 / 백오프 기준 (초, 0.5 -> 1 -> 2 ... 범위 안에서 무작위) / 백오프 상한
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5
+RETRY_BACKOFF_MAX = 30
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# 헤지 요청이 본문을 읽는 단위 (바이트, 조각 사이마다 취소 여부 확인)
+HEDGE_CHUNK_SIZE = 16 * 1024
+
+_shared_session = None
+_shared_lock = threading.Lock()
+
+# 스레드별 연결 설정 시간 수집 대상 (connection_setup_timing 블록 안에서만 설정됨)
+_setup_timing = threading.local()
+
+
+@contextmanager
+def connection_setup_timing():
+    """
+    블록 안에서 이 스레드가 새로 연 연결의 설정 시간을 모음
+    (헤징 요청처럼 다른 스레드에서 연 연결은 포함되지 않음)
+
+    Yields:
+        dict: {'connect': DNS 조회 + TCP 연결 초, 'tls': TLS 핸드셰이크 초, 'connections': 새 연결 수}
+    """
+    previous = getattr(_setup_timing, 'current', None)
+    current = _setup_timing.current = {'connect': 0.0, 'tls': 0.0, 'connections': 0}
+    try:
+        yield current
+    finally:
+        _setup_timing.current = previous
+
+
+def _record_setup(key, duration):
+    current = getattr(_setup_timing, 'current', None)
+    if current is not None:
+        current[key] += duration
+
+
+class _TimedConnectionMixin:
+    """새 소켓 연결(DNS 조회 + TCP 연결) 시간을 재는 urllib3 연결"""
+
+    _connect_time = 0.0
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            self._connect_time = time.perf_counter() - start
+            _record_setup('connect', self._connect_time)
+            _record_setup('connections', 1)
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    """TLS 핸드셰이크 시간은 connect() 전체에서 소켓 연결 시간을 뺀 값"""
+
+    def connect(self):
+        self._connect_time = 0.0
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_setup('tls', max(0.0, time.perf_counter() - start - self._connect_time))
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """연결 설정 시간을 재는 연결 풀을 쓰는 어댑터"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+
+class JitterRetry(Retry):
+    """지수 백오프 시간에 full jitter를 적용한 재시도 정책 (동시 재시도가 한꺼번에 몰리지 않게 함)"""
+
+    def get_backoff_time(self):
+        backoff = min(RETRY_BACKOFF_MAX, super().get_backoff_time())
+        return random.uniform(0, backoff) if backoff > 0 else 0
+
+
+def retry_policy(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF):
+    """
+    GET/HEAD 요청 재시도 정책 (연결/읽기 오류, RETRY_STATUSES 응답)
+
+    Returns:
+        JitterRetry: HTTPAdapter(max_retries=...)에 넣을 정책
+    """
+    return JitterRetry(
+        total=total,
+        connect=total,
+        read=total,
+        status=total,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        status_forcelist=RETRY_STATUSES,
+        backoff_factor=backoff_factor,
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+
+
+def percentile(values, percent):
+    """최근접 순위 백분위수 (값이 없으면 None)"""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(0, min(len(values) - 1, int(round(percent / 100 * len(values))) - 1))]
+
+
+class RateBudget:
+    def __init__(self, rate, burst=None):
+        """
+        요청 속도 예산 (토큰 버킷)
+
+        Args:
+            rate (float): 초당 요청 수
+            burst (float): 최대 적립 토큰 수 (기본: max(1, rate))
+        """
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        """토큰이 있으면 하나 쓰고 True (기다리지 않음)"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self):
+        """토큰이 생길 때까지 기다렸다가 하나 사용"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+
+
+class HedgePolicy:
+    def __init__(self, budget=None, percent=95, min_samples=20, min_delay=0.05, window=500):
+        """
+        헤지 요청 정책
+        원 요청이 최근 원 요청 지연의 percent 백분위수를 넘기면 같은 요청을 한 번 더 보냄
+        원 요청은 budget.acquire()로 기다리고, 헤지 요청은 토큰이 남을 때만 보냄
+
+        Args:
+            budget (RateBudget): 원 요청과 헤지 요청이 함께 쓰는 속도 예산 (None이면 제한 없음)
+            percent (float): 헤지 기준 백분위수
+            min_samples (int): 이만큼 관측하기 전에는 헤지하지 않음
+            min_delay (float): 헤지 대기 시간 하한 (초)
+            window (int): 기준 계산에 쓰는 최근 원 요청 수
+        """
+        self.budget = budget
+        self.percent = percent
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+        # 보고용: 실제 응답 지연 / 원 요청 지연 (헤징이 없었을 때의 지연, 진 요청은 취소될 때까지의 하한)
+        self.latencies = []
+        self.primary_latencies = []
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.skipped = 0
+
+    def delay(self):
+        """헤지 요청을 보내기까지 기다릴 시간 (초, 표본이 부족하면 None)"""
+        with self._lock:
+            if len(self._recent) < self.min_samples:
+                return None
+            threshold = percentile(self._recent, self.percent)
+        return max(self.min_delay, threshold)
+
+    def _observe_primary(self, duration, finished=True):
+        """
+        원 요청 지연 기록
+        진 요청(finished=False)은 실제 지연의 하한만 알 수 있으므로 보고용 지연에만 넣고
+        헤지 기준을 계산하는 최근 지연에는 넣지 않음
+        """
+        with self._lock:
+            if finished:
+                self._recent.append(duration)
+            self.primary_latencies.append(duration)
+
+    def _launch(self, send, cancelled, primary):
+        """요청 하나를 데몬 스레드에서 실행 (본문까지 받은 Response, 진 요청이면 None)"""
+        future = Future()
+        start = time.perf_counter()
+
+        def run():
+            try:
+                response = send()
+                chunks = []
+                # 조각마다 취소 여부를 확인해서 다른 요청이 이기면 본문을 더 받지 않고 연결을 닫음
+                for chunk in response.iter_content(HEDGE_CHUNK_SIZE):
+                    if cancelled.is_set():
+                        break
+                    chunks.append(chunk)
+                if cancelled.is_set():
+                    response.close()
+                    result = None
+                else:
+                    # response.content와 같은 상태로 채워 둠 (스트림은 이미 다 읽음)
+                    response._content = b''.join(chunks)
+                    response._content_consumed = True
+                    result = response
+                if primary:
+                    self._observe_primary(time.perf_counter() - start, finished=result is not None)
+                future.set_result(result)
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name='hedged-request', daemon=True).start()
+        return future
+
+    def execute(self, send):
+        """
+        send()로 요청하고, 헤지 기준 시간 안에 끝나지 않으면 send()를 한 번 더 호출해서 먼저 끝난 응답 반환
+        (한쪽이 실패하면 다른 쪽을 기다리고, 둘 다 실패하면 원 요청의 예외 발생)
+
+        Args:
+            send: 호출할 때마다 새 요청을 보내 stream=True Response를 돌려주는 함수
+
+        Returns:
+            requests.Response: 본문까지 받은 응답
+        """
+        if self.budget:
+            self.budget.acquire()
+        start = time.perf_counter()
+        cancelled = threading.Event()
+        primary = self._launch(send, cancelled, primary=True)
+        futures = [primary]
+
+        done, _ = wait(futures, timeout=self.delay())
+        if not done:
+            if self.budget is None or self.budget.try_acquire():
+                futures.append(self._launch(send, cancelled, primary=False))
+                with self._lock:
+                    self.hedged += 1
+            else:
+                with self._lock:
+                    self.skipped += 1
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    cancelled.set()
+                    with self._lock:
+                        self.requests += 1
+                        self.latencies.append(time.perf_counter() - start)
+                        if future is not primary:
+                            self.hedge_wins += 1
+                    return future.result()
+        raise primary.exception() or futures[-1].exception()
+
+    def report(self):
+        """
+        헤징 결과 요약
+
+        Returns:
+            dict: 요청/헤지/헤지 승리/예산 부족으로 건너뛴 수와
+                  실제 응답 지연, 원 요청 지연(헤징이 없었을 때)의 p50/p95/p99 (초)
+        """
+        with self._lock:
+            latencies = list(self.latencies)
+            primary_latencies = list(self.primary_latencies)
+            summary = {'requests': self.requests, 'hedged': self.hedged,
+                       'hedge_wins': self.hedge_wins, 'skipped': self.skipped}
+        for percent in (50, 95, 99):
+            summary[f'p{percent}'] = percentile(latencies, percent)
+            summary[f'unhedged_p{percent}'] = percentile(primary_latencies, percent)
+        return summary
+
+
+class ClientSession(requests.Session):
+    def __init__(self, timeout=DEFAULT_TIMEOUT, hedge=None):
+        """
+        timeout을 지정하지 않은 요청에 기본 타임아웃을 적용하는 세션
+        hedge(HedgePolicy)가 있으면 stream이 아닌 GET 요청을 헤징
+        """
+        super().__init__()
+        self.timeout = timeout
+        self.hedge = hedge
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        if self.hedge is not None and method.upper() == 'GET' and not kwargs.get('stream'):
+            kwargs['stream'] = True
+            return self.hedge.execute(functools.partial(super().request, method, url, **kwargs))
+        return super().request(method, url, **kwargs)
+
+
+def create_session(headers=None, pool_maxsize=POOL_MAXSIZE, timeout=DEFAULT_TIMEOUT, retries=RETRY_TOTAL,
+                   hedge=None):
+    """
+    keep-alive 연결 풀과 압축 응답, 재시도 정책을 쓰는 세션 생성
+
+    Args:
+        headers (dict): 기본 헤더에 덧붙일 헤더 (User-Agent 덮어쓰기 등)
+        pool_maxsize (int): 호스트당 최대 연결 수 (동시 요청 수 이상으로)
+        timeout: 기본 타임아웃 (초 또는 (연결, 읽기) 튜플)
+        retries (int): 재시도 횟수 (0이면 재시도 안 함)
+        hedge (HedgePolicy): 헤지 요청 정책 (None이면 헤징 안 함)
+
+    Returns:
+        ClientSession: 설정된 세션
+    """
+    session = ClientSession(timeout, hedge)
+    adapter = TimedHTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=pool_maxsize,
+                               max_retries=retry_policy(retries) if retries else 0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'Connection': 'keep-alive',
+    })
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def get_session():
+    """프로세스 공유 세션 (처음 호출할 때 생성)"""
+    global _shared_session
+    if _shared_session is None:
+        with _shared_lock:
+            if _shared_session is None:
+                _shared_session = create_session()
+    return _shared_session
+
+
+def get(url, **kwargs):
+    """공유 세션으로 GET 요청 (requests.get 대체)"""
+    return get_session().get(url, **kwargs)
@@ -2,6 +2,7 @@
 import pandas as pd
 import sqlite3
 import os
+import commentary_db
 
 # Define file paths
 excel_path = r"C:\Users\basar\Documents\Bible project\paser-app\hochma_db_final_corrected.xlsx"
@@ -30,36 +31,28 @@ except Exception as e:
 # 3. Insert data into the database
 try:
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
 
-    # Create the 'commentaries' table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS commentaries (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        book TEXT NOT NULL,
-        chapter INTEGER NOT NULL,
-        verse INTEGER NOT NULL,
-        commentary TEXT NOT NULL,
-        UNIQUE(book, chapter, verse, commentary)
-    )
-    """)
-    print(''''commentaries' table created or already exists.''')
+    # Create or migrate the 'commentaries' table (unified schema)
+    commentary_db.ensure_commentaries_schema(conn)
+    print("'commentaries' table created or already exists.")
+    dedup = commentary_db.content_dedup_enabled(conn)
 
     # Insert data into the table
+    # Rows already imported (same commentary, verse and text) are skipped, so re-running is idempotent
+    inserted = 0
     for index, row in df.iterrows():
         try:
-            # Combine '주석서' (index 1) and '주석_내용' (index 6) into the 'commentary' column
-            combined_commentary = f"{row.iloc[1]}: {row.iloc[6]}"
-            cursor.execute("""
-            INSERT OR REPLACE INTO commentaries (book, chapter, verse, commentary)
-            VALUES (?, ?, ?, ?)
-            """, (row.iloc[2], row.iloc[4], row.iloc[5], combined_commentary))
+            # '주석서' (index 1) is the commentary name, '주석_내용' (index 6) the text
+            if commentary_db.insert_commentary_once(conn, row.iloc[1], row.iloc[2], row.iloc[4], row.iloc[5],
+                                                    row.iloc[6], dedup):
+                inserted += 1
         except Exception as e:
             print(f"Could not insert row {index}: {e}")
 
     conn.commit()
     conn.close()
-    print("Successfully inserted commentaries into the database.")
+    print(f"Successfully inserted {inserted} commentaries into the database "
+          f"({len(df) - inserted} already present or skipped).")
 
 except Exception as e:
     print(f"Error inserting data into database: {e}")
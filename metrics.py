@@ -0,0 +1,240 @@
+"""
+Prometheus 텍스트 형식 메트릭
+장시간 크롤링 중 요청 수, 응답 바이트, 오류 사유별 건수, 대기열 길이, DB 커밋 지연,
+단계별 소요 시간을 카운터/게이지/히스토그램으로 모아서
+로컬 HTTP 엔드포인트(/metrics)로 노출 (Prometheus나 curl 반복 조회로 수집)
+"""
+
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from commentary_db import failure_kind
+from stage_timing import DEFAULT_BUCKETS
+
+DEFAULT_PORT = 9464
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    metric_type = None
+
+    def __init__(self, name, help_text, labelnames=(), lock=None):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = lock or threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 레이블 {self.labelnames}가 필요합니다 (받은 값: {tuple(labels)})")
+        return tuple(labels[name] for name in self.labelnames)
+
+    def _header(self):
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+
+
+class Counter(_Metric):
+    metric_type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    metric_type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    metric_type = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS, lock=None):
+        super().__init__(name, help_text, labelnames, lock)
+        self.buckets = tuple(buckets) if buckets[-1] == math.inf else tuple(buckets) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """메트릭 모음 (이름당 하나, 같은 이름으로 다시 요청하면 기존 메트릭 반환)"""
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_class, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets)
+
+    def render(self):
+        """Prometheus 텍스트 노출 형식 (0.0.4)"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+def start_metrics_server(registry, port=DEFAULT_PORT, host='127.0.0.1'):
+    """
+    /metrics 엔드포인트를 백그라운드 스레드에서 실행
+
+    Returns:
+        ThreadingHTTPServer: 실행 중인 서버 (shutdown()으로 종료)
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+    thread.start()
+    print(f"메트릭 엔드포인트: http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+
+class CrawlMetrics:
+    def __init__(self, registry=None):
+        """
+        크롤링 파이프라인 메트릭 (가져오기, 파싱, 저장 단계에서 갱신)
+
+        Args:
+            registry (MetricsRegistry): 메트릭을 등록할 레지스트리 (None이면 새로 만듦)
+        """
+        self.registry = registry or MetricsRegistry()
+        self.requests = self.registry.counter(
+            'hochma_requests_total', 'HTTP requests by status code', ('status',))
+        self.response_bytes = self.registry.counter(
+            'hochma_response_bytes_total', 'Downloaded response body bytes')
+        self.articles = self.registry.counter(
+            'hochma_articles_total', 'Processed articles by result', ('result',))
+        self.errors = self.registry.counter(
+            'hochma_errors_total', 'Article failures by reason', ('reason',))
+        self.verses = self.registry.counter(
+            'hochma_verses_total', 'Parsed verses')
+        self.queue_depth = self.registry.gauge(
+            'hochma_queue_depth', 'Articles waiting to be processed', ('queue',))
+        self.db_commit_seconds = self.registry.histogram(
+            'hochma_db_commit_seconds', 'Database commit latency')
+        self.stage_seconds = self.registry.histogram(
+            'hochma_stage_seconds', 'Time spent per pipeline stage', ('stage',))
+
+    def observe_response(self, response, size=None):
+        """응답 수와 본문 크기 집계 (stream=True로 이미 읽은 응답은 size로 바이트 수를 넘김)"""
+        self.requests.inc(status=str(response.status_code))
+        self.response_bytes.inc(len(response.content) if size is None else size)
+
+    def article_succeeded(self, verse_count):
+        self.articles.inc(result='success')
+        self.verses.inc(verse_count)
+
+    def article_failed(self, error):
+        """
+        실패 사유를 HTTP 상태 / 알려진 파싱 실패 / network / db / exception으로 나눠 집계
+        (분류는 dead-letter 테이블과 같은 commentary_db.failure_kind)
+        """
+        kind = failure_kind(error)
+        # HTTP 상태와 파싱 실패 메시지는 종류가 적으므로 메시지를 그대로 레이블로 사용
+        reason = error if kind in ('http', 'parse') else kind
+        self.articles.inc(result='failed')
+        self.errors.inc(reason=reason)
+
+    def record(self, event):
+        """StageTimer 싱크 (단계별 소요 시간 히스토그램)"""
+        self.stage_seconds.observe(event['duration'], stage=event['stage'])
+
+    def close(self):
+        pass
+
+    def time_commit(self, conn):
+        """conn.commit() 지연 측정"""
+        start = time.perf_counter()
+        conn.commit()
+        self.db_commit_seconds.observe(time.perf_counter() - start)
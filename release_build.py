@@ -0,0 +1,306 @@
+"""
+배포용 bible_database.db 빌드
+앱(src/main/index.ts)은 패키지의 bible_database.db를 읽기 위주로 쓰므로
+원본 DB는 그대로 두고 복사본에서 다음을 수행한 뒤 새 파일로 VACUUM INTO
+- 중복 행 제거 (중복 제거/압축 저장 모드의 주석 본문은 앱이 읽는 text 컬럼으로 복원)
+- 행을 verse_ordinal 순서로 재배치 (장 하나가 연속된 페이지에 모임)
+- 앱과 commentary_reader가 쓰는 인덱스만 생성
+- ANALYZE
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+import bible_reference
+import commentary_db
+
+RELEASE_PAGE_SIZE = 8192
+
+# 테이블별 (중복 판정 키, 정렬 순서, 남길 인덱스)
+# verses: 앱은 번역본 하나의 장을 읽으므로 번역본별로 모아서 서수 순 배치
+RELEASE_TABLES = {
+    'verses': (
+        ('version', 'book_name', 'chapter', 'verse'),
+        'version, verse_ordinal IS NULL, verse_ordinal',
+        {
+            'idx_verses_book_chapter_version': 'book_name, chapter, version, verse',
+            'idx_verses_version_ordinal': 'version, verse_ordinal',
+        },
+    ),
+    'commentaries': (
+        ('commentary_name', 'book_name', 'chapter', 'verse', 'text'),
+        'verse_ordinal IS NULL, verse_ordinal, commentary_name',
+        {
+            'idx_commentaries_book_chapter_verse': 'book_name, chapter, verse',
+            'idx_commentaries_verse_ordinal': 'verse_ordinal, commentary_name',
+        },
+    ),
+}
+
+# 배포 DB에서 필요 없는 중복 제거/압축 저장 모드 객체와 수집용 테이블
+STORAGE_OBJECTS = (
+    ('view', 'commentary_contents_plain'),
+    ('table', 'commentary_contents'),
+    ('table', 'commentary_dictionaries'),
+    ('table', 'failed_articles'),
+)
+
+
+def _rowid_column(conn, table):
+    """INTEGER PRIMARY KEY 컬럼 이름 (없으면 None)"""
+    for _, name, col_type, _, _, pk in conn.execute(f"PRAGMA table_info({table})"):
+        if pk == 1 and col_type.upper() == 'INTEGER':
+            return name
+    return None
+
+
+def _drop_triggers(conn, table):
+    """테이블 트리거를 삭제하고 FTS/commentary_db 관리 대상이 아닌 트리거 SQL 반환"""
+    managed = ('commentaries_fts_', 'verses_fts_', 'commentary_contents_fts_',
+               'commentary_changes_', 'commentary_stats_')
+    rows = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?", (table,)
+    ).fetchall()
+    kept = []
+    for name, sql in rows:
+        conn.execute(f"DROP TRIGGER {name}")
+        if not name.startswith(managed):
+            kept.append(sql)
+    return kept
+
+
+def _reorder_table(conn, table):
+    """
+    중복 행을 제거하고 정렬 순서대로 다시 삽입 (rowid를 1부터 새로 매김)
+
+    Returns:
+        tuple: (원래 행 수, 남은 행 수)
+    """
+    keys, order_by, _ = RELEASE_TABLES[table]
+    if 'verse_ordinal' not in commentary_db.table_columns(conn, table):
+        commentary_db.ensure_verse_ordinal(conn, table)
+    commentary_db.backfill_verse_ordinals(conn, table)
+
+    rowid_column = _rowid_column(conn, table)
+    columns = [c for c in commentary_db.table_columns(conn, table) if c != rowid_column]
+    column_list = ', '.join(columns)
+    source = f"SELECT rowid AS release_rowid, * FROM {table}"
+    if table == 'commentaries' and commentary_db.content_dedup_enabled(conn):
+        # 앱은 commentaries.text를 직접 읽으므로 공유 본문을 행으로 복원
+        source = commentary_db.commentary_select(conn).replace("SELECT ", "SELECT c.rowid AS release_rowid, ", 1)
+        columns = ['NULL' if c == 'content_id' else c for c in columns]
+
+    before = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    conn.execute("DROP TABLE IF EXISTS temp.release_rows")
+    conn.execute(f"""
+        CREATE TEMP TABLE release_rows AS
+        SELECT {', '.join(columns)} FROM (
+            SELECT s.*, ROW_NUMBER() OVER (
+                PARTITION BY {', '.join(keys)} ORDER BY release_rowid
+            ) AS duplicate_rank
+            FROM ({source}) s
+        )
+        WHERE duplicate_rank = 1
+        ORDER BY {order_by}
+    """)
+    conn.execute(f"DELETE FROM {table}")
+    if commentary_db.has_table(conn, 'sqlite_sequence'):
+        conn.execute("DELETE FROM sqlite_sequence WHERE name = ?", (table,))
+    conn.execute(f"INSERT INTO {table} ({column_list}) SELECT * FROM temp.release_rows ORDER BY rowid")
+    conn.execute("DROP TABLE temp.release_rows")
+    after = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    return before, after
+
+
+def _rebuild_indexes(conn, table):
+    """앱과 리더가 쓰는 인덱스만 남김"""
+    _, _, indexes = RELEASE_TABLES[table]
+    existing = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,)
+    ).fetchall()
+    for (name,) in existing:
+        if name not in indexes:
+            conn.execute(f"DROP INDEX {name}")
+    for name, index_columns in indexes.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({index_columns})")
+
+
+def prepare_release(conn, fts=False):
+    """
+    작업용 DB 복사본을 배포용으로 정리 (중복 제거, 서수 순 재배치, 인덱스, ANALYZE)
+
+    Args:
+        fts (bool): FTS5 전문 검색 인덱스도 포함할지 여부 (앱은 LIKE 검색만 사용)
+
+    Returns:
+        dict: 테이블별 (원래 행 수, 남은 행 수)
+    """
+    commentary_db.register_functions(conn)
+    for table in ('commentaries', 'commentary_contents', 'verses'):
+        commentary_db._drop_fts(conn, table)
+
+    result = {}
+    for table in RELEASE_TABLES:
+        if not commentary_db.table_columns(conn, table):
+            continue
+        kept_triggers = _drop_triggers(conn, table)
+        result[table] = _reorder_table(conn, table)
+        _rebuild_indexes(conn, table)
+        for sql in kept_triggers:
+            conn.execute(sql)
+        conn.commit()
+
+    if 'commentaries' in result:
+        for object_type, name in STORAGE_OBJECTS:
+            conn.execute(f"DROP {object_type.upper()} IF EXISTS {name}")
+        commentary_db.ensure_change_log(conn)
+        conn.execute("DELETE FROM commentary_changes")
+        commentary_db.ensure_stats(conn)
+        commentary_db.rebuild_stats(conn)
+
+    if fts:
+        for table in result:
+            commentary_db.ensure_fts(conn, table)
+
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.commit()
+    return result
+
+
+def _sample_chapters(count=50):
+    """전체 성경에 고르게 퍼진 (성경책, 장) 표본"""
+    chapters = [(book, chapter) for book in bible_reference.BOOK_NAMES
+                for chapter in range(1, bible_reference.chapter_count(book) + 1)]
+    step = max(1, len(chapters) // count)
+    return chapters[::step][:count]
+
+
+def measure_database(db_path, chapters=None, rounds=3):
+    """
+    앱이 쓰는 조회로 DB 크기와 조회 지연 측정
+
+    Returns:
+        dict: 파일 크기, 첫 조회(연결 + 성경책 목록) 시간, 장 조회 평균 시간 (ms)
+    """
+    chapters = chapters or _sample_chapters()
+    start = time.perf_counter()
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    has_verses = bool(commentary_db.table_columns(conn, 'verses'))
+    has_commentaries = bool(commentary_db.table_columns(conn, 'commentaries'))
+    if has_verses:
+        # get-bible-books
+        conn.execute("""
+            SELECT book_name, book_code, MAX(chapter) FROM verses
+            WHERE book_code > 0 GROUP BY book_name, book_code ORDER BY CAST(book_code AS INTEGER)
+        """).fetchall()
+    cold_start = (time.perf_counter() - start) * 1000
+
+    version = None
+    if has_verses:
+        row = conn.execute("SELECT version FROM verses LIMIT 1").fetchone()
+        version = row[0] if row else None
+
+    queries = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for book, chapter in chapters:
+            if has_verses:
+                # get-bible-verses
+                conn.execute(
+                    "SELECT * FROM verses WHERE book_name = ? AND chapter = ? AND version = ? ORDER BY verse",
+                    (book, chapter, version)
+                ).fetchall()
+                queries += 1
+            if has_commentaries:
+                # get-commentaries
+                conn.execute(
+                    "SELECT * FROM commentaries WHERE book_name = ? AND chapter = ? ORDER BY verse",
+                    (book, chapter)
+                ).fetchall()
+                queries += 1
+    elapsed = (time.perf_counter() - start) * 1000
+    conn.close()
+    return {
+        'size': os.path.getsize(db_path),
+        'cold_start_ms': cold_start,
+        'chapter_ms': elapsed / queries if queries else 0.0,
+    }
+
+
+def _remove(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def build_release(db_path='bible_database.db', output='release/bible_database.db',
+                  page_size=RELEASE_PAGE_SIZE, fts=False):
+    """
+    배포용 DB 빌드 (원본은 수정하지 않음)
+
+    Args:
+        db_path (str): 원본 DB 경로
+        output (str): 배포용 DB 경로
+        page_size (int): 배포용 DB 페이지 크기
+        fts (bool): FTS5 전문 검색 인덱스 포함 여부
+
+    Returns:
+        dict: 테이블별 행 수와 빌드 전후 측정값
+    """
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    work_path = output + '.work'
+    temp_path = output + '.tmp'
+    _remove(work_path)
+    _remove(temp_path)
+
+    before = measure_database(db_path)
+    source = sqlite3.connect(db_path)
+    try:
+        source.execute("VACUUM INTO ?", (work_path,))
+    finally:
+        source.close()
+
+    conn = sqlite3.connect(work_path)
+    try:
+        tables = prepare_release(conn, fts)
+        conn.execute(f"PRAGMA page_size = {int(page_size)}")
+        conn.execute("VACUUM INTO ?", (temp_path,))
+    finally:
+        conn.close()
+        _remove(work_path)
+    os.replace(temp_path, output)
+
+    after = measure_database(output)
+    return {'tables': tables, 'before': before, 'after': after}
+
+
+def _delta(before, after):
+    if not before:
+        return ''
+    return f" ({(after - before) / before * 100:+.1f}%)"
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    db_path = args[0] if args else 'bible_database.db'
+    output = args[1] if len(args) > 1 else os.path.join('release', 'bible_database.db')
+    fts = '--fts' in sys.argv
+
+    print(f"배포용 DB 빌드: {db_path} -> {output}")
+    start = time.time()
+    result = build_release(db_path, output, fts=fts)
+    for table, (rows_before, rows_after) in result['tables'].items():
+        print(f"  {table}: {rows_before:,}개 행 -> {rows_after:,}개 행 (중복 {rows_before - rows_after:,}개 제거)")
+
+    before, after = result['before'], result['after']
+    print(f"  크기: {before['size'] / 1024 / 1024:.1f}MB -> {after['size'] / 1024 / 1024:.1f}MB"
+          f"{_delta(before['size'], after['size'])}")
+    print(f"  첫 조회: {before['cold_start_ms']:.1f}ms -> {after['cold_start_ms']:.1f}ms"
+          f"{_delta(before['cold_start_ms'], after['cold_start_ms'])}")
+    print(f"  장 조회: {before['chapter_ms']:.3f}ms -> {after['chapter_ms']:.3f}ms"
+          f"{_delta(before['chapter_ms'], after['chapter_ms'])}")
+    print(f"완료 ({time.time() - start:.1f}초)")
@@ -0,0 +1,193 @@
+"""
+크롤링 파이프라인 단계별 시간 측정
+게시글마다 단계(연결 설정, 응답 헤더 대기, 본문 다운로드, HTML 파싱, 절 분할, DB 저장, 엑셀 저장 등)
+구간을 기록해서 싱크로 보내고, 실행이 끝나면 전체 경과 시간이 어느 단계에 쓰였는지 요약함
+
+싱크는 record(event) / close() 메서드를 가진 객체
+event: {'article_id': 게시글 번호 또는 None, 'stage': 단계 이름,
+        'start': 시작 시각(epoch 초), 'duration': 소요 시간(초)}
+"""
+
+import json
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from http_client import connection_setup_timing
+
+# 히스토그램 버킷 상한 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+
+class JsonLinesSink:
+    def __init__(self, path):
+        """
+        구간마다 한 줄씩 JSON으로 기록하는 싱크
+
+        Args:
+            path (str): 출력 파일 경로 (이어서 기록)
+        """
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def record(self, event):
+        self._file.write(json.dumps(event, ensure_ascii=False) + '\n')
+
+    def close(self):
+        """버퍼에 남은 줄을 기록하고 파일을 닫음 (여러 번 호출해도 됨)"""
+        self._file.close()
+
+
+class HistogramSink:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        단계별 소요 시간 히스토그램 (프로세스 안에서 집계, 구간 자체는 보관하지 않음)
+
+        Args:
+            buckets (tuple): 오름차순 버킷 상한 (초, 마지막은 math.inf)
+        """
+        self.buckets = tuple(buckets)
+        self.histograms = {}
+
+    def record(self, event):
+        histogram = self.histograms.get(event['stage'])
+        if histogram is None:
+            histogram = self.histograms[event['stage']] = {
+                'count': 0, 'sum': 0.0, 'buckets': [0] * len(self.buckets),
+            }
+        histogram['count'] += 1
+        histogram['sum'] += event['duration']
+        histogram['buckets'][bisect_left(self.buckets, event['duration'])] += 1
+
+    def percentile(self, stage, percent):
+        """
+        단계 소요 시간 백분위수 (해당 버킷 상한 기준 근사값)
+
+        Returns:
+            float: 초 (기록이 없으면 None)
+        """
+        histogram = self.histograms.get(stage)
+        if not histogram or not histogram['count']:
+            return None
+        target = histogram['count'] * percent / 100
+        seen = 0
+        for bound, count in zip(self.buckets, histogram['buckets']):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.buckets[-1]
+
+    def close(self):
+        pass
+
+
+class StageTimer:
+    def __init__(self, sinks=None):
+        """
+        단계별 구간 측정기
+        단계별 합계는 항상 집계하고 (실행 후 요약용) 각 구간은 sinks로 전달
+
+        Args:
+            sinks (list): 싱크 목록 (JsonLinesSink, HistogramSink 등)
+        """
+        self.sinks = list(sinks or [])
+        self.reset()
+
+    def reset(self):
+        """단계별 합계와 실행 시작 시각 초기화"""
+        self.totals = {}
+        self.started = time.perf_counter()
+
+    def record(self, stage, duration, article_id=None, start=None):
+        """이미 측정된 구간 기록 (예: response.elapsed)"""
+        total = self.totals.get(stage)
+        if total is None:
+            total = self.totals[stage] = [0, 0.0]
+        total[0] += 1
+        total[1] += duration
+        if self.sinks:
+            event = {
+                'article_id': article_id,
+                'stage': stage,
+                'start': start if start is not None else time.time() - duration,
+                'duration': duration,
+            }
+            for sink in self.sinks:
+                sink.record(event)
+
+    @contextmanager
+    def span(self, stage, article_id=None):
+        """with 블록 구간 측정 (예외가 나도 기록)"""
+        start = time.time()
+        perf_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - perf_start, article_id, start)
+
+    def breakdown(self, wall_time=None):
+        """
+        단계별 소요 시간 요약
+
+        Args:
+            wall_time (float): 전체 경과 시간 (None이면 reset 이후 경과 시간)
+
+        Returns:
+            list: (단계, 횟수, 합계 초, 전체 대비 비율) 목록 (합계 내림차순, 측정되지 않은 시간은 'other')
+        """
+        if wall_time is None:
+            wall_time = time.perf_counter() - self.started
+        rows = sorted(((stage, count, total) for stage, (count, total) in self.totals.items()),
+                      key=lambda row: row[2], reverse=True)
+        measured = sum(total for _, _, total in rows)
+        rows.append(('other', 0, max(0.0, wall_time - measured)))
+        return [(stage, count, total, total / wall_time if wall_time else 0.0)
+                for stage, count, total in rows]
+
+    def print_breakdown(self, wall_time=None):
+        """실행 종료 후 단계별 소요 시간 출력"""
+        rows = self.breakdown(wall_time)
+        wall = sum(total for _, _, total, _ in rows)
+        print(f"\nStage breakdown (wall clock {wall:.1f}s)")
+        for stage, count, total, share in rows:
+            average = f"avg {total / count * 1000:8.1f}ms x {count}" if count else ""
+            print(f"  {stage:12} {total:9.2f}s {share * 100:5.1f}%  {average}")
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def timed_get(timer, session, url, article_id=None, **kwargs):
+    """
+    session.get을 연결 설정, 응답 헤더 대기, 본문 다운로드 구간으로 나눠 측정
+    - connect: DNS 조회 + TCP 연결 (새 연결을 열었을 때만 기록, urllib3 연결 훅으로 측정)
+    - tls: TLS 핸드셰이크 (https 새 연결일 때만)
+    - headers: 요청 전송부터 응답 헤더 파싱까지 (response.elapsed에서 연결 설정 시간을 뺀 값)
+    - download: 나머지 (stream=True면 본문은 이후 파싱 단계에서 받으므로 거의 0)
+    헤징된 요청은 다른 스레드에서 연결하므로 연결 설정 시간이 headers에 포함됨
+
+    Returns:
+        requests.Response: 응답
+    """
+    start = time.time()
+    perf_start = time.perf_counter()
+    response = None
+    with connection_setup_timing() as setup:
+        try:
+            response = session.get(url, **kwargs)
+            return response
+        finally:
+            total = time.perf_counter() - perf_start
+            connecting = min(total, setup['connect'] + setup['tls'])
+            if setup['connections']:
+                timer.record('connect', setup['connect'], article_id, start)
+                if setup['tls']:
+                    timer.record('tls', setup['tls'], article_id, start + setup['connect'])
+            elapsed = response.elapsed.total_seconds() if response is not None else total
+            headers = max(0.0, min(total, elapsed) - connecting)
+            timer.record('headers', headers, article_id, start + connecting)
+            if response is not None:
+                timer.record('download', max(0.0, total - connecting - headers), article_id,
+                             start + connecting + headers)
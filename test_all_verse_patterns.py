@@ -1,4 +1,4 @@
-import requests
+import http_client
 from bs4 import BeautifulSoup
 import re
 
@@ -12,7 +12,7 @@ def test_all_verse_patterns():
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
     }
     
-    response = requests.get(url, headers=headers)
+    response = http_client.get(url, headers=headers)
     response.encoding = 'utf-8'
     soup = BeautifulSoup(response.text, 'html.parser')
     
@@ -0,0 +1,85 @@
+"""
+오프라인 단위 테스트 공통 설정
+모듈이 저장소 루트에 평평하게 있으므로 루트를 import 경로에 추가
+(네트워크가 필요한 테스트는 nocr.net 대신 로컬 HTTP 서버 픽스처를 사용)
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """빈 임시 SQLite 데이터베이스 경로"""
+    return str(tmp_path / 'bible_database.db')
+
+
+@pytest.fixture
+def conn(db_path):
+    """임시 데이터베이스 연결 (테스트가 끝나면 닫음)"""
+    connection = sqlite3.connect(db_path)
+    yield connection
+    connection.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.path)
+        route = server.routes.get(self.path)
+        if route is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body, header_delay, chunk_delay, statuses = route
+        time.sleep(header_delay)
+        # 지정한 상태 코드를 요청마다 하나씩 쓰고 다 쓰면 200
+        self.send_response(statuses.pop(0) if statuses else 200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            for offset in range(0, len(body), 4096):
+                self.wfile.write(body[offset:offset + 4096])
+                self.wfile.flush()
+                server.bytes_sent += min(4096, len(body) - offset)
+                time.sleep(chunk_delay)
+        except (BrokenPipeError, ConnectionResetError):
+            server.aborted += 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    """
+    로컬 HTTP/1.1 서버 (keep-alive)
+    server.route(path, body, header_delay=0, chunk_delay=0, statuses=())으로 응답 등록, server.url(path)로 주소 생성
+    (statuses: 앞선 요청들에 차례로 보낼 상태 코드, 예: [503, 503] 뒤에 200)
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.routes = {}
+    server.requests = []
+    server.bytes_sent = 0
+    server.aborted = 0
+    server.route = lambda path, body, header_delay=0, chunk_delay=0, statuses=(): server.routes.__setitem__(
+        path, (body.encode('utf-8') if isinstance(body, str) else body, header_delay, chunk_delay, list(statuses)))
+    server.url = lambda path: f"http://127.0.0.1:{server.server_address[1]}{path}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
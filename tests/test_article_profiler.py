@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from article_profiler import ArticleProfiler, detect_pattern
+from complete_hochma_bulk_parser import CompleteHochmaBulkParser
+
+
+def article_html(chapter=3, verses=30):
+    body = '<br>'.join(f"===={chapter}:{verse} {verse}절 주석 " + '본문 ' * 200 for verse in range(1, verses + 1))
+    return (f"<html><head><title>호크마 주석, 창세기 {chapter}장</title></head><body>"
+            f"<h1>호크마 주석, 창세기 {chapter}장</h1><div class='xe_content'>{body}</div></body></html>")
+
+
+@pytest.fixture
+def local_parser(http_server, db_path):
+    def make(**kwargs):
+        parser = CompleteHochmaBulkParser(db_path, **kwargs)
+        parser.base_url = http_server.url('/com_kor_hochma')
+        return parser
+    return make
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_profiler_tags_without_reading_the_body(http_server, local_parser, stream):
+    html = article_html()
+    http_server.route('/com_kor_hochma/1', html, chunk_delay=0.01)
+    parser = local_parser(stream=stream)
+    original_get = parser.session.get
+    profiler = ArticleProfiler(top_n=5).attach(parser)
+
+    result, error = parser.parse_single_article(1)
+
+    assert error is None and len(list(result['verses'])) == 30
+    # 세션 요청을 가로채지 않음
+    assert parser.session.get == original_get
+    tags = profiler.slowest()[0]['tags']
+    assert tags['article_id'] == 1
+    assert tags['html_size'] == len(html.encode('utf-8'))
+    assert tags['pattern'] == 'equals_4'
+    if stream:
+        # 본문은 증분 파싱 구간에서 받음 (조각마다 10ms 지연)
+        chunks = -(-len(html.encode('utf-8')) // 4096)
+        assert parser.timer.totals['download_parse'][1] >= chunks * 0.01 * 0.8
+
+
+def test_profiler_writes_slowest_articles(tmp_path):
+    profiler = ArticleProfiler(top_n=2)
+    for article_id, content in enumerate(['===1:1 a', '====1:1 b', '1:1절\n c']):
+        profiler.profile(article_id, lambda text: {'content': text}, content)
+
+    index = profiler.write(str(tmp_path))
+
+    assert len(index) == 2
+    saved = json.loads((tmp_path / 'index.json').read_text(encoding='utf-8'))
+    assert saved['articles'] == 3
+    assert {entry['pattern'] for entry in saved['slowest']} <= {'equals_3', 'equals_4', 'line_start'}
+    for entry in index:
+        assert (tmp_path / entry['file']).exists()
+
+
+@pytest.mark.parametrize('text, pattern', [
+    ('====3:1 a ====3:2 b', 'equals_4'),
+    ('===3:1 a ===3:2 b', 'equals_3'),
+    ('서론\n3:1절\n본문\n3:2\n본문', 'line_start'),
+    ('<p>3:1</p>본문<p>3:2절</p>', 'line_start'),
+    ('절 구분 없음', None),
+])
+def test_detect_pattern(text, pattern):
+    assert detect_pattern(text) == pattern
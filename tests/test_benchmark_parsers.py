@@ -0,0 +1,47 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmark_parsers.py')
+
+
+def make_run(commit, articles_per_sec):
+    return {
+        'timestamp': '2026-01-01T00:00:00', 'commit': commit, 'fixtures': [139477],
+        'results': {'bulk': {'articles_per_sec': articles_per_sec, 'p50_ms': 1.0, 'p95_ms': 2.0,
+                             'peak_rss_kb': 1000}},
+    }
+
+
+def compare(tmp_path, runs, *args):
+    os.makedirs(tmp_path / 'benchmarks', exist_ok=True)
+    with open(tmp_path / 'benchmarks' / 'results.jsonl', 'w', encoding='utf-8') as f:
+        for run in runs:
+            f.write(json.dumps(run) + '\n')
+    return subprocess.run([sys.executable, SCRIPT, 'compare', *args], cwd=tmp_path,
+                          capture_output=True, text=True, encoding='utf-8')
+
+
+@pytest.mark.parametrize('args', [(), ('abc1234',)])
+def test_compare_with_single_run_reports_missing_baseline(tmp_path, args):
+    result = compare(tmp_path, [make_run('abc1234', 10.0)], *args)
+    assert result.returncode == 1
+    assert 'Traceback' not in result.stderr
+
+
+def test_compare_against_commit_prefix(tmp_path):
+    runs = [make_run('abc1234', 10.0), make_run('def5678', 5.0), make_run('0123456', 12.0)]
+    result = compare(tmp_path, runs, 'abc')
+    assert result.returncode == 0, result.stderr
+    assert '기준: abc1234' in result.stdout
+    assert '+20.0%' in result.stdout
+
+
+def test_compare_defaults_to_previous_run(tmp_path):
+    result = compare(tmp_path, [make_run('abc1234', 10.0), make_run('def5678', 5.0)])
+    assert result.returncode == 0, result.stderr
+    assert '기준: abc1234' in result.stdout
+    assert '-50.0%' in result.stdout
@@ -0,0 +1,79 @@
+import pytest
+
+import bible_reference
+from bible_reference import (BOOK_NAMES, TOTAL_VERSES, VERSE_COUNTS, chapter_ordinal_range, get_book_code,
+                             ordinal_to_reference, parse_passage, resolve_book_name, verse_count, verse_ordinal)
+
+
+def test_prefix_sums_match_verse_counts():
+    # 누적합 테이블로 계산한 서수가 verse_counts를 순서대로 센 값과 같아야 함
+    ordinal = 0
+    for book_name in BOOK_NAMES:
+        for chapter, count in enumerate(VERSE_COUNTS[book_name], 1):
+            assert verse_count(book_name, chapter) == count
+            for verse in range(1, count + 1):
+                ordinal += 1
+                assert verse_ordinal(book_name, chapter, verse) == ordinal
+                assert ordinal_to_reference(ordinal) == (book_name, chapter, verse)
+    assert ordinal == TOTAL_VERSES
+
+
+def test_ordinal_boundaries():
+    assert verse_ordinal('창세기', 1, 1) == 1
+    assert verse_ordinal('창세기', 2, 1) == 32
+    assert verse_ordinal('요한계시록', 22, 21) == TOTAL_VERSES
+    assert chapter_ordinal_range('창세기', 1) == (1, 31)
+
+
+@pytest.mark.parametrize('book, chapter, verse', [
+    ('창세기', 1, 0),       # 서론(0절)
+    ('창세기', 1, 32),      # 장의 절 수 초과
+    ('창세기', 51, 1),      # 장 수 초과
+    ('없는책', 1, 1),
+    ('창세기', None, 1),
+    ('창세기', 1, 'x'),
+])
+def test_out_of_range_is_none(book, chapter, verse):
+    assert verse_ordinal(book, chapter, verse) is None
+
+
+def test_ordinal_to_reference_out_of_range():
+    assert ordinal_to_reference(0) is None
+    assert ordinal_to_reference(TOTAL_VERSES + 1) is None
+
+
+def test_book_names_and_codes():
+    assert resolve_book_name('창') == '창세기'
+    assert resolve_book_name('요한 1서') == '요한일서'
+    assert resolve_book_name('예레미야 애가') == '예레미야애가'
+    assert resolve_book_name('없는책') is None
+    assert get_book_code('창세기') == 1
+    assert get_book_code('계') == 66
+    assert get_book_code('없는책') == bible_reference.UNKNOWN_BOOK_CODE
+    # 코드(정수/숫자 문자열)로도 조회
+    assert verse_ordinal(1, 1, 1) == verse_ordinal('1', 1, 1) == 1
+
+
+def test_find_book_in_text_prefers_longest_name():
+    assert bible_reference.find_book_in_text('호크마 주석, 예레미야애가 3장') == '예레미야애가'
+    assert bible_reference.find_book_in_text('호크마 주석, 예레미야 3장') == '예레미야'
+    assert bible_reference.find_book_in_text('제목 없음') is None
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('창세기 31:1-32:5', (verse_ordinal('창세기', 31, 1), verse_ordinal('창세기', 32, 5))),
+    ('창 31:1-5', (verse_ordinal('창세기', 31, 1), verse_ordinal('창세기', 31, 5))),
+    ('창세기 31:3', (verse_ordinal('창세기', 31, 3),) * 2),
+    ('시편 23', chapter_ordinal_range('시편', 23)),
+    ('창세기 1-2', (1, 56)),
+    ('창세기 1:1 ~ 1:3', (1, 3)),
+])
+def test_parse_passage(text, expected):
+    assert parse_passage(text) == expected
+
+
+@pytest.mark.parametrize('text', [
+    '', None, '없는책 1:1', '창세기 31:5-1', '창세기 1:40', '창세기 51', '창세기',
+])
+def test_parse_passage_invalid(text):
+    assert parse_passage(text) is None
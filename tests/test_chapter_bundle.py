@@ -0,0 +1,62 @@
+import chapter_bundle
+import commentary_db
+
+
+def make_database(conn):
+    commentary_db.ensure_commentaries_schema(conn)
+    conn.execute("""
+        CREATE TABLE verses (
+            id INTEGER PRIMARY KEY, book_name TEXT, chapter INTEGER, verse INTEGER,
+            text TEXT, version TEXT, verse_title TEXT
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO verses (book_name, chapter, verse, text, version, verse_title) VALUES (?, ?, ?, ?, ?, ?)",
+        [('창세기', 1, 1, '태초에', '개역개정', '천지 창조'), ('창세기', 1, 1, 'In the beginning', 'kjv', None),
+         ('창세기', 1, 2, '땅이', '개역개정', None)]
+    )
+    for verse, name, text in [(0, '호크마 주석', '창세기 1장 서론'), (1, '호크마 주석', '1절 주석'),
+                              (1, '다른 주석', '다른 1절'), (40, '호크마 주석', '범위 밖 절')]:
+        commentary_db.insert_commentary_once(conn, name, '창세기', 1, verse, text)
+    commentary_db.insert_commentary_once(conn, '호크마 주석', '창세기', 2, 0, '2장 서론')
+    conn.commit()
+
+
+def test_bundle_matches_chapter_query(conn, tmp_path, db_path):
+    make_database(conn)
+    output = str(tmp_path / 'chapter_bundle.bin')
+
+    result = chapter_bundle.build_bundle(db_path, output)
+    assert result['filled'] == 2
+
+    with chapter_bundle.ChapterBundle(output) as bundle:
+        data = bundle.chapter('창세기', 1)
+        assert bundle.chapter('창세기', 3) is None
+        assert bundle.chapter('창세기', 2)['verses'] == [
+            {'verse': 0, 'text': {}, 'commentaries': [{'name': '호크마 주석', 'text': '2장 서론'}]}
+        ]
+
+    # 앱의 get-commentaries와 같은 행이 모두 번들에 들어감 (0절 서론, 범위 밖 절 포함)
+    expected = conn.execute(
+        "SELECT verse, commentary_name, text FROM commentaries WHERE book_name = ? AND chapter = ? ORDER BY verse, id",
+        ('창세기', 1)
+    ).fetchall()
+    bundled = [(entry['verse'], item['name'], item['text'])
+               for entry in data['verses'] for item in entry['commentaries']]
+    assert bundled == expected
+    assert [entry['verse'] for entry in data['verses']] == [0, 1, 2, 40]
+    assert data['verses'][1]['text'] == {'개역개정': '태초에', 'kjv': 'In the beginning'}
+    assert data['verses'][1]['title'] == {'개역개정': '천지 창조'}
+
+
+def test_bundle_restores_deduplicated_text(conn, tmp_path, db_path):
+    make_database(conn)
+    commentary_db.enable_content_dedup(conn)
+    output = str(tmp_path / 'chapter_bundle.bin')
+
+    chapter_bundle.build_bundle(db_path, output)
+
+    with chapter_bundle.ChapterBundle(output) as bundle:
+        assert bundle.chapter('창세기', 1)['verses'][0]['commentaries'] == [
+            {'name': '호크마 주석', 'text': '창세기 1장 서론'}
+        ]
@@ -0,0 +1,301 @@
+import sqlite3
+
+import pytest
+
+import commentary_db
+from bible_reference import verse_ordinal
+
+# 구버전 commentaries 스키마 (통합 전 각 writer가 만들던 테이블)
+LEGACY_SCHEMAS = {
+    'bulk': """
+        CREATE TABLE commentaries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            commentary_name TEXT, book_name TEXT, book_code TEXT, chapter INTEGER, verse INTEGER,
+            text TEXT, version TEXT DEFAULT 'hochma', verse_title TEXT, article_id INTEGER, url TEXT,
+            parsed_date TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'advanced': """
+        CREATE TABLE commentaries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            book_name TEXT NOT NULL, book_code INTEGER NOT NULL, chapter INTEGER NOT NULL,
+            verse INTEGER NOT NULL, text TEXT NOT NULL, version TEXT NOT NULL, verse_title TEXT,
+            commentary_name TEXT NOT NULL, original_url TEXT,
+            parsed_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'line_based': """
+        CREATE TABLE commentaries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            book_name TEXT NOT NULL, book_code INTEGER NOT NULL, chapter INTEGER NOT NULL,
+            verse INTEGER NOT NULL, text TEXT NOT NULL, version TEXT NOT NULL, verse_title TEXT,
+            commentary_name TEXT NOT NULL, original_url TEXT, pattern_type TEXT, verse_separator TEXT,
+            parsed_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'import': """
+        CREATE TABLE commentaries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            book TEXT NOT NULL, chapter INTEGER NOT NULL, verse INTEGER NOT NULL,
+            commentary TEXT NOT NULL,
+            UNIQUE(book, chapter, verse, commentary)
+        )
+    """,
+}
+
+LEGACY_ROWS = {
+    'bulk': (
+        "INSERT INTO commentaries (id, commentary_name, book_name, book_code, chapter, verse, text, "
+        "article_id, url) VALUES (?, '호크마 주석', ?, '', ?, ?, ?, 139477, 'u')"
+    ),
+    'advanced': (
+        "INSERT INTO commentaries (id, book_name, book_code, chapter, verse, text, version, commentary_name, "
+        "original_url) VALUES (?, ?, 1, ?, ?, ?, 'hochma', '호크마 주석', 'u')"
+    ),
+    'line_based': (
+        "INSERT INTO commentaries (id, book_name, book_code, chapter, verse, text, version, commentary_name, "
+        "original_url, pattern_type) VALUES (?, ?, 1, ?, ?, ?, 'hochma', '호크마 주석', 'u', 'equals')"
+    ),
+    'import': "INSERT INTO commentaries (id, book, chapter, verse, commentary) VALUES (?, ?, ?, ?, '호크마 주석: ' || ?)",
+}
+
+
+def unified_rows(conn):
+    return conn.execute(
+        "SELECT id, commentary_name, book_name, book_code, chapter, verse, verse_ordinal, text "
+        "FROM commentaries ORDER BY id"
+    ).fetchall()
+
+
+@pytest.mark.parametrize('layout', sorted(LEGACY_SCHEMAS))
+def test_migrate_legacy_layout(conn, layout):
+    conn.execute(LEGACY_SCHEMAS[layout])
+    conn.executemany(LEGACY_ROWS[layout], [
+        (10, '창세기', 31, 1, '첫 절'),
+        (11, '창세기', 31, 0, '서론'),
+        (20, '창세기', 31, 2, '둘째 절'),
+    ])
+    conn.commit()
+
+    assert commentary_db.ensure_commentaries_schema(conn, batch_size=2) is True
+
+    assert commentary_db.schema_version(conn) == commentary_db.COMMENTARIES_SCHEMA_VERSION
+    assert commentary_db.table_columns(conn, 'commentaries') == list(commentary_db.COMMENTARIES_COLUMNS)
+    assert unified_rows(conn) == [
+        (10, '호크마 주석', '창세기', 1, 31, 1, verse_ordinal('창세기', 31, 1), '첫 절'),
+        (11, '호크마 주석', '창세기', 1, 31, 0, None, '서론'),
+        (20, '호크마 주석', '창세기', 1, 31, 2, verse_ordinal('창세기', 31, 2), '둘째 절'),
+    ]
+    assert not commentary_db.has_table(conn, 'commentaries_migrating')
+    # 최신 스키마면 다시 실행해도 아무것도 하지 않음
+    assert commentary_db.ensure_commentaries_schema(conn) is False
+
+
+def test_migration_resumes_after_interruption(conn):
+    conn.execute(LEGACY_SCHEMAS['advanced'])
+    conn.executemany(LEGACY_ROWS['advanced'], [(i, '창세기', 1, i, f'절 {i}') for i in range(1, 6)])
+    # 앞 배치만 복사된 채 중단된 상태
+    conn.execute(commentary_db.COMMENTARIES_SCHEMA.format(table='commentaries_migrating'))
+    conn.execute(
+        "INSERT INTO commentaries_migrating (id, commentary_name, book_name, book_code, chapter, verse, text) "
+        "VALUES (1, '호크마 주석', '창세기', 1, 1, 1, '절 1')"
+    )
+    conn.commit()
+
+    assert commentary_db.migrate_commentaries_schema(conn) == 4
+    assert [row[0] for row in unified_rows(conn)] == [1, 2, 3, 4, 5]
+
+
+def test_table_swap_is_atomic(conn):
+    conn.execute(LEGACY_SCHEMAS['bulk'])
+    conn.executemany(LEGACY_ROWS['bulk'], [(i, '창세기', 1, i, f'절 {i}') for i in range(1, 4)])
+    conn.commit()
+
+    # 교체 중 RENAME이 실패하면 DROP도 취소돼 구버전 테이블이 남음
+    conn.set_authorizer(
+        lambda action, *args: sqlite3.SQLITE_DENY if action == sqlite3.SQLITE_ALTER_TABLE else sqlite3.SQLITE_OK
+    )
+    with pytest.raises(sqlite3.DatabaseError):
+        commentary_db.migrate_commentaries_schema(conn)
+    conn.set_authorizer(None)
+    assert conn.execute("SELECT COUNT(*) FROM commentaries").fetchone()[0] == 3
+    assert 'article_id' in commentary_db.table_columns(conn, 'commentaries')
+
+    assert commentary_db.migrate_commentaries_schema(conn) == 0
+    assert [row[0] for row in unified_rows(conn)] == [1, 2, 3]
+
+
+def test_schema_check_finishes_stranded_rename(conn):
+    # 이전 버전이 DROP 뒤 RENAME 전에 중단돼 행이 commentaries_migrating에만 남은 상태
+    conn.execute(commentary_db.COMMENTARIES_SCHEMA.format(table='commentaries_migrating'))
+    conn.executemany(
+        "INSERT INTO commentaries_migrating (id, commentary_name, book_name, book_code, chapter, verse, text) "
+        "VALUES (?, '호크마 주석', '창세기', 1, 1, ?, ?)", [(i, i, f'절 {i}') for i in range(1, 4)]
+    )
+    conn.commit()
+
+    assert commentary_db.ensure_commentaries_schema(conn) is True
+    assert not commentary_db.has_table(conn, 'commentaries_migrating')
+    assert [row[0] for row in unified_rows(conn)] == [1, 2, 3]
+    assert commentary_db.schema_version(conn) == commentary_db.COMMENTARIES_SCHEMA_VERSION
+
+
+def test_catch_up_from_older_version_keeps_table(conn):
+    # v1 (통합 컬럼만 있고 변경 로그/집계가 없는 DB)은 테이블을 복사하지 않고 빠진 부분만 추가
+    conn.execute(commentary_db.COMMENTARIES_SCHEMA.format(table='commentaries'))
+    conn.execute(
+        "INSERT INTO commentaries (id, commentary_name, book_name, book_code, chapter, verse, text) "
+        "VALUES (7, '호크마 주석', '창세기', 1, 1, 1, '본문')"
+    )
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    root_page = conn.execute("SELECT rootpage FROM sqlite_master WHERE name = 'commentaries'").fetchone()
+
+    assert commentary_db.ensure_commentaries_schema(conn) is True
+
+    assert conn.execute("SELECT rootpage FROM sqlite_master WHERE name = 'commentaries'").fetchone() == root_page
+    assert commentary_db.has_table(conn, 'commentary_changes')
+    assert commentary_db.has_table(conn, 'commentary_stats')
+    assert commentary_db.get_statistics(conn)['total_commentaries'] == 1
+
+
+def test_fix_table_structure_uses_catch_up(tmp_path, monkeypatch, capsys):
+    import check_table_structure
+
+    monkeypatch.chdir(tmp_path)
+    conn = sqlite3.connect('bible_database.db')
+    conn.execute(commentary_db.COMMENTARIES_SCHEMA.format(table='commentaries'))
+    conn.execute("PRAGMA user_version = 2")
+    conn.commit()
+    conn.close()
+
+    calls = []
+    monkeypatch.setattr(commentary_db, 'migrate_commentaries_schema', lambda *args: calls.append(args))
+    check_table_structure.fix_table_structure()
+
+    assert calls == []
+    conn = sqlite3.connect('bible_database.db')
+    assert commentary_db.schema_version(conn) == commentary_db.COMMENTARIES_SCHEMA_VERSION
+    conn.close()
+
+
+@pytest.mark.parametrize('dedup', [False, True])
+def test_insert_commentary_once_is_idempotent(conn, dedup):
+    commentary_db.ensure_commentaries_schema(conn)
+    if dedup:
+        commentary_db.enable_content_dedup(conn)
+    rows = [('호크마 주석', '창세기', 1, 1, '본문'), ('호크마 주석', '창세기', 1, 2, '본문'),
+            ('다른 주석', '창세기', 1, 1, '본문')]
+
+    assert [commentary_db.insert_commentary_once(conn, *row) for row in rows] == [True, True, True]
+    # 같은 파일을 다시 가져오기
+    assert [commentary_db.insert_commentary_once(conn, *row) for row in rows] == [False, False, False]
+    # 본문이 바뀐 행은 새로 저장
+    assert commentary_db.insert_commentary_once(conn, '호크마 주석', '창세기', 1, 1, '고친 본문') is True
+
+    assert conn.execute("SELECT COUNT(*) FROM commentaries").fetchone()[0] == 4
+    assert conn.execute(
+        "SELECT verse_ordinal FROM commentaries WHERE verse = 2"
+    ).fetchone()[0] == verse_ordinal('창세기', 1, 2)
+
+
+def add_row(conn, commentary_name, book_name, chapter, verse, text):
+    return conn.execute(
+        "INSERT INTO commentaries (commentary_name, book_name, book_code, chapter, verse, text) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (commentary_name, book_name, commentary_db.get_book_code(book_name), chapter, verse, text)
+    ).lastrowid
+
+
+def changes_since(conn, last_id):
+    return conn.execute(
+        "SELECT commentary_name, book_name, chapter FROM commentary_changes WHERE id > ? ORDER BY id",
+        (last_id,)
+    ).fetchall()
+
+
+def last_change_id(conn):
+    return conn.execute("SELECT COALESCE(MAX(id), 0) FROM commentary_changes").fetchone()[0]
+
+
+def test_change_log_records_touched_chapters(conn):
+    commentary_db.ensure_commentaries_schema(conn)
+    row_id = add_row(conn, '호크마 주석', '창세기', 1, 1, '본문')
+    add_row(conn, '호크마 주석', '창세기', 1, 2, '본문')
+    # 같은 장은 한 행만 유지
+    assert changes_since(conn, 0) == [('호크마 주석', '창세기', 1)]
+
+    mark = last_change_id(conn)
+    # 장을 옮기는 UPDATE는 이전 장과 새 장을 모두 기록
+    conn.execute("UPDATE commentaries SET chapter = 2 WHERE id = ?", (row_id,))
+    assert changes_since(conn, mark) == [('호크마 주석', '창세기', 1), ('호크마 주석', '창세기', 2)]
+
+    mark = last_change_id(conn)
+    conn.execute("DELETE FROM commentaries WHERE id = ?", (row_id,))
+    assert changes_since(conn, mark) == [('호크마 주석', '창세기', 2)]
+    assert conn.execute("SELECT COUNT(*) FROM commentary_changes").fetchone()[0] == 2
+
+
+def grouped_statistics(conn):
+    """commentaries 전체 GROUP BY로 계산한 통계 (트리거 결과 비교용)"""
+    select = commentary_db.commentary_select(conn)
+    rows = conn.execute(f"SELECT commentary_name, book_name, text FROM ({select})").fetchall()
+    books, names = {}, {}
+    for commentary_name, book_name, text in rows:
+        books[book_name] = books.get(book_name, 0) + 1
+        names[commentary_name] = names.get(commentary_name, 0) + 1
+    return len(rows), books, names, sum(len(text) for _, _, text in rows)
+
+
+@pytest.mark.parametrize('dedup', [False, True])
+def test_stats_triggers_match_full_scan(conn, dedup):
+    commentary_db.ensure_commentaries_schema(conn)
+    if dedup:
+        commentary_db.enable_content_dedup(conn)
+    commentary_db.register_functions(conn)
+
+    for verse in range(1, 4):
+        commentary_db.insert_commentary_once(conn, '호크마 주석', '창세기', 1, verse, '가나다' * verse)
+    commentary_db.insert_commentary_once(conn, '다른 주석', '출애굽기', 2, 1, '본문')
+    conn.execute("UPDATE commentaries SET book_name = '레위기', book_code = 3 WHERE verse = 3")
+    conn.execute("DELETE FROM commentaries WHERE verse = 2")
+    conn.commit()
+
+    stats = commentary_db.get_statistics(conn)
+    total, books, names, length = grouped_statistics(conn)
+    assert stats['total_commentaries'] == total == 3
+    assert stats['books'] == books == {'창세기': 1, '출애굽기': 1, '레위기': 1}
+    assert list(stats['books']) == ['창세기', '출애굽기', '레위기']
+    assert stats['commentary_types'] == names
+    assert stats['total_text_length'] == length == 3 + 2 + 9
+
+    # 증분 값과 전체 재집계가 같아야 함
+    commentary_db.rebuild_stats(conn)
+    assert commentary_db.get_statistics(conn) == stats
+
+
+def test_dedupe_refuses_app_database(db_path, tmp_path, capsys):
+    conn = sqlite3.connect(db_path)
+    commentary_db.ensure_commentaries_schema(conn)
+    commentary_db.insert_commentary_once(conn, '호크마 주석', '창세기', 1, 1, '본문')
+    conn.commit()
+    conn.close()
+
+    # 앱이 읽는 DB는 text를 비우지 않고 release_build.py를 안내
+    commentary_db.dedupe_database(db_path)
+    assert 'release_build.py' in capsys.readouterr().out
+    conn = sqlite3.connect(db_path)
+    assert not commentary_db.content_dedup_enabled(conn)
+    assert conn.execute("SELECT text FROM commentaries").fetchone() == ('본문',)
+    conn.close()
+
+    # 작업용 사본에는 적용
+    work_path = str(tmp_path / 'work.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute("VACUUM INTO ?", (work_path,))
+    conn.close()
+    commentary_db.dedupe_database(work_path)
+    conn = sqlite3.connect(work_path)
+    assert commentary_db.content_dedup_enabled(conn)
+    assert conn.execute("SELECT text FROM commentaries").fetchone() == ('',)
+    conn.close()
@@ -0,0 +1,168 @@
+import sqlite3
+
+import pytest
+
+import commentary_db
+
+MODES = ['plain', 'dedup', 'compressed']
+
+# 압축이 이득이 되도록 긴 본문 (짧은 본문은 압축하지 않고 원문 그대로 저장)
+FILLER = ' 하나님의 말씀을 묵상하는 주석 본문입니다.' * 20
+
+
+def setup_mode(conn, mode):
+    commentary_db.ensure_commentaries_schema(conn)
+    if mode == 'dedup':
+        commentary_db.enable_content_dedup(conn)
+    elif mode == 'compressed':
+        pytest.importorskip('zstandard')
+        commentary_db.enable_compression(conn)
+
+
+def add(conn, verse, text, commentary_name='호크마 주석'):
+    commentary_db.insert_commentary_once(conn, commentary_name, '창세기', 1, verse, text)
+    return conn.execute(
+        "SELECT id FROM commentaries WHERE verse = ? AND commentary_name = ?", (verse, commentary_name)
+    ).fetchone()[0]
+
+
+def replace_text(conn, row_id, text):
+    """행 본문 교체 (중복 제거 모드는 새 본문을 가리키고 남은 본문을 정리)"""
+    if commentary_db.content_dedup_enabled(conn):
+        _, content_id = commentary_db.prepare_commentary_text(conn, text)
+        conn.execute("UPDATE commentaries SET content_id = ? WHERE id = ?", (content_id, row_id))
+        commentary_db.prune_contents(conn)
+    else:
+        conn.execute("UPDATE commentaries SET text = ? WHERE id = ?", (text, row_id))
+
+
+def delete(conn, row_id):
+    conn.execute("DELETE FROM commentaries WHERE id = ?", (row_id,))
+    if commentary_db.content_dedup_enabled(conn):
+        commentary_db.prune_contents(conn)
+
+
+def found(conn, query):
+    return sorted(row['verse'] for row in commentary_db.search_commentaries(conn, query))
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_triggers_keep_index_in_sync(conn, mode):
+    setup_mode(conn, mode)
+    first = add(conn, 1, '태초에 천지를 창조하시니라' + FILLER)
+    second = add(conn, 2, '땅이 혼돈하고 공허하며' + FILLER)
+    if mode == 'compressed':
+        assert conn.execute("SELECT COUNT(*) FROM commentary_contents WHERE typeof(text) = 'blob'").fetchone()[0] == 2
+
+    assert found(conn, '천지를') == [1]
+    assert found(conn, '주석 본문') == [1, 2]
+
+    replace_text(conn, first, '빛이 있으라 하시니' + FILLER)
+    assert found(conn, '천지를') == []
+    assert found(conn, '빛이 있으라') == [1]
+
+    delete(conn, second)
+    assert found(conn, '혼돈하고') == []
+    assert found(conn, '주석 본문') == [1]
+    # 인덱스와 원본이 일치 (external content integrity-check)
+    fts_table = commentary_db.FTS_TABLES[commentary_db._fts_source(conn, 'commentaries')]
+    commentary_db.register_functions(conn)
+    conn.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('integrity-check')")
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_results_ranked_with_snippets(conn, mode):
+    setup_mode(conn, mode)
+    add(conn, 1, '언약을 세우리니' + FILLER)
+    add(conn, 2, '언약을 세우고 언약을 지키며 언약을 기억하리라' + FILLER)
+    add(conn, 3, '다른 내용' + FILLER)
+    add(conn, 1, '언약을 다룬 주석', commentary_name='다른 주석')
+
+    # bm25 순위: 검색어가 더 자주 나오는 본문이 먼저
+    results = commentary_db.search_commentaries(conn, '언약을 세우')
+    assert [row['verse'] for row in results] == [2, 1]
+    assert results[0]['rank'] <= results[1]['rank']
+    assert all('[언약을]' in row['snippet'] for row in results)
+
+    results = commentary_db.search_commentaries(conn, '언약을', commentary_name='다른 주석')
+    assert [(row['commentary_name'], row['text']) for row in results] == [('다른 주석', '언약을 다룬 주석')]
+    assert results[0]['snippet'] == '[언약을] 다룬 주석'
+
+    # 2글자 검색어는 LIKE로 찾고 스니펫은 직접 만듦
+    results = commentary_db.search_commentaries(conn, '언약', limit=10)
+    assert sorted((row['commentary_name'], row['verse']) for row in results) == [
+        ('다른 주석', 1), ('호크마 주석', 1), ('호크마 주석', 2)]
+    assert all('[언약]' in row['snippet'] for row in results)
+
+
+def test_search_verses(conn):
+    conn.execute("""
+        CREATE TABLE verses (id INTEGER PRIMARY KEY, book TEXT, chapter INTEGER, verse INTEGER,
+                             version TEXT, text TEXT)
+    """)
+    conn.executemany("INSERT INTO verses (book, chapter, verse, version, text) VALUES (?, ?, ?, ?, ?)", [
+        ('창세기', 1, 1, 'krv', '태초에 하나님이 천지를 창조하시니라'),
+        ('창세기', 1, 1, 'niv', 'In the beginning God created the heavens'),
+        ('창세기', 1, 2, 'krv', '땅이 혼돈하고 공허하며'),
+    ])
+    assert commentary_db.ensure_fts(conn, 'verses')
+
+    results = commentary_db.search_verses(conn, '천지를')
+    assert [(row['version'], row['verse']) for row in results] == [('krv', 1)]
+    assert results[0]['snippet'].startswith('태초에 하나님이 [천지를]')
+    assert commentary_db.search_verses(conn, 'beginning', version='krv') == []
+
+    conn.execute("UPDATE verses SET text = '땅이 혼돈하고 흑암이' WHERE verse = 2")
+    assert [row['verse'] for row in commentary_db.search_verses(conn, '흑암이')] == [2]
+
+
+def test_compressed_writes_through_new_connections(db_path):
+    pytest.importorskip('zstandard')
+    from complete_hochma_bulk_parser import CompleteHochmaBulkParser
+
+    conn = sqlite3.connect(db_path)
+    setup_mode(conn, 'compressed')
+    add(conn, 1, '태초에 천지를 창조하시니라' + FILLER)
+
+    # v3 DB의 commentary_text() 트리거는 스키마 확인 때 제거
+    commentary_db.register_functions(conn)
+    conn.execute("""
+        CREATE TRIGGER commentary_contents_fts_ad AFTER DELETE ON commentary_contents BEGIN
+            INSERT INTO commentary_contents_fts(commentary_contents_fts, rowid, text)
+            VALUES ('delete', old.id, commentary_text(old.text));
+        END
+    """)
+    conn.execute("PRAGMA user_version = 3")
+    assert commentary_db.ensure_commentaries_schema(conn)
+    assert not conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'commentary_contents'"
+    ).fetchall()
+    conn.close()
+
+    # 게시글마다 새 연결로 저장 (사전이 이미 캐시된 연결은 commentary_text()를 등록하지 않음)
+    parser = CompleteHochmaBulkParser(db_path)
+    for chapter in (2, 3, 4):
+        parsed = {
+            'book_name': '창세기', 'chapter': chapter, 'url': f'u{chapter}',
+            'verses': [{'verse': 1, 'content': f'{chapter}장의 언약을 세우시니라' + FILLER}],
+        }
+        assert parser.save_to_database(parsed, chapter) == 1
+
+    # 사용자 함수가 없는 연결(앱 등)도 본문을 지울 수 있어야 함
+    raw = sqlite3.connect(db_path)
+    commentary_db.insert_commentary_once(raw, '호크마 주석', '창세기', 5, 1, '다섯째 장의 언약을 세우시니라' + FILLER)
+    raw.execute("DELETE FROM commentaries WHERE chapter = 2")
+    raw.execute("DELETE FROM commentary_contents WHERE id NOT IN (SELECT content_id FROM commentaries)")
+    raw.commit()
+    raw.close()
+
+    conn = sqlite3.connect(db_path)
+    chapters = sorted(row['chapter'] for row in commentary_db.search_commentaries(conn, '언약을 세우'))
+    assert chapters == [3, 4, 5]
+    assert found(conn, '천지를') == [1]
+
+    # 다시 색인하면 원본과 일치
+    commentary_db.rebuild_fts(conn)
+    commentary_db.register_functions(conn)
+    conn.execute("INSERT INTO commentary_contents_fts(commentary_contents_fts) VALUES ('integrity-check')")
+    conn.close()
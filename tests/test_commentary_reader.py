@@ -0,0 +1,176 @@
+import gzip
+import json
+import sqlite3
+
+import pytest
+
+import commentary_db
+from commentary_reader import ArticleReader, CommentaryReader, write_rows
+
+INSERT_SQL = """
+    INSERT INTO commentaries (commentary_name, book_name, book_code, chapter, verse, verse_ordinal, text)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def add_commentary(conn, book_name, chapter, verse, text, commentary_name='호크마 주석'):
+    conn.execute(INSERT_SQL, (
+        commentary_name, book_name, commentary_db.get_book_code(book_name), chapter, verse,
+        commentary_db.commentary_ordinal(book_name, chapter, verse), text,
+    ))
+
+
+@pytest.fixture
+def reader(conn, db_path):
+    commentary_db.register_functions(conn)
+    commentary_db.ensure_commentaries_schema(conn)
+    # 창세기 1장: 0절 서론 + 1~31절 + 범위 밖 40절, 다음 장 서론
+    for verse in [0] + list(range(1, 32)) + [40]:
+        add_commentary(conn, '창세기', 1, verse, f'창1:{verse}')
+    add_commentary(conn, '창세기', 2, 0, '창2 서론')
+    add_commentary(conn, '창세기', 2, 1, '창2:1', commentary_name='다른 주석')
+    # 서수를 계산할 수 없는 성경책 이름
+    add_commentary(conn, '알수없는책', 1, 1, '?')
+    conn.commit()
+    with CommentaryReader(db_path, cache_size=0) as service:
+        yield service
+
+
+def test_chapter_includes_rows_without_ordinal(reader, conn):
+    rows = reader.chapter('창세기', 1)
+    expected = conn.execute(
+        "SELECT COUNT(*) FROM commentaries WHERE book_name = '창세기' AND chapter = 1"
+    ).fetchone()[0]
+    assert len(rows) == expected == 33
+    # 절 순서 (0절 서론이 처음, 범위 밖 절이 마지막)
+    assert [row['verse'] for row in rows] == [0] + list(range(1, 32)) + [40]
+
+
+def test_chapter_does_not_leak_other_chapters(reader):
+    assert [row['text'] for row in reader.chapter('창세기', 2)] == ['창2 서론', '창2:1']
+
+
+def test_unresolvable_book_uses_columns(reader):
+    assert [row['text'] for row in reader.commentaries('알수없는책', 1)] == ['?']
+
+
+def test_verse_and_name_filters(reader):
+    assert [row['text'] for row in reader.commentaries('창세기', 1, verse=5)] == ['창1:5']
+    assert [row['text'] for row in reader.commentaries('창세기', 1, verse=40)] == ['창1:40']
+    assert [row['text'] for row in reader.commentaries('창세기', 2, commentary_name='다른', partial_name=True)] \
+        == ['창2:1']
+    assert len(reader.commentaries('창세기', 1, limit=3)) == 3
+
+
+def test_passage_is_ordinal_range(reader):
+    rows = reader.passage('창세기 1:30-2:1')
+    assert [row['text'] for row in rows] == ['창1:30', '창1:31', '창2:1']
+    assert reader.passage('없는책 1:1') == []
+
+
+def test_chapter_query_uses_indexes(reader, conn):
+    sql, params = reader._commentaries_query('창세기', 1)
+    plan = ' '.join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+    assert 'idx_commentaries_verse_ordinal' in plan
+    assert 'SCAN c' not in plan
+
+
+def test_chapter_cache_invalidated_by_change_log(conn, db_path):
+    commentary_db.ensure_commentaries_schema(conn)
+    add_commentary(conn, '창세기', 1, 1, '처음')
+    add_commentary(conn, '창세기', 2, 1, '다른 장')
+    conn.commit()
+
+    with CommentaryReader(db_path, cache_size=8) as service:
+        assert [row['text'] for row in service.chapter('창세기', 1)] == ['처음']
+        service.chapter('창세기', 2)
+        service.chapter('창세기', 1)
+        assert service.cache_stats()['hits'] == 1
+
+        conn.execute("UPDATE commentaries SET text = '고침' WHERE chapter = 1")
+        conn.commit()
+
+        assert [row['text'] for row in service.chapter('창세기', 1)] == ['고침']
+        assert service.cache_stats()['invalidations'] == 1
+        # 바뀌지 않은 장은 캐시에 남아 있음
+        service.chapter('창세기', 2)
+        assert service.cache_stats()['hits'] == 2
+
+
+def test_chapter_returns_copies_of_cached_rows(conn, db_path):
+    commentary_db.ensure_commentaries_schema(conn)
+    add_commentary(conn, '창세기', 1, 1, '처음')
+    conn.commit()
+
+    with CommentaryReader(db_path, cache_size=8) as service:
+        rows = service.chapter('창세기', 1)
+        rows[0]['text'] = '호출한 쪽에서 수정'
+        rows.append({'text': '추가'})
+        assert [row['text'] for row in service.chapter('창세기', 1)] == ['처음']
+        assert service.cache_stats()['hits'] == 1
+
+
+def read_export(path):
+    """내보낸 파일을 행 리스트로 읽음 (.json은 배열, 그 외는 줄 단위 JSON)"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        content = f.read()
+    if path.endswith('.json') or path.endswith('.json.gz'):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.parametrize('name', ['out.json', 'out.ndjson', 'out.jsonl', 'out.json.gz', 'out.ndjson.gz'])
+def test_export_formats(reader, tmp_path, name):
+    path = str(tmp_path / name)
+    assert reader.export(path, '창세기', 2) == {path: 2}
+    rows = read_export(path)
+    assert [(row['verse'], row['text']) for row in rows] == [(0, '창2 서론'), (1, '창2:1')]
+    if name.endswith('.gz'):
+        with open(path, 'rb') as f:
+            assert f.read(2) == b'\x1f\x8b'
+
+
+def test_export_partition_by_book(reader, tmp_path):
+    path = str(tmp_path / 'out.ndjson.gz')
+    result = reader.export(path, partition_by_book=True, workers=2)
+    genesis = str(tmp_path / 'out-01-창세기.ndjson.gz')
+    assert set(result) == {genesis, str(tmp_path / 'out-02-알수없는책.ndjson.gz')}
+    assert result[genesis] == 35
+    for partition, count in result.items():
+        rows = read_export(partition)
+        assert len(rows) == count
+        assert len({row['book_name'] for row in rows}) == 1
+    assert sum(result.values()) == 36
+
+
+@pytest.mark.parametrize('name, content', [('empty.json', '[]\n'), ('empty.ndjson', '')])
+def test_export_empty_result(reader, tmp_path, name, content):
+    path = str(tmp_path / name)
+    assert reader.export(path, '출애굽기', 1) == {path: 0}
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == content
+    assert write_rows(iter([]), path) == 0
+
+
+def test_export_articles(tmp_path):
+    db_path = str(tmp_path / 'hochma_articles.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, article_id TEXT, title TEXT, book_name TEXT)")
+    conn.executemany("INSERT INTO articles (article_id, title, book_name) VALUES (?, ?, ?)", [
+        ('101', '창세기 1장', '창세기'), ('102', '출애굽기 1장', '출애굽기'), ('103', '창세기 2장', '창세기'),
+    ])
+    conn.commit()
+    conn.close()
+
+    with ArticleReader(db_path) as service:
+        path = str(tmp_path / 'articles.json.gz')
+        assert service.export_articles(path) == 3
+        assert [row['article_id'] for row in read_export(path)] == ['103', '102', '101']
+
+        path = str(tmp_path / 'genesis.ndjson')
+        assert service.export_articles(path, book_name='창세기') == 2
+        assert [row['title'] for row in read_export(path)] == ['창세기 2장', '창세기 1장']
+
+        assert service.export_articles(str(tmp_path / 'none.json'), book_name='레위기') == 0
+        assert read_export(str(tmp_path / 'none.json')) == []
@@ -0,0 +1,141 @@
+import sqlite3
+
+import pytest
+
+import commentary_db
+import complete_hochma_bulk_parser
+import verse_spans
+from complete_hochma_bulk_parser import CompleteHochmaBulkParser
+from metrics import CrawlMetrics
+from verse_spans import SpanReader
+
+
+def article_html(body, title='호크마 주석, 창세기 3장'):
+    return (f"<html><head><title>{title}</title></head><body><h1>{title}</h1>"
+            f"<div class='xe_content'>{body}</div></body></html>")
+
+
+ARTICLE = article_html("서론<br>3:1 첫째 절 주석<br>3:2-3 둘째와 셋째 절 주석 (참조 1:5)<br>3:4 넷째 절")
+
+
+@pytest.fixture
+def parser(http_server, db_path):
+    http_server.route('/com_kor_hochma/1', ARTICLE)
+    http_server.route('/com_kor_hochma/2', article_html("절 구분이 없는 본문"))
+    parser = CompleteHochmaBulkParser(db_path)
+    parser.base_url = http_server.url('/com_kor_hochma')
+    return parser
+
+
+def test_verses_are_a_generator(parser):
+    result, error = parser.parse_single_article(1)
+
+    assert error is None
+    assert not isinstance(result['verses'], list)
+    assert [(verse['verse'], verse['content']) for verse in result['verses']] == [
+        (1, '첫째 절 주석'), (2, '둘째와 셋째 절 주석 (참조 1:5)'), (3, '둘째와 셋째 절 주석 (참조 1:5)'), (4, '넷째 절'),
+    ]
+
+
+def test_article_without_verses_fails(parser):
+    assert parser.parse_single_article(2) == (None, "절 파싱 실패")
+
+
+@pytest.mark.parametrize('save_to_db', [True, False])
+def test_parse_articles_counts_verses(parser, db_path, save_to_db, capsys):
+    results = parser.parse_articles([{'article_id': 1, 'title': '창세기 3장'}],
+                                    save_to_db=save_to_db, save_to_excel=False)
+
+    assert results[0]['verse_count'] == 4
+    assert '4 verses' in capsys.readouterr().out
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM commentaries").fetchone()[0] == (4 if save_to_db else 0)
+    conn.close()
+    assert parser.total_verses == (4 if save_to_db else 0)
+
+
+def test_parse_articles_keeps_list_for_excel(parser, monkeypatch, capsys):
+    saved = []
+    monkeypatch.setattr(parser, 'save_to_excel', lambda results, output_file: saved.extend(results))
+    results = parser.parse_articles([{'article_id': 1, 'title': '창세기 3장'}],
+                                    save_to_db=True, save_to_excel=True)
+
+    # 엑셀 저장용 결과에는 DB 저장 뒤에도 절 목록이 그대로 남음
+    assert results[0]['verse_count'] == 4
+    assert [verse['verse'] for verse in results[0]['parsed_data']['verses']] == [1, 2, 3, 4]
+
+
+def test_spans_computed_once(parser, db_path, monkeypatch):
+    conn = sqlite3.connect(db_path)
+    verse_spans.enable_span_storage(conn)
+    conn.commit()
+    conn.close()
+
+    result, error = parser.parse_single_article(1)
+    content = result['content']
+    assert [(verse_nums, content[start:end]) for verse_nums, start, end in result['spans']] == [
+        ([1], '첫째 절 주석'), ([2, 3], '둘째와 셋째 절 주석 (참조 1:5)'), ([4], '넷째 절'),
+    ]
+    # 저장할 때 본문을 다시 분할하지 않음
+    monkeypatch.setattr(parser, 'iter_verse_spans', lambda *args: pytest.fail('segmented twice'))
+
+    assert parser.save_to_database(result, 1) == 4
+    with SpanReader(db_path) as reader:
+        assert reader.verse_text(1, 3) == '둘째와 셋째 절 주석 (참조 1:5)'
+
+
+def failed_articles(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {row['article_id']: (row['kind'], row['attempts']) for row in commentary_db.get_failed_articles(conn)}
+    finally:
+        conn.close()
+
+
+def test_db_save_failure_counts_as_failure(parser, db_path, monkeypatch, capsys):
+    parser.metrics = CrawlMetrics()
+    monkeypatch.setattr(complete_hochma_bulk_parser.time, 'sleep', lambda seconds: None)
+
+    def locked(*args):
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(parser, 'save_to_database', locked)
+    results = parser.parse_articles([{'article_id': 1, 'title': '창세기 3장'}], save_to_excel=False)
+
+    assert results[0]['status'] == 'failed'
+    assert results[0]['error'] == 'db error: database is locked'
+    assert (parser.successful_parses, parser.failed_parses, parser.total_verses) == (0, 1, 0)
+    assert parser.metrics.articles.value(result='success') == 0
+    assert parser.metrics.errors.value(reason='db') == 1
+    assert failed_articles(db_path) == {1: ('db', 1)}
+
+
+def test_failed_articles_round_trip(parser, http_server, db_path, monkeypatch, capsys):
+    monkeypatch.setattr(complete_hochma_bulk_parser.time, 'sleep', lambda seconds: None)
+    articles = [{'article_id': i, 'title': f'창세기 {i}장'} for i in (1, 2, 3)]
+
+    # 2는 절 파싱 실패, 3은 404 -> failed_articles에 기록
+    parser.parse_articles(articles, save_to_excel=False)
+    assert failed_articles(db_path) == {2: ('parse', 1), 3: ('http', 1)}
+
+    # 분류를 지정하면 그 게시글만 다시 처리 (다시 실패하면 시도 횟수만 증가)
+    results = parser.retry_failed(['parse'])
+    assert [(result['article_id'], result['status']) for result in results] == [(2, 'failed')]
+    assert failed_articles(db_path) == {2: ('parse', 2), 3: ('http', 1)}
+
+    # 게시글이 복구되면 저장하고 목록에서 제거
+    http_server.route('/com_kor_hochma/3', ARTICLE)
+    results = parser.retry_failed(['http'])
+    assert [(result['article_id'], result['status']) for result in results] == [(3, 'success')]
+    assert failed_articles(db_path) == {2: ('parse', 2)}
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM commentaries WHERE article_id = 3").fetchone()[0] == 4
+    conn.close()
+
+    # 직접 해결 처리하면 더 이상 다시 처리하지 않음
+    conn = sqlite3.connect(db_path)
+    commentary_db.resolve_failed_article(conn, 2)
+    conn.commit()
+    conn.close()
+    assert failed_articles(db_path) == {}
+    assert parser.retry_failed() == []
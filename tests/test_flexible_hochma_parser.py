@@ -0,0 +1,46 @@
+import pytest
+
+from flexible_hochma_parser import FlexibleHochmaParser
+
+# 창세기 3장은 24절: 1절 중복, 다른 장(4:1) 절 포함, 3~24절 누락
+CONTENT = "\n".join([
+    "====3:1", "첫 번째 1절 주석",
+    "====3:2", "2절 주석",
+    "====4:1", "다른 장 주석",
+    "====3:1", "두 번째 1절 주석",
+])
+
+
+@pytest.fixture
+def parser(db_path):
+    return FlexibleHochmaParser(db_path)
+
+
+def parse(parser, book_name, chapter, content=CONTENT):
+    pattern_type, matches = parser.detect_verse_pattern(content)
+    return parser.parse_verses_by_pattern(content, pattern_type, matches, book_name, chapter)
+
+
+def test_known_verse_count_normalizes_current_chapter(parser):
+    verses = parse(parser, '창세기', 3)
+
+    assert [verse['verse'] for verse in verses] == list(range(1, 25))
+    assert {verse['chapter'] for verse in verses} == {3}
+    # 같은 절이 여러 번 나오면 마지막 본문
+    assert verses[0]['commentary'] == '두 번째 1절 주석'
+    assert verses[1]['commentary'] == '2절 주석'
+    assert all(verse['commentary'] == '[누락된 절]' for verse in verses[2:])
+
+
+def test_unknown_verse_count_keeps_parsed_verses_once(parser):
+    verses = parse(parser, '없는책', 3)
+
+    assert [(verse['chapter'], verse['verse'], verse['commentary']) for verse in verses] == [
+        (3, 1, '두 번째 1절 주석'), (3, 2, '2절 주석'), (4, 1, '다른 장 주석'),
+    ]
+
+
+def test_unknown_verse_count_without_verses_uses_whole_text(parser):
+    # 구분자 뒤에 줄바꿈이 없으면 절 본문을 찾지 못해 전체 본문을 1절로
+    content = "====3:1 " + "본문 " * 40
+    assert parse(parser, '없는책', 3, content) == [{'chapter': 3, 'verse': 1, 'commentary': content}]
@@ -0,0 +1,107 @@
+import json
+import sqlite3
+
+import pytest
+
+import commentary_db
+import complete_hochma_bulk_parser
+import hochma_cli
+from http_client import HedgePolicy
+
+
+def test_crawl_rejects_hedge_with_stream(capsys):
+    with pytest.raises(SystemExit) as exc:
+        hochma_cli.main(['crawl', '--hedge', '10', '--stream'])
+
+    assert exc.value.code == 2
+    assert 'not allowed with argument' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('argv, hedge, stream', [
+    (['crawl', '--hedge', '10'], 10.0, False),
+    (['crawl', '--stream'], None, True),
+])
+def test_crawl_accepts_hedge_or_stream(argv, hedge, stream):
+    args = hochma_cli.build_parser().parse_args(argv)
+    assert (args.hedge, args.stream) == (hedge, stream)
+
+
+def test_parser_rejects_hedge_with_stream(db_path):
+    with pytest.raises(ValueError):
+        complete_hochma_bulk_parser.CompleteHochmaBulkParser(db_path, hedge=HedgePolicy(), stream=True)
+
+
+def test_main_refuses_hedge_with_stream(tmp_path, db_path, monkeypatch, capsys):
+    articles = tmp_path / 'hochma_all_links.json'
+    articles.write_text('[]', encoding='utf-8')
+    monkeypatch.setattr(complete_hochma_bulk_parser, 'CompleteHochmaBulkParser',
+                        lambda *args, **kwargs: pytest.fail('parser created'))
+
+    complete_hochma_bulk_parser.main(json_file=str(articles), db_path=db_path, hedge_rate=10, stream=True)
+
+    assert '--hedge and --stream cannot be used together' in capsys.readouterr().out
+
+
+ARTICLE = ("<html><head><title>호크마 주석, 창세기 3장</title></head><body>"
+           "<div class='xe_content'>3:1 첫째 절 주석<br>3:2 둘째 절 주석</div></body></html>")
+
+
+@pytest.fixture
+def local_articles(http_server, monkeypatch):
+    """게시글 1, 3만 있는 로컬 서버를 쓰는 파서 (2는 404)"""
+    http_server.route('/com_kor_hochma/1', ARTICLE)
+    http_server.route('/com_kor_hochma/3', ARTICLE)
+    init = complete_hochma_bulk_parser.CompleteHochmaBulkParser.__init__
+
+    def init_local(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        self.base_url = http_server.url('/com_kor_hochma')
+
+    monkeypatch.setattr(complete_hochma_bulk_parser.CompleteHochmaBulkParser, '__init__', init_local)
+    monkeypatch.setattr(complete_hochma_bulk_parser.time, 'sleep', lambda seconds: None)
+
+
+def failed_articles(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return [(row['article_id'], row['kind']) for row in commentary_db.get_failed_articles(conn)]
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize('article_ids, code', [([1, 3], 0), ([1, 2, 3], 1)])
+def test_crawl_exit_code_reports_failures(local_articles, tmp_path, db_path, article_ids, code):
+    articles = tmp_path / 'hochma_all_links.json'
+    articles.write_text(json.dumps({'links': [{'article_id': i, 'title': f'{i}'} for i in article_ids]}),
+                        encoding='utf-8')
+
+    assert hochma_cli.main(['crawl', '--articles', str(articles), '--db', db_path]) == code
+    assert failed_articles(db_path) == ([(2, 'http')] if code else [])
+
+
+def test_crawl_not_started_is_failure(tmp_path, db_path, monkeypatch):
+    articles = tmp_path / 'hochma_all_links.json'
+    articles.write_text('{"links": []}', encoding='utf-8')
+    assert hochma_cli.main(['crawl', '--articles', str(articles), '--db', db_path]) == 0
+
+    # main이 파싱을 시작하지 못하면 None
+    monkeypatch.setattr(complete_hochma_bulk_parser, 'main', lambda **kwargs: None)
+    assert hochma_cli.main(['crawl', '--articles', str(articles), '--db', db_path]) == 1
+
+
+def test_reparse_continues_after_db_error(local_articles, db_path, monkeypatch, capsys):
+    save = complete_hochma_bulk_parser.CompleteHochmaBulkParser.save_to_database
+
+    def save_or_fail(self, parsed_data, article_id, replace=False):
+        if article_id == 1:
+            raise sqlite3.OperationalError('database is locked')
+        return save(self, parsed_data, article_id, replace)
+
+    monkeypatch.setattr(complete_hochma_bulk_parser.CompleteHochmaBulkParser, 'save_to_database', save_or_fail)
+
+    assert hochma_cli.main(['reparse', '1', '3', '--db', db_path, '--delay', '0']) == 1
+    assert 'DB 저장 실패 (database is locked)' in capsys.readouterr().out
+    assert failed_articles(db_path) == [(1, 'db')]
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT DISTINCT article_id FROM commentaries").fetchall() == [(3,)]
+    conn.close()
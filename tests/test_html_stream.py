@@ -0,0 +1,67 @@
+import random
+
+import pytest
+import requests
+from bs4 import BeautifulSoup
+
+from html_stream import IncrementalSoup, parse_response
+
+PAGE = ("<!DOCTYPE html><html><head><title>호크마 주석, 창세기 3장</title>"
+        "<script>if (a<b && c>d) x = '</p>';</script><style>p { margin: 0 }</style></head>"
+        "<body><!-- 본문 --><h1>호크마 주석, 창세기 3장</h1><div class='xe_content a' id=x data-a>"
+        "====3:1 <b>뱀</b>은 &quot;간교&quot;하니라 &#44032;&#x41;&nbsp;&copy;<br>둘째 줄<br>셋째 줄"
+        "<p>문단<p>다음 문단<img src='a.png'><input disabled><table><tr><td>칸</table>"
+        "5 < 6 <![CDATA[x]]><?php echo 1 ?></div></body></html>")
+
+
+def feed_in_pieces(data, seed):
+    rng = random.Random(seed)
+    parser = IncrementalSoup()
+    offset = 0
+    while offset < len(data):
+        size = rng.randint(1, 64)
+        parser.feed(data[offset:offset + size])
+        offset += size
+    return parser, parser.close()
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_random_chunking_builds_the_same_tree(seed):
+    data = PAGE.encode('utf-8')
+    parser, soup = feed_in_pieces(data, seed)
+
+    assert str(soup) == str(BeautifulSoup(PAGE, 'html.parser'))
+    assert parser.bytes_read == len(data)
+
+
+def test_tree_supports_find():
+    _, soup = feed_in_pieces(PAGE.encode('utf-8'), 0)
+    content = soup.find(class_='xe_content')
+    assert content['id'] == 'x' and content['data-a'] == ''
+    assert [br.name for br in content.find_all('br')] == ['br', 'br']
+    assert soup.title.string == '호크마 주석, 창세기 3장'
+
+
+def test_self_closing_tag_after_void_tag():
+    # <br> 뒤의 <br/>도 바로 닫음 (bs4 4.12 html.parser 빌더는 이후 내용을 <br/> 안에 넣음)
+    parser = IncrementalSoup()
+    parser.feed('<div>첫째<br>둘째<br/>셋째<p>문단</p></div>'.encode('utf-8'))
+    div = parser.close().div
+    assert [child.name for child in div.children] == [None, 'br', None, 'br', None, 'p']
+
+
+def test_invalid_bytes_are_replaced():
+    parser = IncrementalSoup()
+    parser.feed('<p>가'.encode('utf-8')[:-1])
+    parser.feed(b'\xff</p>')
+    assert parser.close().p.string == '��'
+
+
+def test_parse_response_streams_the_body(http_server):
+    http_server.route('/page', PAGE, chunk_delay=0.001)
+    response = requests.get(http_server.url('/page'), stream=True)
+
+    soup, size = parse_response(response, chunk_size=7)
+
+    assert size == len(PAGE.encode('utf-8'))
+    assert str(soup) == str(BeautifulSoup(PAGE, 'html.parser'))
@@ -0,0 +1,52 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from html_text import html_to_lines, html_to_text
+
+
+def content(html):
+    return BeautifulSoup(f"<div class='xe_content'>{html}</div>", 'html.parser').div
+
+
+@pytest.mark.parametrize('html, text', [
+    ('첫째<br>둘째', '첫째\n둘째'),
+    ('첫째<br><br>셋째', '첫째\n\n셋째'),
+    ('<p>첫째</p><p>둘째</p>', '첫째\n둘째\n'),
+    ('앞<div>블록</div>뒤', '앞\n블록\n뒤'),
+    ('<b>굵게</b> 그리고 <span>인라인</span>', '굵게 그리고 인라인'),
+    ('본문<script>var x = 1;</script><style>p {}</style><!-- 주석 -->끝', '본문끝'),
+    ('<ul><li>하나</li><li>둘</li></ul>', '하나\n둘\n'),
+])
+def test_html_to_text(html, text):
+    assert html_to_text(content(html)) == text
+
+
+def test_html_to_lines_strips_and_drops_blank_lines():
+    assert html_to_lines(content('  첫째 <br><br> <p> 둘째 </p>\n')) == ['첫째', '둘째']
+
+
+def test_tree_is_not_modified():
+    element = content('====3:1 <b>주석</b><br>다음 줄<script>x</script>')
+    before = str(element)
+
+    assert html_to_text(element) == html_to_text(element)
+    assert str(element) == before
+
+
+def test_skip_tags():
+    element = content('본문<nav>메뉴</nav><footer>꼬리</footer>')
+    assert html_to_text(element, frozenset(['nav', 'footer'])) == '본문'
+
+
+def test_advanced_parser_keeps_line_breaks(db_path):
+    # get_text(strip=True)로는 '첫 줄 설명둘째 줄 설명'처럼 붙어서 저장되던 주석
+    from advanced_hochma_parser import AdvancedHochmaParser
+
+    soup = BeautifulSoup(
+        "<h1>호크마 주석, 창세기 3장</h1><div class='xe_content'>"
+        "====3:1 <b>뱀</b>은 간교하니라<br>첫 줄 설명<br>둘째 줄 설명<p>====3:2 여자가 뱀에게 말하되</p></div>",
+        'html.parser')
+    article = AdvancedHochmaParser(db_path).extract_detailed_commentary(soup, 'http://example.com/1')
+
+    assert [(item['chapter'], item['verse']) for item in article['verse_commentaries']] == [(3, 1), (3, 2)]
+    assert article['verse_commentaries'][0]['commentary'] == '뱀은 간교하니라\n첫 줄 설명\n둘째 줄 설명'
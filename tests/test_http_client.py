@@ -0,0 +1,143 @@
+import time
+
+import pytest
+
+import http_client
+from http_client import RETRY_BACKOFF, RETRY_TOTAL, HedgePolicy, RateBudget, create_session
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_rate_budget_burst_then_refill():
+    budget = RateBudget(rate=20, burst=3)
+    assert [budget.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+    start = time.monotonic()
+    budget.acquire()
+    # 토큰 하나가 쌓일 때까지 (1/20초) 기다림
+    assert time.monotonic() - start >= 0.03
+
+
+def test_rate_budget_default_burst():
+    assert RateBudget(rate=0.5).burst == 1.0
+    assert RateBudget(rate=8).burst == 8
+
+
+def test_hedge_waits_for_samples():
+    policy = HedgePolicy(min_samples=2, min_delay=0.05)
+    assert policy.delay() is None
+    policy._observe_primary(0.01)
+    policy._observe_primary(0.2)
+    assert policy.delay() == 0.2
+
+
+@pytest.fixture
+def hedged(http_server):
+    """한 번 빠른 원 요청으로 기준을 잡은 HedgePolicy와 세션"""
+    http_server.route('/fast', 'fast body')
+    policy = HedgePolicy(min_samples=1, min_delay=0.05)
+    session = create_session(retries=0)
+    policy.execute(lambda: session.get(http_server.url('/fast'), stream=True))
+    return policy, session
+
+
+def test_hedge_cancels_loser_mid_body(http_server, hedged):
+    policy, session = hedged
+    # 헤더는 바로 오지만 본문이 느린 원 요청 (4096바이트 조각 50개, 조각마다 50ms)
+    slow_body = b'x' * (4096 * 50)
+    http_server.route('/slow', slow_body, chunk_delay=0.05)
+    urls = iter([http_server.url('/slow'), http_server.url('/fast')])
+
+    start = time.monotonic()
+    response = policy.execute(lambda: session.get(next(urls), stream=True))
+
+    assert response.text == 'fast body'
+    assert time.monotonic() - start < 1.0
+    report = policy.report()
+    assert (report['requests'], report['hedged'], report['hedge_wins']) == (2, 1, 1)
+    # 진 원 요청은 다음 조각에서 멈추고 연결을 닫음
+    assert wait_until(lambda: http_server.aborted == 1)
+    assert http_server.bytes_sent < len(slow_body) // 2
+
+
+def test_losing_primary_kept_out_of_threshold(http_server, hedged):
+    policy, session = hedged
+    http_server.route('/slow', b'x' * (4096 * 50), chunk_delay=0.05)
+    urls = iter([http_server.url('/slow'), http_server.url('/fast')])
+    threshold = policy.delay()
+
+    policy.execute(lambda: session.get(next(urls), stream=True))
+
+    # 진 원 요청은 취소될 때까지의 지연(하한)만 보고용으로 기록
+    assert wait_until(lambda: len(policy.primary_latencies) == 2)
+    assert policy.primary_latencies[1] >= threshold
+    assert policy.report()['unhedged_p99'] == policy.primary_latencies[1]
+    assert list(policy._recent) == policy.primary_latencies[:1]
+    assert policy.delay() == threshold
+
+
+def test_hedge_skipped_without_budget(http_server, hedged):
+    policy, session = hedged
+    http_server.route('/slow', 'slow body', header_delay=0.2)
+    # 토큰 하나는 원 요청이 쓰고 헤지 요청에 쓸 토큰은 없음
+    policy.budget = RateBudget(rate=0.1, burst=1)
+
+    response = policy.execute(lambda: session.get(http_server.url('/slow'), stream=True))
+
+    assert response.text == 'slow body'
+    report = policy.report()
+    assert (report['hedged'], report['skipped']) == (0, 1)
+
+
+def test_hedged_session_returns_full_body(http_server):
+    body = '본문 ' * 20000
+    http_server.route('/page', body)
+    session = create_session(retries=0, hedge=HedgePolicy(min_samples=1))
+
+    for _ in range(2):
+        response = session.get(http_server.url('/page'))
+        assert response.status_code == 200
+        assert response.content == body.encode('utf-8')
+        assert response.text == body
+
+
+@pytest.fixture
+def backoffs(monkeypatch):
+    """JitterRetry가 고른 백오프 구간 (대기 없이 0초로 재시도)"""
+    ranges = []
+    monkeypatch.setattr(http_client.random, 'uniform', lambda low, high: ranges.append((low, high)) or 0)
+    return ranges
+
+
+def test_retries_transient_status_with_full_jitter(http_server, backoffs):
+    http_server.route('/flaky', '본문', statuses=[503, 503])
+    response = create_session().get(http_server.url('/flaky'))
+
+    assert response.status_code == 200
+    assert response.text == '본문'
+    assert http_server.requests == ['/flaky'] * 3
+    # 첫 재시도는 바로, 이후는 0 ~ 지수 백오프 사이에서 무작위
+    assert backoffs == [(0, RETRY_BACKOFF * 2)]
+
+
+def test_gives_up_after_retry_total(http_server, backoffs):
+    http_server.route('/down', '본문', statuses=[503] * (RETRY_TOTAL + 1))
+    response = create_session().get(http_server.url('/down'))
+
+    assert response.status_code == 503
+    assert len(http_server.requests) == RETRY_TOTAL + 1
+
+
+def test_does_not_retry_client_error(http_server, backoffs):
+    response = create_session().get(http_server.url('/missing'))
+
+    assert response.status_code == 404
+    assert http_server.requests == ['/missing']
+    assert backoffs == []
@@ -0,0 +1,67 @@
+import sqlite3
+import urllib.request
+
+import pytest
+
+import verse_spans
+from complete_hochma_bulk_parser import CompleteHochmaBulkParser
+from metrics import CrawlMetrics, MetricsRegistry, start_metrics_server
+
+CONTENT = "서론\n=3:1 첫째 절 주석\n=3:2-3 둘째와 셋째 절 주석\n=3:4 넷째 절"
+
+
+def parsed_article(parser):
+    return {
+        'title': '호크마 주석, 창세기 3장', 'book_name': '창세기', 'chapter': 3, 'url': 'u/1',
+        'content': CONTENT, 'verses': parser.iter_verses(CONTENT, 3),
+    }
+
+
+@pytest.mark.parametrize('error, reason', [
+    ('HTTP 404', 'HTTP 404'),
+    ('본문 추출 실패', '본문 추출 실패'),
+    ('network error: timed out', 'network'),
+    ('db error: database is locked', 'db'),
+    ('KeyError: x', 'exception'),
+    (None, 'exception'),
+])
+def test_failure_reasons_follow_failure_kind(error, reason):
+    metrics = CrawlMetrics()
+    metrics.article_failed(error)
+    assert metrics.errors.value(reason=reason) == 1
+    assert metrics.articles.value(result='failed') == 1
+
+
+@pytest.mark.parametrize('span_mode', [False, True])
+def test_commit_latency_recorded_in_every_storage_mode(db_path, span_mode, capsys):
+    metrics = CrawlMetrics()
+    parser = CompleteHochmaBulkParser(db_path, metrics=metrics)
+    if span_mode:
+        conn = sqlite3.connect(db_path)
+        verse_spans.enable_span_storage(conn)
+        conn.commit()
+        conn.close()
+
+    assert parser.save_to_database(parsed_article(parser), 1) == 4
+
+    assert 'hochma_db_commit_seconds_count 1' in metrics.registry.render()
+    conn = sqlite3.connect(db_path)
+    table = 'verse_spans' if span_mode else 'commentaries'
+    assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 4
+    conn.close()
+
+
+def test_metrics_endpoint_serves_registry():
+    registry = MetricsRegistry()
+    registry.counter('hochma_requests_total', 'HTTP requests by status code', ('status',)).inc(status='200')
+    registry.histogram('hochma_db_commit_seconds', 'Database commit latency').observe(0.003)
+    server = start_metrics_server(registry, 0, host='127.0.0.1')
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        body = urllib.request.urlopen(url).read().decode('utf-8')
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert 'hochma_requests_total{status="200"} 1' in body
+    assert 'hochma_db_commit_seconds_bucket{le="0.005"} 1' in body
+    assert 'hochma_db_commit_seconds_count 1' in body
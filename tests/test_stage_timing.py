@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+import http_client
+from stage_timing import HistogramSink, JsonLinesSink, StageTimer, timed_get
+
+
+def test_timed_get_splits_connection_setup(http_server):
+    http_server.route('/a', 'x' * 50000, header_delay=0.05, chunk_delay=0.002)
+    timer = StageTimer()
+    session = http_client.create_session(retries=0)
+
+    timed_get(timer, session, http_server.url('/a'), article_id=1)
+    # 같은 연결 재사용: 연결 설정 구간 없음
+    response = timed_get(timer, session, http_server.url('/a'), article_id=2)
+
+    assert len(response.content) == 50000
+    assert timer.totals['connect'][0] == 1
+    assert timer.totals['connect'][1] > 0
+    assert 'tls' not in timer.totals        # http
+    assert timer.totals['headers'][0] == 2
+    assert timer.totals['headers'][1] >= 0.1
+    assert timer.totals['download'][0] == 2
+
+
+def test_connection_setup_timing_counts_new_connections(http_server):
+    http_server.route('/a', 'ok')
+    session = http_client.create_session(retries=0)
+    with http_client.connection_setup_timing() as first:
+        session.get(http_server.url('/a'))
+    with http_client.connection_setup_timing() as second:
+        session.get(http_server.url('/a'))
+    assert first['connections'] == 1
+    assert second == {'connect': 0.0, 'tls': 0.0, 'connections': 0}
+
+
+def test_timed_get_records_failure(http_server):
+    timer = StageTimer()
+    session = http_client.create_session(retries=0)
+    with pytest.raises(Exception):
+        timed_get(timer, session, 'http://127.0.0.1:1/', article_id=1)
+    assert timer.totals['headers'][0] == 1
+    assert 'download' not in timer.totals
+
+
+def test_json_lines_sink_flushes_on_close(tmp_path):
+    path = tmp_path / 'stages.jsonl'
+    histogram = HistogramSink()
+    timer = StageTimer([JsonLinesSink(str(path)), histogram])
+    with timer.span('segment', article_id=7):
+        pass
+    timer.record('db_write', 0.02, article_id=7)
+    timer.close()
+
+    events = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert [(event['article_id'], event['stage']) for event in events] == [(7, 'segment'), (7, 'db_write')]
+    assert histogram.percentile('db_write', 50) == 0.025
+
+
+def test_breakdown_accounts_for_wall_time():
+    timer = StageTimer()
+    timer.record('headers', 1.0)
+    timer.record('headers', 1.0)
+    timer.record('segment', 0.5)
+    rows = timer.breakdown(wall_time=4.0)
+    assert rows == [('headers', 2, 2.0, 0.5), ('segment', 1, 0.5, 0.125), ('other', 0, 1.5, 0.375)]
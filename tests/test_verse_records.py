@@ -0,0 +1,74 @@
+import pytest
+
+from bulk_hochma_parser import BulkHochmaParser
+from complete_bulk_parser import CompleteBulkHochmaParser
+from corrected_bulk_parser import CorrectedHochmaParser
+from verse_records import VERSE_FIELDS, ArticleInfo, VerseRecord, records_to_columns
+
+TITLE = '호크마 주석, 창세기 3장'
+ARTICLE = (f"<html><head><title>{TITLE}</title></head><body><h1>{TITLE}</h1>"
+           "<div class='xe_content'>3:1<br>첫째 절 주석<br>3:2-3<br>둘째와 셋째 절 주석</div></body></html>")
+
+# 파서별 (생성자, 기준 URL 경로, 게시글 URL 형식, 파싱 메서드)
+PARSERS = {
+    'bulk': (BulkHochmaParser, '/com_kor_hochma', '/com_kor_hochma/{}', 'parse_single_article'),
+    'complete': (CompleteBulkHochmaParser, '/com_kor_hochma', '/com_kor_hochma/{}', 'parse_single_article'),
+    'corrected': (CorrectedHochmaParser, '/index.php?document_srl=', '/index.php?document_srl={}',
+                  'parse_article_content'),
+}
+
+
+def old_verse_dict(article_id, url, chapter, verse, content, pattern_type):
+    """VerseRecord 도입 전 파서가 절마다 만들던 딕셔너리"""
+    return {
+        'article_id': article_id,
+        'url': url,
+        'title': TITLE,
+        'commentary_name': '호크마 주석',
+        'book_name': '창세기',
+        'chapter': chapter,
+        'verse': verse,
+        'content': content,
+        'content_length': len(content),
+        'pattern_type': pattern_type
+    }
+
+
+def test_record_mapping_interface():
+    article = ArticleInfo(7, 'u', TITLE, '호크마 주석', '창세기')
+    record = VerseRecord(article, 3, 2, '본문 내용', 'lines')
+
+    assert record['content_length'] == 5
+    assert record['book_name'] == '창세기'
+    assert record.get('verse') == 2
+    assert record.get('missing') is None
+    assert record.get('missing', 0) == 0
+    assert tuple(record.keys()) == VERSE_FIELDS
+    assert dict((key, record[key]) for key in record.keys()) == record.to_dict()
+    with pytest.raises(KeyError):
+        record['missing']
+
+
+@pytest.mark.parametrize('name', sorted(PARSERS))
+def test_records_match_old_dict_layout(http_server, name):
+    pd = pytest.importorskip('pandas')
+    factory, base_path, article_path, method = PARSERS[name]
+    http_server.route(article_path.format(101), ARTICLE)
+    parser = factory()
+    parser.base_url = http_server.url(base_path)
+    url = http_server.url(article_path.format(101))
+
+    records = getattr(parser, method)(101)
+    expected = [
+        old_verse_dict(101, url, 3, 1, '첫째 절 주석', 'lines'),
+        old_verse_dict(101, url, 3, 2, '둘째와 셋째 절 주석', 'lines'),
+        old_verse_dict(101, url, 3, 3, '둘째와 셋째 절 주석', 'lines'),
+    ]
+    assert [record.to_dict() for record in records] == expected
+    # 범위 절은 같은 게시글 정보와 본문 문자열을 공유
+    assert records[1].article is records[0].article
+    assert records[1].content is records[2].content
+
+    # 엑셀 저장용 DataFrame이 기존 딕셔너리 리스트로 만든 것과 같음
+    pd.testing.assert_frame_equal(pd.DataFrame(records_to_columns(records)), pd.DataFrame(expected))
+    assert records_to_columns([]) == {field: [] for field in VERSE_FIELDS}
@@ -0,0 +1,63 @@
+import pytest
+
+import verse_spans
+from complete_hochma_bulk_parser import CompleteHochmaBulkParser
+from verse_spans import SpanReader, byte_spans
+
+TEXT = "서론 ✝\n3:1 태초에 하나님이 🌍 천지를 창조하시니라\n3:2-3 땅이 혼돈하고 (ascii)\n3:4 빛이 있으라"
+
+
+@pytest.fixture
+def segment(db_path):
+    return CompleteHochmaBulkParser(db_path).iter_verse_spans
+
+
+def test_byte_spans_match_encoded_slices(segment):
+    spans = list(segment(TEXT, 3))
+    body = TEXT.encode('utf-8')
+
+    converted = list(byte_spans(TEXT, spans))
+
+    assert [verse_nums for verse_nums, _, _ in converted] == [[1], [2, 3], [4]]
+    for (_, start, end), (_, byte_start, byte_end) in zip(spans, converted):
+        assert body[byte_start:byte_end].decode('utf-8') == TEXT[start:end]
+    # 3바이트 한글, 4바이트 이모지가 앞에 있으면 바이트 오프셋이 문자 오프셋보다 커짐
+    assert converted[0][1] == len(TEXT[:spans[0][1]].encode('utf-8')) > spans[0][1]
+
+
+def test_byte_spans_out_of_order(segment):
+    spans = list(segment(TEXT, 3))
+    body = TEXT.encode('utf-8')
+
+    for (_, start, end), (_, byte_start, byte_end) in zip(spans[::-1], byte_spans(TEXT, spans[::-1])):
+        assert body[byte_start:byte_end].decode('utf-8') == TEXT[start:end]
+
+
+def test_store_and_read_spans(conn, segment):
+    verse_spans.enable_span_storage(conn)
+    saved = verse_spans.store_article(conn, 7, TEXT, segment(TEXT, 3), book_name='창세기', chapter=3)
+    conn.commit()
+
+    assert saved == 4
+    with SpanReader(conn) as reader:
+        verses = [(verse, str(view, 'utf-8')) for verse, view in reader.article_verses(7)]
+        assert reader.verse_text(7, 3) == '땅이 혼돈하고 (ascii)'
+        assert [verse for _, verse, _ in reader.chapter_verses('창세기', 3)] == [1, 2, 3, 4]
+        assert reader.verse_text(8, 1) is None
+    assert verses == [
+        (1, '태초에 하나님이 🌍 천지를 창조하시니라'), (2, '땅이 혼돈하고 (ascii)'),
+        (3, '땅이 혼돈하고 (ascii)'), (4, '빛이 있으라'),
+    ]
+    stats = verse_spans.span_storage_stats(conn)
+    assert (stats['articles'], stats['verses'], stats['body_bytes']) == (1, 4, len(TEXT.encode('utf-8')))
+
+
+def test_resegment_replaces_spans_only(conn, segment):
+    verse_spans.enable_span_storage(conn)
+    # 처음에는 1절만 저장된 상태
+    verse_spans.store_article(conn, 7, TEXT, list(segment(TEXT, 3))[:1], book_name='창세기', chapter=3)
+
+    assert verse_spans.resegment(conn, segment) == (1, 4)
+    with SpanReader(conn) as reader:
+        assert [verse for verse, _ in reader.article_verses(7)] == [1, 2, 3, 4]
+        assert reader.verse_text(7, 4) == '빛이 있으라'
@@ -1,4 +1,4 @@
-import requests
+import http_client
 from bs4 import BeautifulSoup
 import re
 
@@ -7,7 +7,7 @@ def get_actual_title(article_id):
     url = f"https://nocr.net/index.php?mid=com_kor_hochma&document_srl={article_id}"
     
     try:
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=10)
         response.encoding = 'utf-8'
         
         if response.status_code == 200:
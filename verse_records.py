@@ -0,0 +1,104 @@
+"""
+절 단위 파싱 결과 레코드
+게시글마다 반복되던 메타데이터(article_id, url, 제목, 주석명, 성경책)는 ArticleInfo 하나에 두고
+VerseRecord는 __slots__로 참조만 가짐 (절마다 딕셔너리를 만들지 않음)
+성경책/주석명/패턴 이름은 intern해서 같은 문자열 객체를 공유하고
+content_length는 저장하지 않고 필요할 때 계산
+
+기존 딕셔너리 결과와 호환되도록 record['verse'], record.get('book_name')을 지원하고
+엑셀 저장용 DataFrame은 records_to_columns()로 열 단위로 만듦
+"""
+
+import sys
+
+# 기존 절 딕셔너리의 키 순서 (엑셀 열 순서)
+VERSE_FIELDS = (
+    'article_id', 'url', 'title', 'commentary_name', 'book_name',
+    'chapter', 'verse', 'content', 'content_length', 'pattern_type',
+)
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class ArticleInfo:
+    __slots__ = ('article_id', 'url', 'title', 'commentary_name', 'book_name')
+
+    def __init__(self, article_id, url, title, commentary_name, book_name):
+        """게시글 단위 메타데이터 (그 게시글의 모든 절이 공유)"""
+        self.article_id = article_id
+        self.url = url
+        self.title = title
+        self.commentary_name = _intern(commentary_name)
+        self.book_name = _intern(book_name)
+
+
+class VerseRecord:
+    __slots__ = ('article', 'chapter', 'verse', 'content', 'pattern_type')
+
+    def __init__(self, article, chapter, verse, content, pattern_type):
+        """
+        절 하나의 파싱 결과
+
+        Args:
+            article (ArticleInfo): 게시글 메타데이터 (참조만 보관)
+            content (str): 절 주석 본문 (범위 절은 같은 문자열 객체를 공유)
+        """
+        self.article = article
+        self.chapter = chapter
+        self.verse = verse
+        self.content = content
+        self.pattern_type = _intern(pattern_type)
+
+    @property
+    def article_id(self):
+        return self.article.article_id
+
+    @property
+    def url(self):
+        return self.article.url
+
+    @property
+    def title(self):
+        return self.article.title
+
+    @property
+    def commentary_name(self):
+        return self.article.commentary_name
+
+    @property
+    def book_name(self):
+        return self.article.book_name
+
+    @property
+    def content_length(self):
+        return len(self.content)
+
+    def __getitem__(self, key):
+        if key not in VERSE_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in VERSE_FIELDS else default
+
+    def keys(self):
+        return VERSE_FIELDS
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in VERSE_FIELDS}
+
+    def __repr__(self):
+        return (f"VerseRecord({self.article.article_id}, {self.article.book_name} "
+                f"{self.chapter}:{self.verse}, {self.pattern_type})")
+
+
+def records_to_columns(records):
+    """
+    레코드 목록을 열 단위 딕셔너리로 변환 (pd.DataFrame(columns)용, 행마다 딕셔너리를 만들지 않음)
+
+    Returns:
+        dict: 필드 이름 -> 값 리스트
+    """
+    return {field: [getattr(record, field) for record in records] for field in VERSE_FIELDS}
@@ -0,0 +1,256 @@
+"""
+스팬 저장 모드 (선택)
+게시글 본문은 article_bodies에 UTF-8 BLOB으로 한 번만 저장하고
+절 주석은 verse_spans에 (article_id, 절, 시작, 끝) 바이트 오프셋으로만 기록
+(절마다 본문의 부분 문자열을 복사해 두지 않음, 19:10-14 같은 범위 절은 같은 오프셋을 공유)
+
+- 읽기: SpanReader가 본문 BLOB을 memoryview로 잡고 절 범위를 복사 없이 잘라 줌
+  (문자열이 필요할 때만 str(view, 'utf-8')로 디코딩)
+- 재분할: 저장된 본문으로 절 분할만 다시 해서 verse_spans만 교체 (게시글을 다시 받지 않음)
+
+commentaries 테이블(중복 제거/압축 모드 포함)과는 별개의 저장소이며,
+verse_spans 테이블이 있으면 CompleteHochmaBulkParser.save_to_database가 commentaries 대신 여기에 저장
+
+사용법
+    enable_span_storage(conn)
+    store_article(conn, article_id, content, spans, url=url, book_name='창세기', chapter=31)
+    with SpanReader('bible_database.db') as reader:
+        for verse, view in reader.article_verses(article_id):
+            text = str(view, 'utf-8')
+"""
+
+import sqlite3
+from collections import OrderedDict
+
+from commentary_db import has_table
+
+SPAN_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS article_bodies (
+        article_id INTEGER PRIMARY KEY,
+        url TEXT,
+        title TEXT,
+        book_name TEXT,
+        chapter INTEGER,
+        body BLOB NOT NULL,
+        parsed_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS verse_spans (
+        article_id INTEGER NOT NULL,
+        verse INTEGER NOT NULL,
+        span_start INTEGER NOT NULL,
+        span_end INTEGER NOT NULL,
+        PRIMARY KEY (article_id, verse)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_article_bodies_chapter ON article_bodies(book_name, chapter)",
+)
+
+
+def span_storage_enabled(conn):
+    """스팬 저장 모드 여부 (verse_spans 테이블 존재)"""
+    return has_table(conn, 'verse_spans')
+
+
+def enable_span_storage(conn):
+    """스팬 저장 모드 테이블 생성"""
+    for statement in SPAN_SCHEMA:
+        conn.execute(statement)
+
+
+def byte_spans(text, spans):
+    """
+    문자 오프셋 스팬을 UTF-8 바이트 오프셋으로 변환하는 제너레이터
+    스팬이 시작 위치 순서대로 오면 본문을 한 번만 인코딩하면서 누적 계산
+
+    Args:
+        text (str): 본문
+        spans: (절 번호 목록, 시작, 끝) 문자 오프셋 (시작 위치 오름차순)
+
+    Yields:
+        tuple: (절 번호 목록, 바이트 시작, 바이트 끝)
+    """
+    char_pos = byte_pos = 0
+
+    def advance(offset):
+        nonlocal char_pos, byte_pos
+        if offset < char_pos:
+            # 순서가 어긋난 스팬은 처음부터 다시 계산
+            char_pos = byte_pos = 0
+        byte_pos += len(text[char_pos:offset].encode('utf-8'))
+        char_pos = offset
+        return byte_pos
+
+    for verse_nums, start, end in spans:
+        yield verse_nums, advance(start), advance(end)
+
+
+def replace_spans(conn, article_id, text, spans):
+    """
+    게시글의 절 오프셋을 새 분할 결과로 교체 (본문은 그대로)
+
+    Args:
+        text (str): 오프셋의 기준이 되는 본문 (article_bodies.body를 디코딩한 것과 같아야 함)
+        spans: (절 번호 목록, 시작, 끝) 문자 오프셋
+
+    Returns:
+        int: 저장한 절 수
+    """
+    conn.execute("DELETE FROM verse_spans WHERE article_id = ?", (article_id,))
+    rows = [
+        (article_id, verse, start, end)
+        for verse_nums, start, end in byte_spans(text, spans)
+        for verse in verse_nums
+    ]
+    conn.executemany(
+        "INSERT OR REPLACE INTO verse_spans (article_id, verse, span_start, span_end) VALUES (?, ?, ?, ?)",
+        rows
+    )
+    return len(rows)
+
+
+def store_article(conn, article_id, text, spans, url=None, title=None, book_name=None, chapter=None):
+    """
+    게시글 본문을 한 번 저장하고 절 오프셋 기록 (같은 게시글이 있으면 교체)
+
+    Returns:
+        int: 저장한 절 수
+    """
+    conn.execute("""
+        INSERT OR REPLACE INTO article_bodies (article_id, url, title, book_name, chapter, body)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (article_id, url, title, book_name, chapter, text.encode('utf-8')))
+    return replace_spans(conn, article_id, text, spans)
+
+
+def resegment(conn, segment, article_ids=None, batch_size=200):
+    """
+    저장된 본문으로 절 분할을 다시 해서 verse_spans만 교체
+
+    Args:
+        segment: segment(text, chapter) -> (절 번호 목록, 시작, 끝) 문자 오프셋을 내보내는 함수
+                 (예: CompleteHochmaBulkParser().iter_verse_spans)
+        article_ids (list): 대상 게시글 (None이면 전체)
+
+    Returns:
+        tuple: (처리한 게시글 수, 저장한 절 수)
+    """
+    sql = "SELECT article_id, chapter, body FROM article_bodies"
+    params = []
+    if article_ids:
+        sql += f" WHERE article_id IN ({', '.join('?' * len(article_ids))})"
+        params = list(article_ids)
+    sql += " ORDER BY article_id"
+
+    articles = verses = 0
+    cursor = conn.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for article_id, chapter, body in rows:
+            text = str(body, 'utf-8')
+            verses += replace_spans(conn, article_id, text, segment(text, chapter))
+            articles += 1
+    return articles, verses
+
+
+def span_storage_stats(conn):
+    """
+    스팬 저장소 크기 요약
+
+    Returns:
+        dict: 게시글 수, 본문 바이트 합계, 절 수, 절 범위 바이트 합계 (복사 저장했다면 필요했을 크기)
+    """
+    articles, body_bytes = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(length(body)), 0) FROM article_bodies"
+    ).fetchone()
+    verses, span_bytes = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(span_end - span_start), 0) FROM verse_spans"
+    ).fetchone()
+    return {'articles': articles, 'body_bytes': body_bytes, 'verses': verses, 'span_bytes': span_bytes}
+
+
+class SpanReader:
+    def __init__(self, db_path='bible_database.db', cache_size=64):
+        """
+        스팬 저장소 읽기 (본문 BLOB을 memoryview로 보관하고 절 범위를 복사 없이 잘라 줌)
+
+        Args:
+            db_path (str): 데이터베이스 경로 (sqlite3.Connection도 가능)
+            cache_size (int): memoryview로 보관할 최근 게시글 본문 수
+        """
+        if isinstance(db_path, sqlite3.Connection):
+            self.conn, self._owns_connection = db_path, False
+        else:
+            self.conn, self._owns_connection = sqlite3.connect(db_path), True
+        self.cache_size = cache_size
+        self._bodies = OrderedDict()
+
+    def body(self, article_id):
+        """게시글 본문 UTF-8 바이트의 memoryview (없으면 None)"""
+        view = self._bodies.get(article_id)
+        if view is not None:
+            self._bodies.move_to_end(article_id)
+            return view
+        row = self.conn.execute("SELECT body FROM article_bodies WHERE article_id = ?", (article_id,)).fetchone()
+        if row is None:
+            return None
+        view = self._bodies[article_id] = memoryview(row[0])
+        if len(self._bodies) > self.cache_size:
+            self._bodies.popitem(last=False)
+        return view
+
+    def article_verses(self, article_id):
+        """
+        게시글의 절 주석을 절 순서대로 내보내는 제너레이터
+
+        Yields:
+            tuple: (절, memoryview) (범위 절은 같은 본문 범위를 가리킴)
+        """
+        body = self.body(article_id)
+        if body is None:
+            return
+        for verse, start, end in self.conn.execute(
+            "SELECT verse, span_start, span_end FROM verse_spans WHERE article_id = ? ORDER BY verse",
+            (article_id,)
+        ):
+            yield verse, body[start:end]
+
+    def chapter_verses(self, book_name, chapter):
+        """
+        장 하나의 절 주석을 내보내는 제너레이터
+
+        Yields:
+            tuple: (article_id, 절, memoryview)
+        """
+        article_ids = [row[0] for row in self.conn.execute(
+            "SELECT article_id FROM article_bodies WHERE book_name = ? AND chapter = ? ORDER BY article_id",
+            (book_name, chapter)
+        )]
+        for article_id in article_ids:
+            for verse, view in self.article_verses(article_id):
+                yield article_id, verse, view
+
+    def verse_text(self, article_id, verse):
+        """절 주석 문자열 (이 시점에만 디코딩, 없으면 None)"""
+        row = self.conn.execute(
+            "SELECT span_start, span_end FROM verse_spans WHERE article_id = ? AND verse = ?", (article_id, verse)
+        ).fetchone()
+        body = self.body(article_id) if row else None
+        if body is None:
+            return None
+        return str(body[row[0]:row[1]], 'utf-8')
+
+    def close(self):
+        self._bodies.clear()
+        if self._owns_connection:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,4 +1,5 @@
 import requests
+from http_client import create_session
 from bs4 import BeautifulSoup
 import json
 import csv
@@ -14,7 +15,7 @@ class WebParser:
         Args:
             headers (dict): HTTP 요청 헤더
         """
-        self.session = requests.Session()
+        self.session = create_session()
         self.headers = headers or {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }